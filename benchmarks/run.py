@@ -0,0 +1,360 @@
+"""
+Headless benchmarks for the slide-change pipeline and overlay rendering.
+
+    python benchmarks/run.py                       # writes bench_results.json
+    python benchmarks/run.py --save-baseline       # store as the baseline
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+
+Runs under QT_QPA_PLATFORM=offscreen (set automatically off Windows) with a
+real PPTMonitor driving the simulated presentation backend. Each case
+reports count/mean/p50/p95/max in milliseconds. With --baseline, p50s are
+compared and the exit status is 1 if any case got slower than the
+tolerance allows.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import types
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+if sys.platform != "win32":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtCore import QEvent, QEventLoop, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+from ppt_assistant.core.sim_backend import _summarize
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DECK_SIZES = (10, 100, 500)
+
+# Differences below this many milliseconds are noise, whatever the ratio.
+NOISE_FLOOR_MS = 0.5
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class _PaintProbe(QObject):
+    """Timestamps the end of the first paint of widget for which ready() holds."""
+
+    def __init__(self, widget):
+        super().__init__()
+        self.widget = widget
+        self.painted_at = None
+        self._ready = None
+        self._loop = None
+        widget.installEventFilter(self)
+
+    def arm(self, ready=None):
+        self.painted_at = None
+        self._ready = ready or (lambda: True)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Paint and self._ready is not None and self._ready():
+            # Let the widget paint first, so the time includes the paint.
+            obj.event(event)
+            self.painted_at = time.perf_counter()
+            self._ready = None
+            if self._loop is not None:
+                self._loop.quit()
+            return True
+        return False
+
+    def wait(self, timeout_ms=5000):
+        if self.painted_at is None:
+            self._loop = QEventLoop()
+            QTimer.singleShot(timeout_ms, self._loop.quit)
+            self._loop.exec()
+            self._loop = None
+        if self.painted_at is None:
+            raise BenchmarkError(f"{type(self.widget).__name__} was not painted within {timeout_ms} ms")
+        return self.painted_at
+
+    def remove(self):
+        self.widget.removeEventFilter(self)
+
+
+def _wait_for(predicate, timeout_ms=5000):
+    deadline = time.perf_counter() + timeout_ms / 1000.0
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise BenchmarkError("timed out waiting for the simulated show")
+        QApplication.processEvents(QEventLoop.AllEvents, 10)
+
+
+def _flush_deletes():
+    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QApplication.processEvents()
+
+
+def _measure(sample, repeat, warmup=1):
+    """Run sample() warmup + repeat times; it returns one duration in ms."""
+    for _ in range(warmup):
+        sample()
+    return [sample() for _ in range(repeat)]
+
+
+def _ms_since(start):
+    return (time.perf_counter() - start) * 1000.0
+
+
+class _Session:
+    """
+    A PPTMonitor replaying a show of `slides` slides, with an overlay shown
+    and wired to it the way main.py does.
+    """
+
+    def __init__(self, slides):
+        from ppt_assistant.core.ppt_monitor import PPTMonitor
+        from ppt_assistant.core.sim_backend import SessionRecording, SimulatedBackend
+        from ppt_assistant.ui.overlay import OverlayWindow
+
+        self.slides = slides
+        recording = SessionRecording([
+            {"t": 0.0, "type": "begin", "total": slides, "index": 1},
+            {"t": 0.0, "type": "window", "rect": [0, 0, 1280, 720]},
+            {"t": 0.0, "type": "visible", "value": True},
+        ])
+        self.backend = SimulatedBackend(recording)
+        self.monitor = PPTMonitor(backends=[self.backend])
+        self.overlay = OverlayWindow()
+        self.overlay.set_monitor(self.monitor)
+        self.monitor.slide_changed.connect(self.overlay.update_page_info)
+        self.monitor.window_geometry_changed.connect(self.overlay.update_geometry)
+        self.overlay.resize(1280, 720)
+        self.overlay.show()
+        self.backend.start()
+        self.monitor.start_monitoring()
+        _wait_for(lambda: self.monitor.get_total_slides() == slides)
+
+    def change_slide(self, index):
+        """Make the application change slide, on the worker thread that owns the backend."""
+        event = {"type": "slide", "index": index}
+        QTimer.singleShot(0, self.monitor._worker, lambda: self.backend.inject(event))
+
+    def close(self):
+        self.monitor.stop_monitoring()
+        self.overlay.cleanup()
+        self.overlay.hide()
+        self.overlay.deleteLater()
+        _flush_deletes()
+
+
+def bench_overlay_construct(repeat):
+    from ppt_assistant.ui.overlay import OverlayWindow
+
+    def sample():
+        start = time.perf_counter()
+        overlay = OverlayWindow()
+        elapsed = _ms_since(start)
+        overlay.cleanup()
+        overlay.deleteLater()
+        _flush_deletes()
+        return elapsed
+
+    return _measure(sample, repeat)
+
+
+def bench_slide_change(session, repeat):
+    """Application changes slide -> slide_changed -> page flipper painted."""
+    flipper = session.overlay.right_flipper
+    probe = _PaintProbe(flipper.lbl_page)
+
+    def sample():
+        target = session.monitor.get_page_info()[0] % session.slides + 1
+        probe.arm(lambda: (flipper._page_info or (None,))[0] == target)
+        start = time.perf_counter()
+        session.change_slide(target)
+        end = probe.wait()
+        # The next sample starts from the page just shown.
+        _wait_for(lambda: session.monitor.get_page_info()[0] == target)
+        return (end - start) * 1000.0
+
+    try:
+        return _measure(sample, repeat)
+    finally:
+        probe.remove()
+
+
+def bench_preview_open(session, repeat):
+    """show_slide_preview() until the slide strip has painted."""
+    overlay = session.overlay
+
+    def sample():
+        start = time.perf_counter()
+        overlay.show_slide_preview()
+        popup = overlay.slide_preview
+        probe = _PaintProbe(popup.strip.viewport())
+        probe.arm()
+        try:
+            end = probe.wait()
+        finally:
+            probe.remove()
+        popup.close()
+        overlay.slide_preview = None
+        _flush_deletes()
+        return (end - start) * 1000.0
+
+    return _measure(sample, repeat)
+
+
+def bench_theme_restyle(session, repeat):
+    """In-place restyle of the live overlay, alternating light and dark."""
+    import ppt_assistant.ui.overlay as overlay_mod
+
+    original = overlay_mod._get_theme_mode
+    modes = iter(["Dark", "Light"] * (repeat + 2))
+
+    def sample():
+        mode = next(modes)
+        overlay_mod._get_theme_mode = lambda: mode
+        start = time.perf_counter()
+        if not session.overlay.apply_settings_delta(overlay_mod.OverlayDelta(restyle=True)):
+            raise BenchmarkError("overlay refused an in-place restyle")
+        QApplication.processEvents()
+        return _ms_since(start)
+
+    try:
+        return _measure(sample, repeat)
+    finally:
+        overlay_mod._get_theme_mode = original
+
+
+def bench_reload_overlay(session, repeat):
+    """PPTAssistantApp._reload_overlay() against the running session."""
+    import main
+
+    host = types.SimpleNamespace(overlay=session.overlay, monitor=session.monitor, _reloading_overlay=False)
+
+    def sample():
+        start = time.perf_counter()
+        main.PPTAssistantApp._reload_overlay(host)
+        QApplication.processEvents()
+        elapsed = _ms_since(start)
+        _flush_deletes()
+        return elapsed
+
+    try:
+        return _measure(sample, repeat)
+    finally:
+        session.overlay = host.overlay
+
+
+def run(decks=DECK_SIZES, repeat=20):
+    from ppt_assistant.core.metrics import metrics
+    from ppt_assistant.core.status_sampler import status_sampler
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    app.setQuitOnLastWindowClosed(False)
+    metrics().reset()
+    try:
+        results = {"overlay_construct": bench_overlay_construct(max(3, repeat // 4))}
+        for slides in decks:
+            session = _Session(slides)
+            try:
+                results[f"slide_change[{slides}]"] = bench_slide_change(session, repeat)
+                results[f"preview_open[{slides}]"] = bench_preview_open(session, max(3, repeat // 4))
+                if slides == decks[0]:
+                    # Deck size does not matter to these; the reload goes
+                    # last since it reloads the overlay module.
+                    results["theme_restyle"] = bench_theme_restyle(session, repeat)
+                    results["reload_overlay"] = bench_reload_overlay(session, max(3, repeat // 4))
+            finally:
+                session.close()
+    finally:
+        # The status bar starts the app-wide sampler.
+        status_sampler().stop()
+    return {
+        "meta": {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "pyside": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": QApplication.platformName(),
+            "repeat": repeat,
+            "decks": list(decks),
+        },
+        "results": {name: _summarize(samples) for name, samples in results.items()},
+        "metrics": metrics().snapshot()["histograms"],
+    }
+
+
+def compare(report, baseline, tolerance=0.2):
+    """Rows of (name, baseline p50, current p50, verdict)."""
+    rows = []
+    old_results = baseline.get("results", {})
+    for name, current in report["results"].items():
+        old = old_results.get(name) or {}
+        new_p50 = current.get("p50")
+        old_p50 = old.get("p50")
+        if old_p50 is None or new_p50 is None:
+            rows.append((name, old_p50, new_p50, "new"))
+            continue
+        delta = new_p50 - old_p50
+        if delta > NOISE_FLOOR_MS and new_p50 > old_p50 * (1 + tolerance):
+            verdict = "slower"
+        elif -delta > NOISE_FLOOR_MS and new_p50 < old_p50 * (1 - tolerance):
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, old_p50, new_p50, verdict))
+    for name in old_results:
+        if name not in report["results"]:
+            rows.append((name, old_results[name].get("p50"), None, "missing"))
+    return rows
+
+
+def _print_table(report, rows=None):
+    if rows is None:
+        for name, summary in report["results"].items():
+            print(f"{name:<24} p50 {summary.get('p50', '-'):>9} ms   p95 {summary.get('p95', '-'):>9} ms")
+        return
+    for name, old, new, verdict in rows:
+        old_text = f"{old:.3f}" if old is not None else "-"
+        new_text = f"{new:.3f}" if new is not None else "-"
+        print(f"{name:<24} {old_text:>10} -> {new_text:>10} ms  {verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the slide-change pipeline and overlay rendering.")
+    parser.add_argument("--out", default="bench_results.json", help="where to write the results")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--decks", default=",".join(str(n) for n in DECK_SIZES), help="comma-separated deck sizes")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_PATH, help="compare against a stored result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown, as a fraction")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, help="also store the results as the baseline")
+    args = parser.parse_args(argv)
+
+    decks = tuple(int(n) for n in args.decks.split(",") if n.strip())
+    report = run(decks, max(1, args.repeat))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+    if not args.baseline:
+        _print_table(report)
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(report, baseline, args.tolerance)
+    _print_table(report, rows)
+    slower = [row[0] for row in rows if row[3] == "slower"]
+    if slower:
+        print(f"Slower than the baseline: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
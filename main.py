@@ -20,17 +20,30 @@ if __name__ == "__main__":
         sys.argv = ["webview_runner.py"] + sys.argv[idx + 1 :]
         _wv.main()
         sys.exit(0)
+    if "--webview-host" in sys.argv:
+        idx = sys.argv.index("--webview-host")
+        import plugins.webview_host as _host
+        sys.argv = ["webview_host.py"] + sys.argv[idx + 1 :]
+        _host.main()
+        sys.exit(0)
+
+from ppt_assistant.core.startup_profiler import startup_profiler
+
+if __name__ == "__main__":
+    for _arg in sys.argv:
+        if _arg == "--profile-startup" or _arg.startswith("--profile-startup="):
+            startup_profiler().enable(_arg.partition("=")[2] or None)
 
 from PySide6.QtWidgets import QApplication, QDialog, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QFrame, QGraphicsDropShadowEffect, QProgressBar
 from PySide6.QtCore import Qt, QTimer, Slot, QSize, QPoint
 from PySide6.QtGui import QFontDatabase, QFont, QColor, QIcon, QRegion, QPainter, QPen, QBrush
 
-from ppt_assistant.core.ppt_monitor import PPTMonitor
-from ppt_assistant.ui.overlay import OverlayWindow
-from plugins.builtins.settings.plugin import SettingsPlugin
-from plugins.builtins.timer.plugin import TimerPlugin
-from ppt_assistant.ui.tray import SystemTray
-from ppt_assistant.core.config import cfg, SETTINGS_PATH, PLUGINS_DIR, reload_cfg, _apply_theme_and_color, Theme, qconfig, FIRST_RUN
+# The settings store and service, message hub, webview host, status
+# sampler, metrics, monitor, overlay, tray and plugins are imported by the
+# init step or handler that first uses them, so the splash is up before
+# their modules load. config (and qfluentwidgets with it) stays here: the
+# splash mode and theme are read from cfg before the splash is shown.
+from ppt_assistant.core.config import cfg, SETTINGS_PATH, PLUGINS_DIR, reload_cfg, _apply_theme_and_color, Theme, qconfig, FIRST_RUN, init_settings
 from ppt_assistant.core.timer_manager import TimerManager
 from ppt_assistant.core.i18n import t
 
@@ -108,24 +121,24 @@ SPLASH_I18N = {
 
 
 def _load_settings_json():
-    if not os.path.exists(SETTINGS_PATH):
-        return {}
-    try:
-        with open(SETTINGS_PATH, "rb") as f:
-            raw = f.read()
-    except Exception:
-        return {}
-    for enc in ("utf-8", "utf-8-sig", "gbk"):
-        try:
-            text = raw.decode(enc)
-        except UnicodeDecodeError:
-            continue
-        try:
-            data = json.loads(text)
-        except Exception:
-            continue
-        return data if isinstance(data, dict) else {}
-    return {}
+    from ppt_assistant.core.settings_store import settings_store
+    return settings_store().snapshot()
+
+
+# Settings the overlay reacts to; OverlayDelta decides how.
+OVERLAY_RELOAD_KEYS = [
+    ("Overlay", "RecreateOverlayAt"),
+    ("Appearance", "ThemeMode"),
+    ("Appearance", "ThemeId"),
+    ("Appearance", "MonetPalette"),
+    ("Toolbar", "ShowClear"),
+    ("Toolbar", "ShowSpotlight"),
+    ("Toolbar", "ShowTimer"),
+    ("Toolbar", "ShowToolbarText"),
+    ("Toolbar", "ToolbarOrder"),
+    ("Overlay", "SafeArea"),
+    ("Overlay", "Scale"),
+]
 
 
 def _get_current_language():
@@ -529,6 +542,13 @@ class CrashHandler:
         
         error_msg = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
         print(f"CRASH DETECTED:\n{error_msg}", file=sys.stderr)
+        try:
+            from ppt_assistant.core.stall_profiler import stall_profiler
+            stalls = stall_profiler().format_recent()
+            if stalls:
+                error_msg += "\n" + stalls + "\n"
+        except Exception:
+            pass
         
         try:
             base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -613,21 +633,36 @@ class PPTAssistantApp:
         self.app.setQuitOnLastWindowClosed(False)
         self._splash = splash
         self._timer_manager = TimerManager()
+        saved_timers = os.environ.pop("KAZUHA_TIMER_STATE", None)
+        if saved_timers:
+            try:
+                self._timer_manager.restore(json.loads(saved_timers))
+            except Exception as e:
+                print(f"Could not restore timers: {e}")
         self._last_timer_notify_at = 0.0
         self._reloading_overlay = False
         self._slideshow_running = False
+        self._pending_overlay_delta = None
+        self._overlay_reconfig_stats = {
+            "in_place": {"count": 0, "total_ms": 0.0, "last_ms": None},
+            "rebuild": {"count": 0, "total_ms": 0.0, "last_ms": None},
+        }
+        # Coalesces the deltas of one settings change (several handlers
+        # may queue one) into a single overlay update.
         self._reload_timer = QTimer()
         self._reload_timer.setSingleShot(True)
-        self._reload_timer.setInterval(150)
-        self._reload_timer.timeout.connect(self._reload_overlay)
+        self._reload_timer.setInterval(0)
+        self._reload_timer.timeout.connect(self._apply_overlay_delta)
         
         # Start async initialization
         self._init_gen = self._init_steps()
+        self._init_phase = "0:start"
         QTimer.singleShot(0, self._perform_init_step)
 
     def _init_steps(self):
         # Step 1: Basic Config
         yield 10, "loading_config"
+        init_settings()
         _apply_theme_and_color(cfg.themeMode.value)
         
         # Step 2: Fonts
@@ -643,17 +678,28 @@ class PPTAssistantApp:
         self._current_overlay_font = overlay_font.strip() if isinstance(overlay_font, str) else ""
         self._overlay_rebuild_at = (data.get("Overlay", {}) or {}).get("RecreateOverlayAt")
 
-        self._settings_mtime = os.path.getmtime(SETTINGS_PATH) if os.path.exists(SETTINGS_PATH) else 0
-        self._settings_timer = QTimer()
-        self._settings_timer.setInterval(100)
-        self._settings_timer.timeout.connect(self._check_settings_changed)
-        self._settings_timer.start()
+        from ppt_assistant.core.settings_store import settings_store
+        from ppt_assistant.core.settings_service import SettingsService
+        store = settings_store()
+        store.subscribe(lambda _change: reload_cfg())
+        store.subscribe(self._on_font_settings_changed, [("General", "Language"), ("Fonts", None)])
+        store.subscribe(self._on_overlay_settings_changed, OVERLAY_RELOAD_KEYS)
+        store.subscribe(self._on_status_bar_setting_changed, [("Overlay", "ShowStatusBar")])
+        store.subscribe(self._on_theme_mode_changed, [("Appearance", "ThemeMode")])
+        store.watch()
+        # Helper processes (the settings window) save through this process,
+        # over the message hub that serve() starts.
+        SettingsService(SETTINGS_PATH).serve()
+        store.subscribe(self._push_settings_change)
 
         self.app.aboutToQuit.connect(self.cleanup)
 
         # Step 3: Monitor (Non-UI logic)
         yield 30, "init_monitor"
+        from ppt_assistant.core.ppt_monitor import PPTMonitor
+        from ppt_assistant.core.status_sampler import status_sampler
         self.monitor = PPTMonitor()
+        status_sampler().start()
         
         # Step 4: Overlay (UI creation - expensive)
         yield 40, "init_ui"
@@ -661,6 +707,7 @@ class PPTAssistantApp:
         # We can split Overlay creation if needed, but yielding before is key
         pass 
         
+        from ppt_assistant.ui.overlay import OverlayWindow
         self.overlay = OverlayWindow()
         
         # Step 5: Plugins (IO/Process - expensive)
@@ -679,7 +726,13 @@ class PPTAssistantApp:
         
         # Step 6: Tray (UI)
         yield 80, "init_tray"
+        from ppt_assistant.ui.tray import SystemTray
         self.tray = SystemTray()
+        startup_profiler().milestone("tray_ready")
+        # Boot Chromium for the settings/timer windows once the overlay is
+        # up, so opening them later does not pay for it.
+        from ppt_assistant.core.webview_client import webview_host
+        QTimer.singleShot(2000, webview_host().start)
         
         # Step 7: Finalize connections
         yield 85, "finalizing"
@@ -687,6 +740,7 @@ class PPTAssistantApp:
 
         yield 90, "finalizing"
         self._connect_signals()
+        self._register_metrics()
 
         yield 95, "finalizing"
         self.monitor.start_monitoring()
@@ -695,19 +749,27 @@ class PPTAssistantApp:
             self._splash.finish()
 
     def _perform_init_step(self):
+        # Each next() runs the code after the previous yield, which is
+        # the phase that yield announced.
+        profiler = startup_profiler()
+        started = time.perf_counter()
         try:
             progress, text = next(self._init_gen)
+            profiler.phase(self._init_phase, started)
+            self._init_phase = f"{progress}:{text}"
             self.update_splash(progress, text)
             # Schedule next step immediately but allow event loop to breathe
             QTimer.singleShot(0, self._perform_init_step)
         except StopIteration:
-            pass # Done
+            profiler.phase(self._init_phase, started)
+            profiler.finish()
         except Exception as e:
             print(f"Initialization error: {e}")
             sys.exit(1)
 
     def _load_plugins(self):
         """Dynamic plugin loading from builtins and external directory."""
+        from ppt_assistant.core.metrics import metrics
         self.plugins = []
         
         # 1. Load Builtin Plugins
@@ -722,9 +784,10 @@ class PPTAssistantApp:
         for p_path in builtin_plugins:
             try:
                 mod_name, cls_name = p_path.rsplit(".", 1)
-                mod = importlib.import_module(mod_name)
-                cls = getattr(mod, cls_name)
-                plugin = cls()
+                with metrics().timer(f"plugin.{cls_name}.load_ms"):
+                    mod = importlib.import_module(mod_name)
+                    cls = getattr(mod, cls_name)
+                    plugin = cls()
                 plugin.set_context(self)
                 self.plugins.append(plugin)
                 
@@ -809,6 +872,7 @@ class PPTAssistantApp:
         self._timer_manager.finished.connect(self._on_timer_finished)
 
         self.monitor.slide_changed.connect(self.overlay.update_page_info)
+        self.monitor.slide_changed.connect(self._push_slide_change)
         self.monitor.window_geometry_changed.connect(self.overlay.update_geometry)
         self.monitor.overlay_visibility_changed.connect(self._on_overlay_visibility_changed)
 
@@ -824,13 +888,6 @@ class PPTAssistantApp:
     @Slot()
     def on_slideshow_start(self):
         self._slideshow_running = True
-        # Cleanup slide thumbnails from previous session
-        temp_dir = os.path.join(tempfile.gettempdir(), "kazuha_ppt_thumbs")
-        if os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
 
         if cfg.autoShowOverlay.value:
             self.overlay.show()
@@ -853,82 +910,113 @@ class PPTAssistantApp:
         else:
             self.overlay.hide()
 
-    def _check_settings_changed(self):
-        if not os.path.exists(SETTINGS_PATH):
+    def _on_font_settings_changed(self, change):
+        old_qt_font = self._current_qt_font
+        old_overlay_font = self._current_overlay_font
+        old_lang = self._current_language
+
+        data = _load_settings_json()
+        new_lang = (data.get("General", {}) or {}).get("Language", "zh-CN")
+        profiles = (data.get("Fonts", {}) or {}).get("Profiles", {}) or {}
+        lang_profile = profiles.get(new_lang, {}) or {}
+        qt_font = lang_profile.get("qt", "")
+        overlay_font = lang_profile.get("overlay", "") or qt_font
+        self._current_language = new_lang
+        self._current_qt_font = qt_font.strip() if isinstance(qt_font, str) else ""
+        self._current_overlay_font = overlay_font.strip() if isinstance(overlay_font, str) else ""
+
+        if self._current_qt_font != old_qt_font:
+            _apply_global_font(self.app)
+        if new_lang != old_lang or self._current_overlay_font != old_overlay_font:
+            from ppt_assistant.ui.overlay import OverlayDelta
+            self._queue_overlay_delta(OverlayDelta(restyle=True, retranslate=new_lang != old_lang))
+
+    def _on_overlay_settings_changed(self, change):
+        rebuild_at = change.value("Overlay", "RecreateOverlayAt")
+        if rebuild_at is not None:
+            self._overlay_rebuild_at = rebuild_at
+        from ppt_assistant.ui.overlay import OverlayDelta
+        delta = OverlayDelta.from_change(change)
+        if delta.rebuild and not getattr(self, "overlay", None):
+            delta.rebuild = False
+        if delta:
+            self._queue_overlay_delta(delta)
+
+    def _on_status_bar_setting_changed(self, change):
+        if self.overlay:
+            self.overlay._on_status_bar_visibility_changed(cfg.showStatusBar.value)
+
+    def _on_theme_mode_changed(self, change):
+        if hasattr(self, 'tray'):
+            self.tray._update_icon()
+
+    def _push_settings_change(self, change):
+        from ppt_assistant.core.ipc import message_hub
+        keys = [[section, key] for section, key in change.changes]
+        message_hub().push("settings.changed", {"version": change.version, "keys": keys})
+
+    def _push_slide_change(self, current, total):
+        from ppt_assistant.core.ipc import message_hub
+        message_hub().push("slide.changed", {"current": current, "total": total}, coalesce=True)
+
+    def _queue_overlay_delta(self, delta):
+        self._pending_overlay_delta = delta.merged(self._pending_overlay_delta)
+        if not self._reloading_overlay:
+            self._reload_timer.start()
+
+    def _apply_overlay_delta(self):
+        """Update the overlay in place, rebuilding it only as a fallback."""
+        delta, self._pending_overlay_delta = self._pending_overlay_delta, None
+        if not delta or self._reloading_overlay or not getattr(self, "overlay", None):
             return
-        mtime = os.path.getmtime(SETTINGS_PATH)
-        if mtime != self._settings_mtime:
-            self._settings_mtime = mtime
-            
-            old_theme = cfg.themeMode.value
-            old_theme_id = cfg.themeId.value if hasattr(cfg, "themeId") else "default"
-            old_lang = getattr(self, "_current_language", "zh-CN")
-            old_qt_font = getattr(self, "_current_qt_font", "")
-            old_overlay_font = getattr(self, "_current_overlay_font", "")
-            old_toolbar_text = cfg.showToolbarText.value
-            old_status_bar = cfg.showStatusBar.value
-            old_clear = cfg.showClear.value
-            old_spotlight = cfg.showSpotlight.value
-            old_timer = cfg.showTimer.value
-            old_toolbar_order = cfg.toolbarOrder.value
-            old_safe_area = cfg.safeArea.value
-            old_scale = cfg.scale.value
-            old_rebuild_at = getattr(self, "_overlay_rebuild_at", None)
-            # old_layout_mode = cfg.toolbarLayout.value
-
-            reload_cfg()
-
-            data = _load_settings_json()
-
-            new_lang = (data.get("General", {}) or {}).get("Language", "zh-CN")
-            profiles = (data.get("Fonts", {}) or {}).get("Profiles", {}) or {}
-            lang_profile = profiles.get(new_lang, {}) or {}
-            qt_font = lang_profile.get("qt", "")
-            overlay_font = lang_profile.get("overlay", "") or qt_font
-            new_qt_font = qt_font.strip() if isinstance(qt_font, str) else ""
-            new_overlay_font = overlay_font.strip() if isinstance(overlay_font, str) else ""
-            new_rebuild_at = (data.get("Overlay", {}) or {}).get("RecreateOverlayAt")
-
-            self._current_language = new_lang
-            self._current_qt_font = new_qt_font
-            self._current_overlay_font = new_overlay_font
-
-            if new_qt_font != old_qt_font:
-                _apply_global_font(self.app)
-            
-            should_reload = (
-                new_lang != old_lang
-                or new_overlay_font != old_overlay_font
-                or cfg.themeMode.value != old_theme
-                or (hasattr(cfg, "themeId") and cfg.themeId.value != old_theme_id)
-                or cfg.showClear.value != old_clear
-                or cfg.showSpotlight.value != old_spotlight
-                or cfg.showTimer.value != old_timer
-                or cfg.showToolbarText.value != old_toolbar_text
-                or cfg.toolbarOrder.value != old_toolbar_order
-                or cfg.safeArea.value != old_safe_area
-                or cfg.scale.value != old_scale
-            )
-            
-            if should_reload:
-                if not self._reloading_overlay:
-                    self._reload_timer.start()
-            else:
-                if self.overlay:
-                    if new_rebuild_at and new_rebuild_at != old_rebuild_at:
-                        if not self._reloading_overlay:
-                            self._reload_timer.start()
-                    if cfg.showStatusBar.value != old_status_bar:
-                        self.overlay._on_status_bar_visibility_changed(cfg.showStatusBar.value)
-            
-            # Layout mode change is now handled by auto-reload above, no restart prompt needed
-            
-            if cfg.themeMode.value != old_theme:
-                if hasattr(self, 'tray'):
-                    self.tray._update_icon()
-            
-            if new_rebuild_at is not None:
-                self._overlay_rebuild_at = new_rebuild_at
+        if not delta.rebuild:
+            start = time.perf_counter()
+            try:
+                applied = self.overlay.apply_settings_delta(delta)
+            except Exception as e:
+                print(f"In-place overlay update failed, rebuilding: {e}")
+                applied = False
+            if applied:
+                self._record_overlay_reconfig("in_place", start)
+                return
+        start = time.perf_counter()
+        self._reload_overlay()
+        self._record_overlay_reconfig("rebuild", start)
+
+    def _record_overlay_reconfig(self, path, start):
+        from ppt_assistant.core.metrics import metrics
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        entry = self._overlay_reconfig_stats[path]
+        entry["count"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["last_ms"] = elapsed_ms
+        metrics().histogram(f"overlay.reconfig.{path}_ms").record(elapsed_ms)
+
+    def _register_metrics(self):
+        from ppt_assistant.core.ipc import message_hub
+        from ppt_assistant.core.metrics import metrics
+        from ppt_assistant.core.stall_profiler import stall_profiler
+        from ppt_assistant.core.status_sampler import status_sampler
+        registry = metrics()
+        registry.register_collector("poll", self.monitor.get_poll_stats)
+        registry.register_collector("backends", self.monitor.get_backend_stats)
+        registry.register_collector("com", self.monitor.get_com_stats)
+        registry.register_collector("video_signals", self.monitor.get_video_signal_stats)
+        registry.register_collector("thumbnails", self.monitor.get_thumbnail_stats)
+        registry.register_collector("overlay_reconfig", self.get_overlay_reconfig_stats)
+        registry.register_collector("status_sampler", status_sampler().stats)
+        registry.register_collector("ui_stalls", stall_profiler().recent_stalls)
+        # On demand from a helper process; the same snapshot is exported at exit.
+        hub = message_hub()
+        hub.handle("metrics.snapshot", lambda _params, _channel: registry.snapshot())
+        hub.handle("metrics.export", lambda params, _channel: registry.export((params or {}).get("path")))
+
+    def get_overlay_reconfig_stats(self):
+        stats = {}
+        for path, entry in self._overlay_reconfig_stats.items():
+            avg = entry["total_ms"] / entry["count"] if entry["count"] else None
+            stats[path] = dict(entry, avg_ms=avg)
+        return stats
 
     def _reload_overlay(self):
         """Recreate the overlay window to apply language and layout changes."""
@@ -998,16 +1086,26 @@ class PPTAssistantApp:
 
     def restart(self):
         self.cleanup()
+        # Running countdowns carry on in the new process.
+        os.environ["KAZUHA_TIMER_STATE"] = json.dumps(self._timer_manager.state())
         os.execl(sys.executable, sys.executable, *sys.argv)
 
     def cleanup(self):
         """Cleanup app resources and terminate subprocesses."""
+        from ppt_assistant.core.metrics import metrics
+        from ppt_assistant.core.settings_service import SettingsService
+        from ppt_assistant.core.status_sampler import status_sampler
+        from ppt_assistant.core.webview_client import webview_host
         if hasattr(self, 'monitor'):
             self.monitor.stop_monitoring()
         if hasattr(self, 'settings_plugin'):
             self.settings_plugin.terminate()
+        webview_host().stop()
         if hasattr(self, 'overlay'):
             self.overlay.cleanup()
+        status_sampler().stop()
+        SettingsService(SETTINGS_PATH).flush()
+        metrics().export()
 
     def run(self):
         # sys.exit(self.app.exec())
@@ -1053,6 +1151,7 @@ if __name__ == "__main__":
         splash = StartupSplash()
         splash.show()
         app.processEvents()
+        startup_profiler().milestone("splash_shown")
 
     app_instance = PPTAssistantApp(app, splash)
     crash_handler.set_app_instance(app_instance)
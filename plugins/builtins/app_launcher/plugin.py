@@ -38,7 +38,7 @@ class AppLauncherPlugin(AssistantPlugin):
                 "icon": "" 
             })
             cfg.quickLaunchApps.value = apps
-            _save_cfg()
+            _save_cfg(cfg.quickLaunchApps)
             
             # Notify toolbar to refresh
             if self.context and hasattr(self.context, 'update_toolbar'):
@@ -51,7 +51,7 @@ class AppLauncherPlugin(AssistantPlugin):
                 app['name'] = new_name
                 break
         cfg.quickLaunchApps.value = apps
-        _save_cfg()
+        _save_cfg(cfg.quickLaunchApps)
         if self.context and hasattr(self.context, 'update_toolbar'):
             self.context.update_toolbar()
 
@@ -59,7 +59,7 @@ class AppLauncherPlugin(AssistantPlugin):
         apps = cfg.quickLaunchApps.value.copy()
         apps = [app for app in apps if app['path'] != path]
         cfg.quickLaunchApps.value = apps
-        _save_cfg()
+        _save_cfg(cfg.quickLaunchApps)
         if self.context and hasattr(self.context, 'update_toolbar'):
             self.context.update_toolbar()
 
@@ -4,6 +4,8 @@ import subprocess
 from PySide6.QtWidgets import QWidget, QApplication
 from plugins.interface import AssistantPlugin
 from ppt_assistant.core.config import SETTINGS_PATH
+from ppt_assistant.core.webview_client import webview_host
+from ppt_assistant.core.ipc import message_hub
 
 class OnboardingPlugin(AssistantPlugin):
     def __init__(self, parent=None):
@@ -25,9 +27,12 @@ class OnboardingPlugin(AssistantPlugin):
         main_path = os.path.join(root_dir, "main.py")
         width = str(960)
         height = str(640)
-        env = os.environ.copy()
+        preview_env = {"ONBOARDING_PREVIEW": "true" if preview else "false"}
+        if webview_host().open("onboarding", html_path, "Onboarding", width, height, env=preview_env, reload=True):
+            return
+        env = message_hub().child_env()
         env["SETTINGS_PATH"] = SETTINGS_PATH
-        env["ONBOARDING_PREVIEW"] = "true" if preview else "false"
+        env.update(preview_env)
         if getattr(sys, "frozen", False):
             cmd = [
                 sys.executable,
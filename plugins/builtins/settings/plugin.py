@@ -4,6 +4,8 @@ import subprocess
 from PySide6.QtWidgets import QWidget, QApplication
 from plugins.interface import AssistantPlugin
 from ppt_assistant.core.config import SETTINGS_PATH
+from ppt_assistant.core.webview_client import webview_host
+from ppt_assistant.core.ipc import message_hub
 
 class SettingsPlugin(AssistantPlugin):
     def __init__(self, parent=None):
@@ -55,7 +57,10 @@ class SettingsPlugin(AssistantPlugin):
         width = str(1256)
         height = str(734)
 
-        env = os.environ.copy()
+        if webview_host().open("settings", html_path, "Settings", width, height, custom_border=True):
+            return
+
+        env = message_hub().child_env()
         env["SETTINGS_PATH"] = SETTINGS_PATH
 
         if getattr(sys, "frozen", False):
@@ -1,5 +1,6 @@
 import os
 import sys
+import json
 import subprocess
 import threading
 from PySide6.QtWidgets import QWidget, QApplication
@@ -7,6 +8,8 @@ from PySide6.QtCore import Signal
 from plugins.interface import AssistantPlugin
 from ppt_assistant.core.config import SETTINGS_PATH
 from ppt_assistant.core.timer_manager import TimerManager
+from ppt_assistant.core.webview_client import webview_host
+from ppt_assistant.core.ipc import message_hub
 
 class TimerPlugin(AssistantPlugin):
     start_requested = Signal(int)
@@ -24,6 +27,12 @@ class TimerPlugin(AssistantPlugin):
         self.resume_requested.connect(self._timer_manager.resume)
         self.stop_requested.connect(self._timer_manager.stop)
         self.finish_requested.connect(self._timer_manager.finish)
+        self._pushed_state = None
+        self._timer_manager.updated.connect(lambda *_: self._push_state())
+        self._timer_manager.state_changed.connect(lambda *_: self._push_state())
+        # Commands from the timer window, whether it lives in the webview
+        # host or in its own process.
+        message_hub().event_received.connect(self._on_hub_event)
 
     def get_name(self):
         return "计时器"
@@ -57,11 +66,22 @@ class TimerPlugin(AssistantPlugin):
         width = str(int(min(max(600, screen_geo.width() * 0.35), screen_geo.width() * 0.5)))
         height = str(int(min(max(500, screen_geo.height() * 0.45), screen_geo.height() * 0.6)))
 
-        env = os.environ.copy()
+        timer_env = {
+            "ASSETS_PATH": assets_path,
+            "TIMER_REMAINING": f"{self._timer_manager.remaining_seconds:.3f}",
+            "TIMER_IS_RUNNING": "true" if self._timer_manager.is_running else "false",
+            "TIMER_STATE": json.dumps(self._timer_manager.state()),
+        }
+        # The page reads the timer state on load, so a reused window is
+        # reloaded rather than just shown.
+        if webview_host().open("timer", html_path, "Kazuha Timer Plugin", width, height,
+                               custom_border=True, env=timer_env, reload=True):
+            return
+
+        env = message_hub().child_env()
         env["SETTINGS_PATH"] = SETTINGS_PATH
-        env["ASSETS_PATH"] = assets_path
-        env["TIMER_REMAINING"] = str(self._timer_manager.remaining_seconds)
-        env["TIMER_IS_RUNNING"] = "true" if self._timer_manager.is_running else "false"
+        env["KAZUHA_WINDOW_ID"] = "timer"
+        env.update(timer_env)
 
         if getattr(sys, "frozen", False):
             cmd = [
@@ -97,34 +117,48 @@ class TimerPlugin(AssistantPlugin):
         # Start a thread to read stdout and sync with TimerManager
         threading.Thread(target=self._read_stdout, args=(self.process,), daemon=True).start()
 
+    def _on_hub_event(self, channel, name, data):
+        if name == "window.message" and isinstance(data, dict) and data.get("id") == "timer":
+            self._handle_line(data.get("line", ""))
+
+    def _push_state(self):
+        """Send TimerManager's state to the timer window so its local
+        countdown cannot drift. Once per whole second or state change."""
+        tm = self._timer_manager
+        state = (tm.display_seconds(), tm.is_running)
+        if state == self._pushed_state:
+            return
+        self._pushed_state = state
+        message_hub().push("timer.state", {"remaining": tm.remaining_seconds, "is_running": tm.is_running}, coalesce=True)
+
     def _read_stdout(self, process):
         while process.poll() is None:
             line = process.stdout.readline()
             if not line:
                 break
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith("TIMER_START:"):
-                try:
-                    seconds = int(line.split(":")[1])
-                    self.start_requested.emit(seconds)
-                except:
-                    pass
-            elif line == "TIMER_PAUSE":
-                self.pause_requested.emit()
-            elif line == "TIMER_RESUME":
-                self.resume_requested.emit()
-            elif line == "TIMER_STOP":
-                self.stop_requested.emit()
-            elif line == "TIMER_FINISH":
-                self.finish_requested.emit()
-        
+            self._handle_line(line)
+
         # When process exits, we no longer stop the timer logic here 
         # as per user request to keep timer running even if window is closed.
         pass
 
+    def _handle_line(self, line):
+        line = line.strip()
+        if line.startswith("TIMER_START:"):
+            try:
+                seconds = int(line.split(":")[1])
+                self.start_requested.emit(seconds)
+            except:
+                pass
+        elif line == "TIMER_PAUSE":
+            self.pause_requested.emit()
+        elif line == "TIMER_RESUME":
+            self.resume_requested.emit()
+        elif line == "TIMER_STOP":
+            self.stop_requested.emit()
+        elif line == "TIMER_FINISH":
+            self.finish_requested.emit()
+
     def terminate(self):
         if self.process and self.process.poll() is None:
             self.process.terminate()
@@ -0,0 +1,202 @@
+import json
+import os
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtCore import QObject, QEvent, QTimer, QUrl
+
+from ppt_assistant.core import ipc
+from plugins.webview_runner import (
+    Api, MainWindow, _apply_chromium_flags, _dialog_theme_defaults, _load_version_info,
+)
+
+DIALOG_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ppt_assistant", "ui", "dialog.html")
+
+
+class WebviewHost(QObject):
+    """
+    Long-lived process that owns every webview window. Chromium is booted
+    once, up front; windows are opened on request from the main process,
+    hidden instead of destroyed when closed, and reused on the next open.
+
+    Talks to the main process's message hub over channel. Requests:
+    webview.open {id, url, title, width, height, custom_border, env,
+    reload} -> {ms, reused}, webview.hide {id}, webview.close {id},
+    webview.quit. Events sent: window.hidden {id}, window.closed {id},
+    window.message {id, line} for the lines a window would otherwise
+    print (TIMER_*, DIALOG_*, SELECTED_ITEM). Events from the hub are
+    passed on to every window's page.
+    """
+
+    def __init__(self, channel, parent=None):
+        super().__init__(parent)
+        self._windows = {}
+        self._reusable = set()
+        self._dialog_seq = 0
+        self._channel = channel
+        channel.handle("webview.open", lambda params, _c: self._on_open(params))
+        channel.handle("webview.hide", lambda params, _c: self._on_hide(params))
+        channel.handle("webview.close", lambda params, _c: self._on_close(params))
+        channel.handle("webview.quit", lambda params, _c: self._on_quit())
+        channel.event_received.connect(self._on_event)
+        # The main process is gone; nothing can reopen our windows.
+        channel.closed.connect(QApplication.quit)
+        # Starts Chromium's GPU, network and renderer processes now rather
+        # than on the first open.
+        self._warm = QWebEngineView()
+        self._warm.setUrl(QUrl("about:blank"))
+
+    def _send(self, name, data):
+        self._channel.push(name, data)
+
+    def _on_event(self, name, data):
+        for window in list(self._windows.values()):
+            window.push_event(name, data)
+
+    def _on_open(self, spec):
+        _window, elapsed_ms, reused = self.open_window(spec)
+        return {"ms": elapsed_ms, "reused": reused}
+
+    def _on_hide(self, params):
+        window = self._windows.get(params.get("id"))
+        if window is not None:
+            window.hide()
+
+    def _on_close(self, params):
+        window = self._windows.get(params.get("id"))
+        if window is not None:
+            self._reusable.discard(params.get("id"))
+            window.close()
+
+    def _on_quit(self):
+        for window_id in list(self._windows):
+            self._reusable.discard(window_id)
+            self._windows[window_id].close()
+        # Let the reply go out first.
+        QTimer.singleShot(0, QApplication.quit)
+
+    def _read_settings(self):
+        settings_path = os.environ.get("SETTINGS_PATH")
+        if not settings_path:
+            if getattr(sys, "frozen", False):
+                settings_path = os.path.join(os.path.dirname(sys.executable), "settings.json")
+            else:
+                settings_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "settings.json")
+        try:
+            with open(settings_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def open_window(self, spec):
+        start = time.perf_counter()
+        window_id = spec["id"]
+        window = self._windows.get(window_id)
+        reused = window is not None
+        if window is None:
+            window = self._create_window(spec)
+        else:
+            api = window.api
+            api.env = dict(os.environ, **(spec.get("env") or {}))
+            settings = self._read_settings()
+            if spec.get("reload") or settings != api.settings:
+                window.reload_with_settings(settings)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return window, elapsed_ms, reused
+
+    def open_dialog(self, dialog_data):
+        self._dialog_seq += 1
+        window, _elapsed_ms, _reused = self.open_window({
+            "id": f"dialog-{self._dialog_seq}",
+            "url": DIALOG_HTML,
+            "title": dialog_data.get("title") or "Dialog",
+            "width": 650,
+            "height": 500,
+            "dialog": dialog_data,
+            "reusable": False,
+        })
+        return window
+
+    def _create_window(self, spec):
+        window_id = spec["id"]
+        api = Api()
+        api.host = self
+        api.env = dict(os.environ, **(spec.get("env") or {}))
+        api.emit_line = lambda line, wid=window_id: self._send("window.message", {"id": wid, "line": line})
+        api.settings = self._read_settings()
+        api.version = _load_version_info()
+        theme_mode = api.settings.get("Appearance", {}).get("ThemeMode", "Auto")
+        dialog_data = spec.get("dialog")
+        if dialog_data is not None:
+            default_theme, default_accent = _dialog_theme_defaults(api.settings)
+            if dialog_data.get("theme", "auto") == "auto":
+                dialog_data["theme"] = default_theme
+            dialog_data.setdefault("accentColor", default_accent)
+            api.dialog_data = dialog_data
+            if "overrideSettings" in dialog_data:
+                api.settings = dialog_data["overrideSettings"]
+            theme_mode = dialog_data["theme"]
+        window = MainWindow(
+            spec.get("title", ""),
+            spec["url"],
+            api,
+            int(spec.get("width", 800)),
+            int(spec.get("height", 600)),
+            theme_mode,
+            bool(spec.get("custom_border")),
+        )
+        if spec.get("title") == "Settings":
+            window.setMinimumWidth(1099)
+        window.installEventFilter(self)
+        self._windows[window_id] = window
+        if spec.get("reusable", True):
+            self._reusable.add(window_id)
+        return window
+
+    def _window_id(self, window):
+        for window_id, w in self._windows.items():
+            if w is window:
+                return window_id
+        return None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Close:
+            window_id = self._window_id(obj)
+            if window_id is not None:
+                if window_id in self._reusable:
+                    event.ignore()
+                    obj.hide()
+                    self._send("window.hidden", {"id": window_id})
+                    return True
+                self._windows.pop(window_id, None)
+                obj.deleteLater()
+                self._send("window.closed", {"id": window_id})
+        return super().eventFilter(obj, event)
+
+
+def main():
+    _apply_chromium_flags()
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
+    channel = ipc.connect(os.environ.get(ipc.ENV_NAME), 2000)
+    if channel is None:
+        print("Webview host: main process is not reachable", file=sys.stderr)
+        return
+    host = WebviewHost(channel)
+    try:
+        channel.call("webview.hello", {"pid": os.getpid()}, 2000)
+    except ipc.IpcError as e:
+        print(f"Webview host: {e}", file=sys.stderr)
+        return
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
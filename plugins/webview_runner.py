@@ -5,6 +5,7 @@ import ctypes
 import tempfile
 import subprocess
 import base64
+import time
 from json import JSONDecodeError
 
 from PySide6.QtWidgets import QApplication, QFileDialog
@@ -14,6 +15,13 @@ from PySide6.QtWebChannel import QWebChannel
 from PySide6.QtCore import QObject, Slot, QUrl, QFile, QIODevice, Qt, QTimer, QBuffer, QByteArray
 from PySide6.QtGui import QColor, QImage
 
+try:
+    from ppt_assistant.core.settings_service import SettingsClient
+    from ppt_assistant.core import ipc
+except ImportError:
+    SettingsClient = None
+    ipc = None
+
 DWMWA_WINDOW_CORNER_PREFERENCE = 33
 DWMWCP_ROUND = 2
 DWMWA_USE_IMMERSIVE_DARK_MODE = 20
@@ -272,6 +280,12 @@ class Api(QObject):
         self.settings = {}
         self.version = {}
         self.dialog_data = {}
+        self._settings_client = None
+        # Set when the window lives in the shared webview host: per-window
+        # environment, where protocol lines go, and the host itself.
+        self.env = os.environ
+        self.emit_line = None
+        self.host = None
 
     def set_window(self, window):
         self._window = window
@@ -374,17 +388,39 @@ class Api(QObject):
         except Exception:
             return []
 
+    def _send_line(self, line):
+        if self.emit_line is not None:
+            self.emit_line(line)
+            return
+        print(line)
+        sys.stdout.flush()
+
+    def _finish(self):
+        if self._window:
+            self._window.close()
+        if self.host is None:
+            sys.exit(0)
+
     def _get_settings_path(self):
-        settings_path = os.environ.get("SETTINGS_PATH")
+        settings_path = self.env.get("SETTINGS_PATH")
         if not settings_path:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            settings_path = os.path.join(base_dir, "settings.json")
+            if getattr(sys, "frozen", False):
+                settings_path = os.path.join(os.path.dirname(sys.executable), "settings.json")
+            else:
+                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                settings_path = os.path.join(base_dir, "settings.json")
         return settings_path
 
-    @Slot(result="QVariant")
-    def get_quick_launch_apps(self):
+    def _client(self):
+        if self._settings_client is None and SettingsClient is not None:
+            self._settings_client = SettingsClient(self._get_settings_path(), parent=self)
+        return self._settings_client
+
+    def _read_settings(self):
+        client = self._client()
+        if client is not None:
+            return client.snapshot()
         settings_path = self._get_settings_path()
-        data = {}
         try:
             if os.path.exists(settings_path):
                 with open(settings_path, "r", encoding="utf-8") as f:
@@ -392,17 +428,53 @@ class Api(QObject):
                         data = json.load(f)
                     except JSONDecodeError:
                         data = {}
-            else:
-                data = self.settings or {}
+                return data if isinstance(data, dict) else {}
         except Exception:
-            data = self.settings or {}
+            pass
+        return self.settings or {}
+
+    def _save_settings(self, patch):
+        """Send {category: {key: value}} to the settings service, which
+        coalesces and writes it; without it, write the file directly."""
+        client = self._client()
+        if client is not None:
+            client.update(patch)
+            return
+        settings_path = self._get_settings_path()
+        data = {}
+        if os.path.exists(settings_path):
+            with open(settings_path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except JSONDecodeError:
+                    data = {}
+        for category, values in patch.items():
+            if not isinstance(data.get(category), dict):
+                data[category] = {}
+            data[category].update(values)
+        with open(settings_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def _quick_launch_apps(self, data):
         toolbar = data.get("Toolbar") or {}
         apps = toolbar.get("QuickLaunchApps") or []
-        if not isinstance(apps, list):
-            apps = []
+        return apps if isinstance(apps, list) else []
+
+    def _save_quick_launch_apps(self, data, apps):
+        toolbar = data.get("Toolbar")
+        if not isinstance(toolbar, dict):
+            toolbar = data["Toolbar"] = {}
+        toolbar["QuickLaunchApps"] = apps
+        self._save_settings({"Toolbar": {"QuickLaunchApps": apps}})
         self.settings = data
         return apps
 
+    @Slot(result="QVariant")
+    def get_quick_launch_apps(self):
+        data = self._read_settings()
+        self.settings = data
+        return self._quick_launch_apps(data)
+
     @Slot(result="QVariant")
     def add_quick_launch_app(self):
         file_path = None
@@ -416,29 +488,14 @@ class Api(QObject):
         if not file_path:
             return self.get_quick_launch_apps()
         name = os.path.splitext(os.path.basename(file_path))[0]
-        settings_path = self._get_settings_path()
-        data = {}
         try:
-            if os.path.exists(settings_path):
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                    except JSONDecodeError:
-                        data = {}
-            toolbar = data.get("Toolbar") or {}
-            apps = toolbar.get("QuickLaunchApps") or []
-            if not isinstance(apps, list):
-                apps = []
+            data = self._read_settings()
+            apps = self._quick_launch_apps(data)
             if any(app.get("path") == file_path for app in apps):
                 self.settings = data
                 return apps
             apps.append({"name": name, "path": file_path, "icon": ""})
-            toolbar["QuickLaunchApps"] = apps
-            data["Toolbar"] = toolbar
-            with open(settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            self.settings = data
-            return apps
+            return self._save_quick_launch_apps(data, apps)
         except Exception:
             return self.get_quick_launch_apps()
 
@@ -446,60 +503,29 @@ class Api(QObject):
     def rename_quick_launch_app(self, path, new_name):
         if not path or not new_name:
             return self.get_quick_launch_apps()
-        settings_path = self._get_settings_path()
-        data = {}
         try:
-            if os.path.exists(settings_path):
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                    except JSONDecodeError:
-                        data = {}
-            toolbar = data.get("Toolbar") or {}
-            apps = toolbar.get("QuickLaunchApps") or []
-            if not isinstance(apps, list):
-                apps = []
+            data = self._read_settings()
+            apps = self._quick_launch_apps(data)
             for app in apps:
                 if app.get("path") == path:
                     app["name"] = new_name
                     break
-            toolbar["QuickLaunchApps"] = apps
-            data["Toolbar"] = toolbar
-            with open(settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            self.settings = data
-            return apps
+            return self._save_quick_launch_apps(data, apps)
         except Exception:
             return self.get_quick_launch_apps()
 
     @Slot(str, result="QVariant")
     def remove_quick_launch_app(self, path):
-        settings_path = self._get_settings_path()
-        data = {}
         try:
-            if os.path.exists(settings_path):
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                    except JSONDecodeError:
-                        data = {}
-            toolbar = data.get("Toolbar") or {}
-            apps = toolbar.get("QuickLaunchApps") or []
-            if not isinstance(apps, list):
-                apps = []
-            apps = [app for app in apps if app.get("path") != path]
-            toolbar["QuickLaunchApps"] = apps
-            data["Toolbar"] = toolbar
-            with open(settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            self.settings = data
-            return apps
+            data = self._read_settings()
+            apps = [app for app in self._quick_launch_apps(data) if app.get("path") != path]
+            return self._save_quick_launch_apps(data, apps)
         except Exception:
             return self.get_quick_launch_apps()
 
     @Slot(str, str, "QVariant")
     def save_setting(self, category, key, value):
-        preview_mode = os.environ.get("ONBOARDING_PREVIEW", "").lower() == "true"
+        preview_mode = self.env.get("ONBOARDING_PREVIEW", "").lower() == "true"
         if preview_mode:
             return
         if not isinstance(category, str) or not isinstance(key, str):
@@ -508,27 +534,13 @@ class Api(QObject):
             value = value.toPython()
         except Exception:
             pass
-        settings_path = os.environ.get("SETTINGS_PATH")
-        if not settings_path:
-            if getattr(sys, "frozen", False):
-                settings_path = os.path.join(os.path.dirname(sys.executable), "settings.json")
-            else:
-                base_dir = os.path.dirname(os.path.abspath(__file__))
-                settings_path = os.path.join(os.path.dirname(base_dir), "settings.json")
         try:
-            data = {}
-            if os.path.exists(settings_path):
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                    except JSONDecodeError:
-                        data = {}
-            if category not in data:
-                data[category] = {}
-            data[category][key] = value
-            with open(settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            self.settings = data
+            # Only the changed key is sent; self.settings mirrors it so the
+            # page sees its own edits without re-reading the file.
+            if not isinstance(self.settings.get(category), dict):
+                self.settings[category] = {}
+            self.settings[category][key] = value
+            self._save_settings({category: {key: value}})
             
             # Hook for system integration settings
             if category == "General":
@@ -540,7 +552,7 @@ class Api(QObject):
                     _pin_to_start(bool(value))
 
             if category == "Appearance" and key in ("ThemeMode", "ThemeId"):
-                self.update_settings(data)
+                self.update_settings(self.settings)
         except Exception as e:
             print(f"Error saving settings: {e}", file=sys.stderr)
 
@@ -604,6 +616,12 @@ class Api(QObject):
             "theme": theme_lower,
             "accentColor": accent
         }
+        self._open_dialog(dialog_data)
+
+    def _open_dialog(self, dialog_data):
+        if self.host is not None:
+            self.host.open_dialog(dialog_data)
+            return
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as f:
             json.dump(dialog_data, f)
             temp_path = f.name
@@ -637,14 +655,9 @@ class Api(QObject):
             if lang not in temp_settings["Fonts"]["Profiles"]:
                 temp_settings["Fonts"]["Profiles"][lang] = {}
             temp_settings["Fonts"]["Profiles"][lang]["web"] = font_name
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as f:
-            json.dump(dialog_data, f)
-            temp_path = f.name
         if font_name:
             dialog_data["overrideSettings"] = temp_settings
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(dialog_data, f)
-        subprocess.Popen([sys.executable, __file__, "--dialog", temp_path])
+        self._open_dialog(dialog_data)
 
     @Slot(result="QVariant")
     def get_dialog_data(self):
@@ -652,25 +665,31 @@ class Api(QObject):
 
     @Slot()
     def on_confirm(self):
-        print("DIALOG_CONFIRMED")
-        sys.stdout.flush()
-        if self._window:
-            self._window.close()
-        sys.exit(0)
+        self._send_line("DIALOG_CONFIRMED")
+        self._finish()
 
     @Slot()
     def on_cancel(self):
-        print("DIALOG_CANCELLED")
-        sys.stdout.flush()
-        if self._window:
-            self._window.close()
-        sys.exit(0)
+        self._send_line("DIALOG_CANCELLED")
+        self._finish()
     @Slot()
     def open_onboarding_preview(self):
         base_dir = os.path.dirname(os.path.abspath(__file__))
         onboarding_html = os.path.join(base_dir, "builtins", "onboarding", "onboarding.html")
         root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         main_path = os.path.join(root_dir, "main.py")
+        if self.host is not None:
+            self.host.open_window({
+                "id": "onboarding_preview",
+                "url": onboarding_html,
+                "title": "Onboarding Preview",
+                "width": 960,
+                "height": 640,
+                "custom_border": True,
+                "env": {"ONBOARDING_PREVIEW": "true"},
+                "reload": True,
+            })
+            return
         env = os.environ.copy()
         sp = env.get("SETTINGS_PATH")
         if not sp:
@@ -694,7 +713,7 @@ class Api(QObject):
                 pass
     @Slot(result="QVariant")
     def import_settings(self):
-        preview_mode = os.environ.get("ONBOARDING_PREVIEW", "").lower() == "true"
+        preview_mode = self.env.get("ONBOARDING_PREVIEW", "").lower() == "true"
         target_path = self._get_settings_path()
         file_path = None
         try:
@@ -709,8 +728,13 @@ class Api(QObject):
             if not isinstance(data, dict):
                 return self.settings
             if not preview_mode:
-                with open(target_path, "w", encoding="utf-8") as wf:
-                    json.dump(data, wf, indent=4, ensure_ascii=False)
+                client = self._client()
+                if client is not None:
+                    client.replace(data)
+                    client.flush()
+                else:
+                    with open(target_path, "w", encoding="utf-8") as wf:
+                        json.dump(data, wf, indent=4, ensure_ascii=False)
             self.settings = data
             self.update_settings(data)
             return data
@@ -719,47 +743,51 @@ class Api(QObject):
 
     @Slot(result=str)
     def get_assets_path(self):
-        return os.environ.get("ASSETS_PATH", "")
+        return self.env.get("ASSETS_PATH", "")
 
     @Slot(result="QVariant")
     def get_timer_state(self):
+        try:
+            remaining = float(self.env.get("TIMER_REMAINING", 0) or 0)
+        except ValueError:
+            remaining = 0.0
+        # TIMER_STATE carries the deadline, so time spent starting this
+        # window is not added to the countdown.
+        try:
+            default = json.loads(self.env.get("TIMER_STATE") or "{}").get("timers", {}).get("default", {})
+            if "deadline_wall" in default:
+                remaining = max(0.0, float(default["deadline_wall"]) - time.time())
+        except Exception:
+            pass
         return {
-            "remaining": int(os.environ.get("TIMER_REMAINING", 0)),
-            "is_running": os.environ.get("TIMER_IS_RUNNING", "false") == "true"
+            "remaining": remaining,
+            "is_running": self.env.get("TIMER_IS_RUNNING", "false") == "true"
         }
 
     @Slot(int)
     def start_timer(self, seconds):
-        print(f"TIMER_START:{seconds}")
-        sys.stdout.flush()
+        self._send_line(f"TIMER_START:{seconds}")
 
     @Slot()
     def pause_timer(self):
-        print("TIMER_PAUSE")
-        sys.stdout.flush()
+        self._send_line("TIMER_PAUSE")
 
     @Slot()
     def resume_timer(self):
-        print("TIMER_RESUME")
-        sys.stdout.flush()
+        self._send_line("TIMER_RESUME")
 
     @Slot()
     def stop_timer(self):
-        print("TIMER_STOP")
-        sys.stdout.flush()
+        self._send_line("TIMER_STOP")
 
     @Slot()
     def finish_timer(self):
-        print("TIMER_FINISH")
-        sys.stdout.flush()
+        self._send_line("TIMER_FINISH")
 
     @Slot("QVariant")
     def select_item(self, item):
-        print(f"SELECTED_ITEM:{json.dumps(item, ensure_ascii=False)}")
-        sys.stdout.flush()
-        if self._window:
-            self._window.close()
-        sys.exit(0)
+        self._send_line(f"SELECTED_ITEM:{json.dumps(item, ensure_ascii=False)}")
+        self._finish()
 
     @Slot(result="QVariant")
     def get_monet_colors(self):
@@ -878,13 +906,9 @@ class MainWindow(QWebEngineView):
         script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
         script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
         self.page().scripts().insert(script)
-        settings_json = json.dumps(api.settings, ensure_ascii=False)
-        settings_script = QWebEngineScript()
-        settings_script.setSourceCode(f"window.initialSettings = {settings_json};")
-        settings_script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
-        settings_script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
-        self.page().scripts().insert(settings_script)
-        preview_flag = os.environ.get("ONBOARDING_PREVIEW", "").lower() == "true"
+        self._settings_script = None
+        self._set_initial_settings(api.settings)
+        preview_flag = api.env.get("ONBOARDING_PREVIEW", "").lower() == "true"
         preview_script = QWebEngineScript()
         preview_script.setSourceCode(f"window.__ONBOARDING_PREVIEW = {json.dumps(preview_flag)};")
         preview_script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
@@ -896,6 +920,30 @@ class MainWindow(QWebEngineView):
         self.loadFinished.connect(lambda *_: self._schedule_backdrop_apply())
         self._schedule_backdrop_apply()
 
+    def _set_initial_settings(self, settings):
+        if self._settings_script is not None:
+            self.page().scripts().remove(self._settings_script)
+        settings_json = json.dumps(settings, ensure_ascii=False)
+        settings_script = QWebEngineScript()
+        settings_script.setSourceCode(f"window.initialSettings = {settings_json};")
+        settings_script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+        settings_script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+        self.page().scripts().insert(settings_script)
+        self._settings_script = settings_script
+
+    def reload_with_settings(self, settings):
+        """Reload the page with fresh settings; used when a hidden window is reused."""
+        self.api.settings = settings
+        self._set_initial_settings(settings)
+        self.update_theme_mode(settings.get("Appearance", {}).get("ThemeMode", "Auto"))
+        self.reload()
+
+    def push_event(self, name, data=None):
+        """Deliver a main-process event to the page as a 'kazuha:<name>' DOM event."""
+        event_name = json.dumps("kazuha:" + name)
+        detail = json.dumps(data, ensure_ascii=False)
+        self.page().runJavaScript(f"window.dispatchEvent(new CustomEvent({event_name}, {{detail: {detail}}}));")
+
     def _apply_page_background(self):
         is_dark = _resolve_theme_dark(self._theme_mode)
         if is_dark:
@@ -979,6 +1027,43 @@ def apply_win11_aesthetics(window, theme_mode=None):
         except Exception:
             pass
 
+def _dialog_theme_defaults(settings):
+    theme = str(settings.get("Appearance", {}).get("ThemeMode", "Auto")).lower()
+    return theme, ("#E1EBFF" if theme == "dark" else "#3275F5")
+
+
+def _load_version_info():
+    try:
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        version_path = os.path.join(root_dir, "version.json")
+        if os.path.exists(version_path):
+            with open(version_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return {}
+
+
+def _attach_channel(api, window):
+    """Send protocol lines to the main process's message hub, and pass
+    its events to the page, when the hub's name is in the environment.
+    Without it the lines go to stdout as before."""
+    if ipc is None:
+        return None
+    channel = ipc.connect(os.environ.get(ipc.ENV_NAME), 500)
+    if channel is None:
+        return None
+    window_id = os.environ.get("KAZUHA_WINDOW_ID") or window.windowTitle()
+
+    def emit_line(line):
+        channel.push("window.message", {"id": window_id, "line": line})
+        channel.wait_for_bytes_written()
+
+    api.emit_line = emit_line
+    channel.event_received.connect(window.push_event)
+    return channel
+
+
 def main():
     _apply_chromium_flags()
     app = QApplication(sys.argv)
@@ -1001,11 +1086,7 @@ def main():
             try:
                 with open(settings_path, "r", encoding="utf-8") as f:
                     settings = json.load(f)
-                    default_theme = settings.get("Appearance", {}).get("ThemeMode", "Auto").lower()
-                    if default_theme == "dark":
-                        default_accent = "#E1EBFF"
-                    else:
-                        default_accent = "#3275F5"
+                    default_theme, default_accent = _dialog_theme_defaults(settings)
             except Exception:
                 settings = {}
         dialog_data = {}
@@ -1080,19 +1161,12 @@ def main():
                     api.settings = json.load(f)
             except Exception:
                 pass
-        try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            root_dir = os.path.dirname(base_dir)
-            version_path = os.path.join(root_dir, "version.json")
-            if os.path.exists(version_path):
-                with open(version_path, "r", encoding="utf-8") as f:
-                    api.version = json.load(f)
-        except Exception:
-            api.version = {}
+        api.version = _load_version_info()
         theme_mode = api.settings.get("Appearance", {}).get("ThemeMode", "Auto")
         window = MainWindow(title, url, api, width, height, theme_mode, custom_border)
         if title == "Settings":
             window.setMinimumWidth(1099)
+        channel = _attach_channel(api, window)
         window.show()
     else:
         return
@@ -0,0 +1,252 @@
+import threading
+import time
+
+from ppt_assistant.core.metrics import metrics
+
+# How long one call into the presentation application may take before the
+# worker making it is considered hung, by backend method name.
+DEFAULT_TIMEOUT_MS = 2000
+CALL_TIMEOUTS_MS = {
+    "acquire": 5000,
+    "release": 5000,
+    "export_slide": 15000,
+}
+
+# HRESULTs meaning the application is there but not taking calls (a modal
+# dialog, a long load): RPC_E_CALL_REJECTED, RPC_E_SERVERCALL_RETRYLATER,
+# RPC_E_CANTCALLOUT_ININPUTSYNCCALL.
+BUSY_HRESULTS = (-2147418111, -2147417846, -2147417843)
+
+
+class ComGuardError(Exception):
+    pass
+
+
+class ComTimeout(ComGuardError):
+    """The call overran its timeout; its worker has been given up on."""
+
+
+class CircuitOpen(ComGuardError):
+    """The application is not responding; calls are held off for a while."""
+
+
+class ComCallFailed(ComGuardError):
+    """The call raised; the guard has counted it. The original is __cause__."""
+
+
+def _hresult(exc):
+    hresult = getattr(exc, "hresult", None)
+    if hresult is None and exc.args and isinstance(exc.args[0], int):
+        hresult = exc.args[0]
+    return hresult
+
+
+def is_busy_error(exc):
+    return _hresult(exc) in BUSY_HRESULTS
+
+
+class CircuitBreaker:
+    """
+    Stops calling an application that keeps failing. `threshold` busy
+    errors in a row, or one hang, open it for `cooldown` seconds; after
+    that calls are let through again. Failing again before the application
+    has answered for a full cooldown reopens it with twice the cooldown
+    (up to max_cooldown). Shared by successive workers, so a replacement
+    does not hammer a hung app.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=3, cooldown=1.0, max_cooldown=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.closed_at = None  # set while recovering from a trip
+        self.trips = 0
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._clock() - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self.closed_at = self._clock()
+            elif self.closed_at is not None and self._clock() - self.closed_at >= self.cooldown:
+                self.closed_at = None
+                self.cooldown = self.base_cooldown
+
+    def record_failure(self, hang=False):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.OPEN:
+                return
+            if self.state == self.CLOSED and not hang and self.failures < self.threshold:
+                return
+            if self.state == self.HALF_OPEN or self.closed_at is not None:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+            self.closed_at = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "cooldown_s": self.cooldown,
+                "trips": self.trips,
+            }
+
+
+class _Call:
+    __slots__ = ("name", "deadline", "hung")
+
+    def __init__(self, name, deadline):
+        self.name = name
+        self.deadline = deadline
+        self.hung = False
+
+
+class ComGuard:
+    """
+    Runs the calls one STA thread makes into the presentation application.
+    A COM call cannot be interrupted, so the call runs in place and a
+    watchdog thread tracks its deadline: when one passes, the guard is
+    marked hung, the breaker opens and on_hang(name) is called (from the
+    watchdog thread) so the owner can replace the thread. Whenever the
+    hung call does return, it raises ComTimeout, as does every later call.
+    Without on_hang there is no replacement: the hung call still raises
+    ComTimeout when it returns, and the guard carries on.
+    Anything the call raises is counted per call name and re-raised as
+    ComCallFailed, so callers only ever need to catch ComGuardError.
+    """
+
+    def __init__(self, breaker=None, on_hang=None, timeouts=None, clock=time.monotonic):
+        self.breaker = breaker or CircuitBreaker()
+        self.on_hang = on_hang
+        self.timeouts = dict(CALL_TIMEOUTS_MS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active = []
+        self._watchdog = None
+        self._closed = False
+        self._terminal = on_hang is not None
+        self.hung = False
+        self.hung_call = None
+        self.calls = 0
+        self.errors = {}
+        self.last_errors = {}
+        self.rejected = 0
+        self.timed_out = {}
+
+    def call(self, name, func, *args, force=False):
+        """
+        func(*args) under a timeout. force skips the abandoned and breaker
+        checks, for cleanup on a worker that is shutting down anyway.
+        """
+        if self.hung and not force:
+            raise ComTimeout(f"{name}: worker was abandoned after {self.hung_call} hung")
+        if not force and not self.breaker.allow():
+            self.rejected += 1
+            metrics().counter("com.rejected").inc()
+            raise CircuitOpen(name)
+        timeout = self.timeouts.get(name, DEFAULT_TIMEOUT_MS) / 1000.0
+        entry = _Call(name, self._clock() + timeout)
+        with self._cond:
+            self._active.append(entry)
+            self._ensure_watchdog()
+            self._cond.notify()
+        self.calls += 1
+        try:
+            result = func(*args)
+        except Exception as e:
+            if entry.hung:
+                raise
+            self._failed(name, e)
+            raise ComCallFailed(f"{name}: {e}") from e
+        finally:
+            with self._cond:
+                self._active.remove(entry)
+                if entry.hung and not self._terminal:
+                    self.hung = False
+                    self._cond.notify()
+            if entry.hung:
+                raise ComTimeout(f"{name} returned after its {timeout:.1f} s timeout")
+        self.breaker.record_success()
+        return result
+
+    def _failed(self, name, exc):
+        count = self.errors.get(name, 0) + 1
+        self.errors[name] = count
+        self.last_errors[name] = f"{type(exc).__name__}: {exc}"
+        registry = metrics()
+        registry.counter("com.errors").inc()
+        if is_busy_error(exc):
+            registry.counter("com.busy").inc()
+            self.breaker.record_failure()
+
+    def _ensure_watchdog(self):
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="ComGuardWatchdog", daemon=True)
+            self._watchdog.start()
+
+    def _watch(self):
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                entry = min((c for c in self._active if not c.hung), key=lambda c: c.deadline, default=None)
+                if entry is None or self.hung:
+                    # Nothing to time, or waiting for a hung call to return.
+                    self._cond.wait()
+                    continue
+                remaining = entry.deadline - self._clock()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                entry.hung = True
+                self.hung = True
+                self.hung_call = entry.name
+                self.timed_out[entry.name] = self.timed_out.get(entry.name, 0) + 1
+                on_hang = self.on_hang
+            metrics().counter("com.timeouts").inc()
+            self.breaker.record_failure(hang=True)
+            if self._terminal:
+                if on_hang is not None:
+                    on_hang(entry.name)
+                return
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            active = [c.name for c in self._active]
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "last_errors": dict(self.last_errors),
+            "rejected": self.rejected,
+            "timeouts": dict(self.timed_out),
+            "hung": self.hung_call if self.hung else None,
+            "active": active,
+        }
@@ -15,7 +15,11 @@ from qfluentwidgets.common.config import EnumSerializer
 import os
 import json
 import sys
-import winreg
+
+try:
+    import winreg
+except ImportError:
+    winreg = None
 
 
 class Config(QConfig):
@@ -43,6 +47,10 @@ class Config(QConfig):
     popWindowScale = RangeConfigItem("Overlay", "PopWindowScale", 1.0, RangeValidator(0.5, 3.0), restart=False)
 
     autoHandleInk = ConfigItem("PPT", "AutoHandleInk", True, BoolValidator())
+    # Video progress sent to the UI: minimum position change (seconds) and
+    # maximum updates per second.
+    videoProgressMinDelta = RangeConfigItem("PPT", "VideoProgressMinDelta", 0.5, RangeValidator(0.0, 10.0), restart=False)
+    videoProgressMaxRate = RangeConfigItem("PPT", "VideoProgressMaxRate", 4, RangeValidator(1, 30), restart=False)
 
     overlayScreen = OptionsConfigItem(
     "Overlay",
@@ -92,30 +100,9 @@ FIRST_RUN = not os.path.exists(SETTINGS_PATH)
 qconfig.load(SETTINGS_PATH, cfg)
 
 
-def _load_settings_json():
-    if not os.path.exists(SETTINGS_PATH):
-        return {}
-    try:
-        with open(SETTINGS_PATH, "rb") as f:
-            raw = f.read()
-    except Exception:
-        return {}
-    for enc in ("utf-8", "utf-8-sig", "gbk", "gb18030", "cp1252"):
-        try:
-            text = raw.decode(enc, errors="ignore")
-        except Exception:
-            continue
-        try:
-            data = json.loads(text)
-        except Exception:
-            continue
-        return data if isinstance(data, dict) else {}
-    return {}
-
-
 def _set_run_at_startup(enabled: bool):
     """设置或取消开机自启 (Windows 注册表)"""
-    if sys.platform != "win32":
+    if winreg is None:
         return
         
     app_name = "Kazuha"
@@ -141,7 +128,7 @@ def _set_run_at_startup(enabled: bool):
 
 def _on_run_at_startup_changed(enabled):
     _set_run_at_startup(enabled)
-    _save_cfg()
+    _save_cfg(cfg.runAtStartup)
 
 
 def _apply_theme_and_color(theme_value):
@@ -162,62 +149,62 @@ def _apply_theme_and_color(theme_value):
 _apply_theme_and_color(cfg.themeMode.value)
 
 
-def _save_cfg():
-    old_data = _load_settings_json()
-
-    qconfig.save()
-
-    new_data = _load_settings_json()
-
-    merged = old_data if isinstance(old_data, dict) else {}
-    if isinstance(new_data, dict):
-        for cat, cat_val in new_data.items():
-            if not isinstance(cat_val, dict):
-                merged[cat] = cat_val
-                continue
-            if cat not in merged or not isinstance(merged[cat], dict):
-                merged[cat] = {}
-            for key, value in cat_val.items():
-                merged[cat][key] = value
-
-    try:
-        with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-            json.dump(merged, f, indent=4, ensure_ascii=False)
-    except Exception:
-        pass
+def _save_cfg(item=None):
+    """Queue item's value, or every cfg value, for the settings service."""
+    # Imported on first save so loading cfg does not pull in the IPC stack.
+    from ppt_assistant.core.settings_service import SettingsService
+    if item is not None:
+        # Only the item that changed, so a stale in-memory value cannot
+        # overwrite what another process saved in the meantime.
+        patch = {item.group: {item.name: item.serialize()}}
+    else:
+        patch = cfg.toDict()
+    SettingsService(SETTINGS_PATH).update(patch)
 
 
 def _on_theme_changed(theme):
     _apply_theme_and_color(theme)
-    _save_cfg()
+    _save_cfg(cfg.themeMode)
 
 
 def _bind_auto_save():
     cfg.themeMode.valueChanged.connect(_on_theme_changed)
-    cfg.themeId.valueChanged.connect(lambda *_: _save_cfg())
+    cfg.themeId.valueChanged.connect(lambda *_: _save_cfg(cfg.themeId))
     cfg.runAtStartup.valueChanged.connect(_on_run_at_startup_changed)
-    cfg.autoShowOverlay.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.showClear.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.showSpotlight.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.showTimer.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.showStatusBar.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.safeArea.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.scale.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.autoHandleInk.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.overlayScreen.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.splashMode.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.splashStartTime.valueChanged.connect(lambda *_: _save_cfg())
-    cfg.splashEndTime.valueChanged.connect(lambda *_: _save_cfg())
+    cfg.autoShowOverlay.valueChanged.connect(lambda *_: _save_cfg(cfg.autoShowOverlay))
+    cfg.showClear.valueChanged.connect(lambda *_: _save_cfg(cfg.showClear))
+    cfg.showSpotlight.valueChanged.connect(lambda *_: _save_cfg(cfg.showSpotlight))
+    cfg.showTimer.valueChanged.connect(lambda *_: _save_cfg(cfg.showTimer))
+    cfg.showStatusBar.valueChanged.connect(lambda *_: _save_cfg(cfg.showStatusBar))
+    cfg.safeArea.valueChanged.connect(lambda *_: _save_cfg(cfg.safeArea))
+    cfg.scale.valueChanged.connect(lambda *_: _save_cfg(cfg.scale))
+    cfg.autoHandleInk.valueChanged.connect(lambda *_: _save_cfg(cfg.autoHandleInk))
+    cfg.videoProgressMinDelta.valueChanged.connect(lambda *_: _save_cfg(cfg.videoProgressMinDelta))
+    cfg.videoProgressMaxRate.valueChanged.connect(lambda *_: _save_cfg(cfg.videoProgressMaxRate))
+    cfg.overlayScreen.valueChanged.connect(lambda *_: _save_cfg(cfg.overlayScreen))
+    cfg.splashMode.valueChanged.connect(lambda *_: _save_cfg(cfg.splashMode))
+    cfg.splashStartTime.valueChanged.connect(lambda *_: _save_cfg(cfg.splashStartTime))
+    cfg.splashEndTime.valueChanged.connect(lambda *_: _save_cfg(cfg.splashEndTime))
     # cfg.toolbarLayout.valueChanged.connect(lambda *_: _save_cfg())
 
 
 _bind_auto_save()
-try:
-    if cfg.runAtStartup.value:
-        _set_run_at_startup(True)
-except Exception:
-    pass
-_save_cfg()
+
+
+def init_settings():
+    """
+    Write defaults for keys missing from settings.json and refresh the
+    autostart entry. Called once by the main process during startup, not on
+    import, so helper processes that import this module never write.
+    """
+    from ppt_assistant.core.settings_service import SettingsService
+    try:
+        if cfg.runAtStartup.value:
+            _set_run_at_startup(True)
+    except Exception:
+        pass
+    _save_cfg()
+    SettingsService(SETTINGS_PATH).flush()
 
 
 def reload_cfg():
@@ -0,0 +1,120 @@
+import os
+
+from PySide6.QtCore import QObject, QTimer, Signal, QFileSystemWatcher
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class FileWatcher(QObject):
+    """
+    Reports file changes without polling. QFileSystemWatcher uses inotify,
+    ReadDirectoryChangesW or kqueue depending on the platform; if it cannot
+    watch a path, that path is polled instead. Bursts of writes within
+    debounce_ms are delivered as a single changed(path).
+    """
+    changed = Signal(str)
+
+    def __init__(self, debounce_ms=150, poll_interval_ms=1000, force_polling=False, parent=None):
+        super().__init__(parent)
+        self._stamps = {}
+        self._pending = set()
+        self._polled = set()
+        self.events = 0
+        self.deliveries = 0
+
+        self._watcher = None if force_polling else QFileSystemWatcher(self)
+        if self._watcher is not None:
+            self._watcher.fileChanged.connect(self._on_fs_event)
+            self._watcher.directoryChanged.connect(self._on_dir_event)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._flush)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self._poll)
+
+    @property
+    def mode(self):
+        if self._polled:
+            return "polling" if len(self._polled) == len(self._stamps) else "mixed"
+        return "native"
+
+    def add(self, path):
+        path = os.path.abspath(path)
+        self._stamps[path] = _stamp(path)
+        if not self._watch_native(path):
+            self._polled.add(path)
+            if not self._poll_timer.isActive():
+                self._poll_timer.start()
+
+    def remove(self, path):
+        path = os.path.abspath(path)
+        self._stamps.pop(path, None)
+        self._pending.discard(path)
+        self._polled.discard(path)
+        if self._watcher is not None and path in self._watcher.files():
+            self._watcher.removePath(path)
+        if not self._polled:
+            self._poll_timer.stop()
+
+    def _watch_native(self, path) -> bool:
+        if self._watcher is None:
+            return False
+        # The directory is watched too: editors and atomic writers replace
+        # the file, which drops the file watch.
+        directory = os.path.dirname(path)
+        if directory not in self._watcher.directories():
+            if not self._watcher.addPath(directory):
+                return False
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        return True
+
+    def _on_fs_event(self, path):
+        self.events += 1
+        path = os.path.abspath(path)
+        if path in self._stamps:
+            self._pending.add(path)
+            self._debounce.start()
+
+    def _on_dir_event(self, directory):
+        self.events += 1
+        directory = os.path.abspath(directory)
+        for path in self._stamps:
+            if os.path.dirname(path) == directory and path not in self._polled:
+                self._pending.add(path)
+        if self._pending:
+            self._debounce.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        for path in pending:
+            if path not in self._stamps:
+                continue
+            if path not in self._polled:
+                self._watch_native(path)
+            self._deliver_if_changed(path)
+
+    def _poll(self):
+        for path in self._polled:
+            if _stamp(path) != self._stamps.get(path):
+                self._pending.add(path)
+        if self._pending and not self._debounce.isActive():
+            self._debounce.start()
+
+    def _deliver_if_changed(self, path):
+        stamp = _stamp(path)
+        if stamp == self._stamps.get(path):
+            return
+        self._stamps[path] = stamp
+        self.deliveries += 1
+        self.changed.emit(path)
@@ -1,9 +1,3 @@
-import json
-import os
-
-from ppt_assistant.core.config import SETTINGS_PATH
-
-
 _TRANSLATIONS = {
     "zh-CN": {
         "tray.tooltip": "Kazuha 助手",
@@ -59,15 +53,10 @@ _TRANSLATIONS = {
 
 
 def get_language() -> str:
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            lang = (data.get("General") or {}).get("Language")
-            if isinstance(lang, str) and lang.strip():
-                return lang.strip()
-    except Exception:
-        pass
+    from ppt_assistant.core.settings_store import settings_store
+    lang = settings_store().get("General", "Language")
+    if isinstance(lang, str) and lang.strip():
+        return lang.strip()
     return "zh-CN"
 
 
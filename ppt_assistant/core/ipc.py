@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import struct
+import time
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+# Every frame is a 4-byte big-endian length followed by that many bytes of
+# UTF-8 JSON. Three kinds of message:
+#   {"t": "req", "id": n, "op": str, "params": any}
+#   {"t": "res", "id": n, "result": any} or {"t": "res", "id": n, "error": str}
+#   {"t": "evt", "name": str, "data": any}
+HEADER = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+
+# Environment variable through which child processes learn the hub's name.
+ENV_NAME = "KAZUHA_IPC"
+
+# How long listen() waits for the owner of a name that is in use to answer
+# before treating it as left behind by a crash.
+LIVENESS_TIMEOUT_MS = 200
+
+
+class IpcError(Exception):
+    pass
+
+
+def channel_name(kind, path):
+    digest = hashlib.sha1(os.path.abspath(path).lower().encode("utf-8")).hexdigest()[:12]
+    return f"kazuha-{kind}-{digest}"
+
+
+def encode(message):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+class Channel(QObject):
+    """
+    One end of a framed message connection. Either side can send requests
+    (answered by handlers registered with handle()), replies and events.
+
+    Events pushed with coalesce=True are state snapshots: while the peer
+    is not keeping up (more than high_water bytes unsent) only the latest
+    one per name is kept, and sent once the backlog halves. Requests,
+    replies and other events are never dropped; a peer that lets
+    max_backlog bytes pile up is disconnected.
+    """
+    event_received = Signal(str, object)  # name, data
+    closed = Signal()
+
+    high_water = 256 * 1024
+    max_backlog = 16 * 1024 * 1024
+
+    def __init__(self, socket, handlers=None, parent=None):
+        super().__init__(parent)
+        self._socket = socket
+        socket.setParent(self)
+        self._handlers = handlers if handlers is not None else {}
+        self._buffer = b""
+        self._next_id = 1
+        self._pending = {}
+        self._parked = {}
+        self._closed = False
+        self.sent = 0
+        self.received = 0
+        self.coalesced = 0
+        self.peak_backlog = 0
+        socket.readyRead.connect(self._on_ready_read)
+        socket.bytesWritten.connect(self._on_bytes_written)
+        socket.disconnected.connect(self._on_disconnected)
+
+    @property
+    def connected(self):
+        return not self._closed and self._socket.state() == QLocalSocket.ConnectedState
+
+    def handle(self, op, handler):
+        """handler(params, channel) returns the result or raises."""
+        self._handlers[op] = handler
+
+    def request(self, op, params=None, callback=None):
+        """Send a request; callback(result, error) runs when the reply
+        arrives, or with an error if the channel closes first."""
+        request_id = self._next_id
+        self._next_id += 1
+        if callback is not None:
+            self._pending[request_id] = callback
+        if not self._write({"t": "req", "id": request_id, "op": op, "params": params}):
+            self._pending.pop(request_id, None)
+            if callback is not None:
+                callback(None, "not connected")
+        return request_id
+
+    def call(self, op, params=None, timeout_ms=1000):
+        """Blocking request, for processes that have no reason to return
+        to the event loop while they wait."""
+        box = {}
+        request_id = self.request(op, params, lambda result, error: box.update(result=result, error=error))
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while not box:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0 or not self.connected:
+                self._pending.pop(request_id, None)
+                raise IpcError(f"{op}: no reply")
+            if self._socket.bytesToWrite():
+                self._socket.waitForBytesWritten(remaining)
+            else:
+                # readyRead is emitted from inside, which handles the reply.
+                self._socket.waitForReadyRead(remaining)
+        if box["error"]:
+            raise IpcError(box["error"])
+        return box["result"]
+
+    def push(self, name, data=None, coalesce=False):
+        if coalesce and (self._parked or self._socket.bytesToWrite() > self.high_water):
+            if name in self._parked:
+                self.coalesced += 1
+            self._parked[name] = data
+            return
+        self._write({"t": "evt", "name": name, "data": data})
+
+    def close(self):
+        if self._closed:
+            return
+        self._socket.disconnectFromServer()
+        self._on_disconnected()
+
+    def wait_for_bytes_written(self, timeout_ms=500):
+        if self._socket.bytesToWrite():
+            self._socket.waitForBytesWritten(timeout_ms)
+
+    def _write(self, message):
+        if not self.connected:
+            return False
+        self._socket.write(encode(message))
+        self._socket.flush()
+        self.sent += 1
+        backlog = self._socket.bytesToWrite()
+        if backlog > self.peak_backlog:
+            self.peak_backlog = backlog
+        if backlog > self.max_backlog:
+            print(f"IPC peer is not reading ({backlog} bytes queued); disconnecting.")
+            self._socket.abort()
+            self._on_disconnected()
+            return False
+        return True
+
+    def _on_bytes_written(self, _count):
+        if self._parked and self._socket.bytesToWrite() <= self.high_water // 2:
+            parked, self._parked = self._parked, {}
+            for name, data in parked.items():
+                self._write({"t": "evt", "name": name, "data": data})
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self._socket.readAll())
+        while len(self._buffer) >= HEADER.size:
+            (size,) = HEADER.unpack_from(self._buffer)
+            if size > MAX_FRAME:
+                print(f"IPC frame of {size} bytes rejected; disconnecting.")
+                self._socket.abort()
+                self._on_disconnected()
+                return
+            if len(self._buffer) < HEADER.size + size:
+                break
+            body = self._buffer[HEADER.size:HEADER.size + size]
+            self._buffer = self._buffer[HEADER.size + size:]
+            try:
+                message = json.loads(body.decode("utf-8"))
+            except Exception:
+                continue
+            self.received += 1
+            self._dispatch(message)
+
+    def _dispatch(self, message):
+        kind = message.get("t")
+        if kind == "evt":
+            self.event_received.emit(message.get("name", ""), message.get("data"))
+        elif kind == "res":
+            callback = self._pending.pop(message.get("id"), None)
+            if callback is not None:
+                callback(message.get("result"), message.get("error"))
+        elif kind == "req":
+            op = message.get("op")
+            handler = self._handlers.get(op)
+            if handler is None:
+                reply = {"t": "res", "id": message.get("id"), "error": f"unknown op: {op}"}
+            else:
+                try:
+                    reply = {"t": "res", "id": message.get("id"), "result": handler(message.get("params"), self)}
+                except Exception as e:
+                    reply = {"t": "res", "id": message.get("id"), "error": str(e) or type(e).__name__}
+            self._write(reply)
+
+    def _on_disconnected(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._parked.clear()
+        pending, self._pending = self._pending, {}
+        for callback in pending.values():
+            try:
+                callback(None, "channel closed")
+            except Exception as e:
+                print(f"IPC reply handler failed: {e}")
+        self.closed.emit()
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+            "backlog": self._socket.bytesToWrite() if self.connected else 0,
+            "peak_backlog": self.peak_backlog,
+        }
+
+
+def connect(name, timeout_ms=100, parent=None):
+    """Channel to the server called name, or None if it is not running."""
+    if not name:
+        return None
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    if not sock.waitForConnected(timeout_ms):
+        sock.deleteLater()
+        return None
+    return Channel(sock, parent=parent)
+
+
+def _is_served(name, timeout_ms):
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    served = sock.waitForConnected(timeout_ms)
+    sock.abort()
+    sock.deleteLater()
+    return served
+
+
+class MessageHub(QObject):
+    """
+    The main process's end of every child connection. Children find it
+    through ENV_NAME in their environment; request handlers registered
+    here serve all of them, and push() sends an event to each.
+    """
+    channel_opened = Signal(object)
+    channel_closed = Signal(object)
+    event_received = Signal(object, str, object)  # channel, name, data
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MessageHub, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        super().__init__()
+        self._initialized = True
+        self._server = None
+        self._handlers = {}
+        self.name = None
+        self.channels = []
+
+    @property
+    def listening(self):
+        return self._server is not None
+
+    def listen(self, name):
+        if self._server is not None:
+            return True
+        server = QLocalServer(self)
+        if not server.listen(name):
+            if server.serverError() != QAbstractSocket.SocketError.AddressInUseError:
+                print(f"IPC hub unavailable: {server.errorString()}")
+                return False
+            if _is_served(name, LIVENESS_TIMEOUT_MS):
+                print(f"IPC hub unavailable: {name} is served by another process")
+                return False
+            # A crashed instance can leave the socket file behind.
+            QLocalServer.removeServer(name)
+            if not server.listen(name):
+                print(f"IPC hub unavailable: {server.errorString()}")
+                return False
+        server.newConnection.connect(self._on_new_connection)
+        self._server = server
+        self.name = name
+        return True
+
+    def handle(self, op, handler):
+        self._handlers[op] = handler
+
+    def push(self, name, data=None, coalesce=False):
+        for channel in list(self.channels):
+            channel.push(name, data, coalesce)
+
+    def child_env(self, env=None):
+        """env (default os.environ) plus what a child needs to connect."""
+        env = dict(os.environ if env is None else env)
+        if self.name:
+            env[ENV_NAME] = self.name
+        return env
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            channel = Channel(self._server.nextPendingConnection(), self._handlers, self)
+            channel.event_received.connect(lambda name, data, c=channel: self.event_received.emit(c, name, data))
+            channel.closed.connect(lambda c=channel: self._on_channel_closed(c))
+            self.channels.append(channel)
+            self.channel_opened.emit(channel)
+
+    def _on_channel_closed(self, channel):
+        if channel in self.channels:
+            self.channels.remove(channel)
+        self.channel_closed.emit(channel)
+        channel.deleteLater()
+
+
+def message_hub():
+    return MessageHub()
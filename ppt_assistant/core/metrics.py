@@ -0,0 +1,250 @@
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class Counter:
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    def __init__(self, name):
+        self.name = name
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """
+    Latencies in HDR-histogram style buckets: each power of two (of
+    microseconds) is split into 2**SUB_BITS equal buckets, so a recorded
+    value is known to within about 3% at any magnitude, in constant memory
+    and without keeping the samples.
+    """
+    SUB_BITS = 5
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, us):
+        shift = us.bit_length() - cls.SUB_BITS - 1
+        if shift <= 0:
+            return us
+        return ((shift + 1) << cls.SUB_BITS) + (us >> shift) - (1 << cls.SUB_BITS)
+
+    @classmethod
+    def _upper(cls, index):
+        """Highest microsecond value that falls into bucket index."""
+        if index < (2 << cls.SUB_BITS):
+            return index
+        shift = (index >> cls.SUB_BITS) - 1
+        mantissa = (index & ((1 << cls.SUB_BITS) - 1)) + (1 << cls.SUB_BITS)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, ms):
+        us = max(0, int(ms * 1000.0))
+        index = self._index(us)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += ms
+            if self.min is None or ms < self.min:
+                self.min = ms
+            if self.max is None or ms > self.max:
+                self.max = ms
+
+    def percentile(self, q):
+        """Value in ms at or below which q percent of the samples lie."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, int(round(self.count * q / 100.0)))
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen >= target:
+                    return max(self.min, min(self._upper(index) / 1000.0, self.max))
+            return self.max
+
+    def snapshot(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": round(self.min, 3),
+            "mean_ms": round(self.total / self.count, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "p999_ms": round(self.percentile(99.9), 3),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class _Timing:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.record((time.perf_counter() - self._start) * 1000.0)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and latency histograms for the hot paths, by name
+    ("monitor.tick_ms", "overlay.update_layout_ms", ...). Recording takes
+    a lock and a dict update, cheap enough for every poll tick and paint.
+    snapshot()/export() also include the stats dicts of registered
+    collectors, so one file carries everything.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsRegistry, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._marks = {}
+        self._collectors = {}
+        self.started_at = time.time()
+        self.export_path = os.path.join(tempfile.gettempdir(), "kazuha_metrics.json")
+
+    def _get(self, cls, name):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name)
+        if not isinstance(metric, cls):
+            raise TypeError(f"metric {name} is a {type(metric).__name__}")
+        return metric
+
+    def counter(self, name):
+        return self._get(Counter, name)
+
+    def gauge(self, name):
+        return self._get(Gauge, name)
+
+    def histogram(self, name):
+        return self._get(Histogram, name)
+
+    def timer(self, name):
+        """with metrics().timer("x_ms"): ... records the block's duration."""
+        return _Timing(self.histogram(name))
+
+    def mark(self, name):
+        """Note when something happened, for a later elapsed_since()."""
+        self._marks[name] = time.perf_counter()
+
+    def elapsed_since(self, mark, histogram):
+        """Record the time since mark(mark) into histogram, once per mark."""
+        started = self._marks.pop(mark, None)
+        if started is not None:
+            self.histogram(histogram).record((time.perf_counter() - started) * 1000.0)
+
+    def register_collector(self, name, func):
+        """func() returns a JSON-serialisable dict included in snapshots."""
+        self._collectors[name] = func
+
+    def unregister_collector(self, name):
+        self._collectors.pop(name, None)
+
+    def snapshot(self):
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        data = {
+            "started_at": self.started_at,
+            "taken_at": time.time(),
+            "counters": {},
+            "gauges": {},
+            "histograms": {},
+        }
+        sections = {Counter: "counters", Gauge: "gauges", Histogram: "histograms"}
+        for name, metric in metrics:
+            data[sections[type(metric)]][name] = metric.snapshot()
+        for name, func in list(self._collectors.items()):
+            try:
+                data[name] = func()
+            except Exception as e:
+                data[name] = {"error": str(e)}
+        return data
+
+    def export(self, path=None):
+        """Write a snapshot as JSON; returns the path, or None on failure."""
+        path = path or self.export_path
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not export metrics: {e}")
+            return None
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self._marks.clear()
+        self.started_at = time.time()
+
+
+def metrics():
+    return MetricsRegistry()
+
+
+def timed(name):
+    """Decorator recording every call's duration into histogram name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics().histogram(name).record((time.perf_counter() - start) * 1000.0)
+        return wrapper
+    return decorator
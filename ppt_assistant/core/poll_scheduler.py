@@ -0,0 +1,90 @@
+import threading
+import time
+
+
+class AdaptivePollScheduler:
+    """
+    Chooses PPTWorker's next tick interval (ms) from what the last tick saw.
+
+    - no presentation application: back off from absent_min_ms up to
+      absent_max_ms
+    - right after a navigation command: poll at burst_ms for burst_s
+    - during a show: base interval, relaxed once the slide has been stable
+      for stable_s
+    - application open without a show: idle interval
+
+    When application events are subscribed, polling is only a fallback for
+    geometry, visibility and video progress, so the event intervals apply.
+    """
+    burst_ms = 50
+    show_ms = 200
+    show_relaxed_ms = 1000
+    idle_ms = 500
+    absent_min_ms = 1000
+    absent_max_ms = 5000
+    event_show_ms = 500
+    event_show_relaxed_ms = 1500
+    event_idle_ms = 2000
+    burst_s = 1.5
+    stable_s = 3.0
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._burst_until = 0.0
+        self._last_change = clock()
+        self._absent_ms = self.absent_min_ms
+        self.interval = self.show_ms
+        self.mode = "start"
+        self.ticks = 0
+        self.mode_ticks = {}
+        self.bursts = 0
+
+    def note_navigation(self):
+        """A navigation command was sent; watch closely for the result."""
+        now = self._clock()
+        self._burst_until = now + self.burst_s
+        self._last_change = now
+        self.bursts += 1
+
+    def note_slide_change(self):
+        self._last_change = self._clock()
+
+    def next_interval(self, app_present, running, events_attached=False):
+        now = self._clock()
+        if not app_present:
+            mode = "absent"
+            interval = self._absent_ms
+            self._absent_ms = min(self.absent_max_ms, self._absent_ms * 2)
+        else:
+            self._absent_ms = self.absent_min_ms
+            if running and now < self._burst_until:
+                mode = "burst"
+                interval = self.burst_ms
+            elif running:
+                stable = now - self._last_change >= self.stable_s
+                mode = "stable" if stable else "show"
+                if events_attached:
+                    interval = self.event_show_relaxed_ms if stable else self.event_show_ms
+                else:
+                    interval = self.show_relaxed_ms if stable else self.show_ms
+            else:
+                mode = "idle"
+                interval = self.event_idle_ms if events_attached else self.idle_ms
+
+        with self._lock:
+            self.ticks += 1
+            self.mode_ticks[mode] = self.mode_ticks.get(mode, 0) + 1
+            self.mode = mode
+            self.interval = interval
+        return interval
+
+    def stats(self):
+        with self._lock:
+            return {
+                "interval_ms": self.interval,
+                "mode": self.mode,
+                "ticks": self.ticks,
+                "mode_ticks": dict(self.mode_ticks),
+                "bursts": self.bursts,
+            }
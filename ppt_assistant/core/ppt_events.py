@@ -0,0 +1,290 @@
+from PySide6.QtCore import QObject, Signal
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+
+_win32com_client = None
+
+
+def win32com_client():
+    """
+    win32com.client, or None without pywin32. Imported on first use, since
+    loading it (and its gencache) is a noticeable share of startup.
+    """
+    global _win32com_client
+    if _win32com_client is None:
+        try:
+            import win32com.client as client
+        except ImportError:
+            client = False
+        _win32com_client = client
+    return _win32com_client or None
+
+
+class SlideShowEventSource(QObject):
+    """
+    Source of slideshow lifecycle events for a presentation application.
+    Subclasses subscribe to the application object passed to attach().
+    """
+    slideshow_begin = Signal()
+    slideshow_next_slide = Signal()
+    slideshow_end = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._app = None
+        self._sink = None
+
+    def attach(self, app) -> bool:
+        raise NotImplementedError
+
+    def detach(self):
+        self._sink = None
+        self._app = None
+
+    def is_attached(self) -> bool:
+        return self._sink is not None
+
+    def is_attached_to(self, app) -> bool:
+        return self._sink is not None and self._app is app
+
+    def pump(self):
+        pass
+
+    def _dispatch(self, name):
+        if name == "begin":
+            self.slideshow_begin.emit()
+        elif name == "next":
+            self.slideshow_next_slide.emit()
+        elif name == "end":
+            self.slideshow_end.emit()
+
+
+class _ApplicationEventSink:
+    # Method names follow the EApplication dispinterface (PowerPoint / WPS).
+    def __init__(self):
+        self._source = None
+
+    def OnSlideShowBegin(self, Wn=None):
+        self._forward("begin")
+
+    def OnSlideShowNextSlide(self, Wn=None):
+        self._forward("next")
+
+    def OnSlideShowEnd(self, Pres=None):
+        self._forward("end")
+
+    def _forward(self, name):
+        source = self._source
+        if source is not None:
+            source._dispatch(name)
+
+
+class ComEventSource(SlideShowEventSource):
+    """
+    Subscribes to application events through a win32com event sink.
+    """
+
+    def attach(self, app) -> bool:
+        if self.is_attached_to(app):
+            return True
+        self.detach()
+        client = win32com_client()
+        if client is None or app is None:
+            return False
+        try:
+            try:
+                app = client.gencache.EnsureDispatch(app)
+            except Exception:
+                pass
+            sink = client.WithEvents(app, _ApplicationEventSink)
+        except Exception:
+            return False
+        sink._source = self
+        self._sink = sink
+        self._app = app
+        return True
+
+    def detach(self):
+        sink = self._sink
+        if sink is not None:
+            sink._source = None
+            try:
+                sink.close()
+            except Exception:
+                pass
+        super().detach()
+
+    def pump(self):
+        if pythoncom is not None and self._sink is not None:
+            try:
+                pythoncom.PumpWaitingMessages()
+            except Exception:
+                pass
+
+
+class ScriptedEventSource(SlideShowEventSource):
+    """
+    Event source for ScriptedApplication, used to exercise the event-driven
+    tracking path without COM.
+    """
+
+    def attach(self, app) -> bool:
+        if self.is_attached_to(app):
+            return True
+        self.detach()
+        if app is None or not hasattr(app, "advise"):
+            return False
+        sink = _ApplicationEventSink()
+        sink._source = self
+        app.advise(sink)
+        self._sink = sink
+        self._app = app
+        return True
+
+    def detach(self):
+        sink = self._sink
+        if sink is not None:
+            sink._source = None
+            if self._app is not None and hasattr(self._app, "unadvise"):
+                self._app.unadvise(sink)
+        super().detach()
+
+
+class _ScriptedCollection:
+    def __init__(self, items):
+        self._items = items
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def __call__(self, index):
+        return self._items[index - 1]
+
+    def Item(self, index):
+        return self._items[index - 1]
+
+
+class _ScriptedSlide:
+    def __init__(self, index):
+        self.SlideIndex = index
+        self.SlideID = 256 + index
+        self.Shapes = _ScriptedCollection([])
+
+
+class _ScriptedPresentation:
+    def __init__(self, slide_count, full_name="scripted.pptx"):
+        self.FullName = full_name
+        self.Slides = _ScriptedCollection([_ScriptedSlide(i) for i in range(1, slide_count + 1)])
+
+
+class _ScriptedView:
+    def __init__(self, app):
+        self._app = app
+        self.State = 1
+        self.PointerType = 1
+        self.current = 1
+
+    @property
+    def Slide(self):
+        return self._app.presentation.Slides(self.current)
+
+    def Next(self):
+        self._app.goto(self.current + 1)
+
+    def Previous(self):
+        self._app.goto(self.current - 1)
+
+    def GotoSlide(self, index):
+        self._app.goto(index)
+
+    def Exit(self):
+        self._app.end_show()
+
+
+class _ScriptedSlideShowWindow:
+    def __init__(self, app):
+        self.HWND = 0
+        self.Left = 0
+        self.Top = 0
+        self.Width = 1920
+        self.Height = 1080
+        self.View = _ScriptedView(app)
+        self.Presentation = app.presentation
+
+
+class ScriptedApplication:
+    """
+    Stand-in for the PowerPoint.Application COM object. Exposes the subset of
+    the object model PPTWorker reads and fires the same application events a
+    real COM sink would receive.
+    """
+
+    def __init__(self, slide_count=10):
+        self.presentation = _ScriptedPresentation(slide_count)
+        self.DisplayAlerts = -1
+        self._windows = []
+        self._sinks = []
+
+    @property
+    def SlideShowWindows(self):
+        return _ScriptedCollection(self._windows)
+
+    def advise(self, sink):
+        if sink not in self._sinks:
+            self._sinks.append(sink)
+
+    def unadvise(self, sink):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def begin_show(self, index=1):
+        win = _ScriptedSlideShowWindow(self)
+        win.View.current = index
+        self._windows = [win]
+        for sink in list(self._sinks):
+            sink.OnSlideShowBegin(win)
+            sink.OnSlideShowNextSlide(win)
+
+    def goto(self, index):
+        if not self._windows:
+            return
+        total = self.presentation.Slides.Count
+        win = self._windows[0]
+        if index > total:
+            self.end_show()
+            return
+        index = max(1, index)
+        if index == win.View.current:
+            return
+        win.View.current = index
+        for sink in list(self._sinks):
+            sink.OnSlideShowNextSlide(win)
+
+    def end_show(self):
+        if not self._windows:
+            return
+        self._windows = []
+        for sink in list(self._sinks):
+            sink.OnSlideShowEnd(self.presentation)
+
+    def run_script(self, steps):
+        """
+        Apply a list of ("begin", index) / ("goto", index) / ("next",) /
+        ("prev",) / ("end",) steps in order.
+        """
+        for step in steps:
+            action = step[0]
+            if action == "begin":
+                self.begin_show(step[1] if len(step) > 1 else 1)
+            elif action == "goto":
+                self.goto(step[1])
+            elif action == "next" and self._windows:
+                self.goto(self._windows[0].View.current + 1)
+            elif action == "prev" and self._windows:
+                self.goto(self._windows[0].View.current - 1)
+            elif action == "end":
+                self.end_show()
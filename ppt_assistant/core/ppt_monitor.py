@@ -1,28 +1,127 @@
-import win32com.client
-import pythoncom
 from PySide6.QtCore import QObject, Signal, QThread, QTimer, QPoint, QRect, Slot
 from PySide6.QtGui import QGuiApplication
+import collections
 import time
 from ppt_assistant.core.config import cfg
+from ppt_assistant.core.presentation_backend import create_default_backends
+from ppt_assistant.core.poll_scheduler import AdaptivePollScheduler
+from ppt_assistant.core.thumbnail_cache import ThumbnailCache, ThumbnailQueue
+from ppt_assistant.core.metrics import metrics, timed
+from ppt_assistant.core.com_guard import CircuitBreaker, ComGuard, ComGuardError, ComTimeout
 
 try:
-    import win32gui
+    import pythoncom
+except ImportError:
+    pythoncom = None
+try:
     import win32api
     import win32con
-    import win32process
 except ImportError:
-    win32gui = None
     win32api = None
     win32con = None
-    win32process = None
-try:
-    import pywintypes
-except ImportError:
-    pywintypes = None
+
+POLL_INTERVAL_MS = 200
+
+# A control command that takes longer than this from the click to the
+# application having been told is counted as late.
+COMMAND_BUDGET_MS = 50
+
+_NAVIGATION = ("go_next", "go_previous", "go_to_slide")
+
+# Navigation within NAV_BURST_MS of the previous one is held for up to
+# NAV_COALESCE_MS so the rest of the burst can join it.
+NAV_BURST_MS = 300
+NAV_COALESCE_MS = 60
+# Navigation is held on purpose, so it is measured against its own budget
+# (monitor.nav_*) instead of COMMAND_BUDGET_MS.
+NAV_BUDGET_MS = NAV_COALESCE_MS + COMMAND_BUDGET_MS
+
+# Workers left stuck inside a COM call before no more replacements are
+# started until one of them comes back.
+MAX_STUCK_WORKERS = 3
+# How long stop_monitoring() waits for a worker thread before killing it.
+STOP_WAIT_MS = 3000
+
+_WORKER_SIGNALS = (
+    "slideshow_started", "slideshow_ended", "slide_changed",
+    "window_geometry_changed", "overlay_visibility_changed",
+    "video_state_changed", "thumbnail_generated", "navigation_applied",
+    "com_hung",
+)
+
+
+class CommandLane:
+    """
+    Control commands waiting for the worker, each with the time it was
+    queued. Filled from the main thread and emptied by the worker ahead of
+    any polling or thumbnail work; deque appends and pops are atomic, so
+    no lock is needed.
+    """
+
+    def __init__(self):
+        self._items = collections.deque()
+
+    def put(self, action, *args):
+        self._items.append((time.perf_counter(), action, args))
+
+    def take(self):
+        try:
+            return self._items.popleft()
+        except IndexError:
+            return None
+
+    def __len__(self):
+        return len(self._items)
+
+
+class VideoStateFilter:
+    """
+    Decides which video progress updates are worth a cross-thread signal.
+    Repeats are dropped. Progress is delivered once it moves by at least
+    min_delta seconds, at most max_rate times per second. A position that has
+    stopped moving (paused) is always delivered, and so is a change of media.
+    """
+
+    def __init__(self, min_delta=0.5, max_rate=4, clock=time.monotonic):
+        self.min_delta = min_delta
+        self.max_rate = max_rate
+        self._clock = clock
+        self._last = None
+        self._seen = None
+        self._last_emit = 0.0
+        self.delivered = 0
+        self.suppressed = 0
+
+    def reset(self):
+        self._last = None
+        self._seen = None
+
+    def accept(self, ratio, pos, length) -> bool:
+        state = (ratio, pos, length)
+        previous, self._seen = self._seen, state
+        last = self._last
+        deliver = False
+        if last is None or length != last[2]:
+            deliver = True
+        elif state != last:
+            now = self._clock()
+            if previous == state:
+                deliver = True
+            elif abs(pos - last[1]) >= self.min_delta:
+                deliver = now - self._last_emit >= 1.0 / max(1, self.max_rate)
+        if deliver:
+            self._last = state
+            self._last_emit = self._clock()
+            self.delivered += 1
+        else:
+            self.suppressed += 1
+        return deliver
+
 
 class PPTWorker(QObject):
     """
-    Worker thread for PPT COM operations to prevent blocking the main UI.
+    Worker thread for presentation COM operations to prevent blocking the
+    main UI. All application access goes through PresentationBackend objects.
     """
     # Signals to Main Thread
     slideshow_started = Signal()
@@ -32,439 +131,420 @@ class PPTWorker(QObject):
     overlay_visibility_changed = Signal(bool)
     video_state_changed = Signal(float, float, float) # ratio, pos, length
     thumbnail_generated = Signal(int, str) # index, path
+    navigation_applied = Signal(int) # navigation commands carried out
+    com_hung = Signal(str) # backend call that overran its timeout
 
-    def __init__(self):
+    def __init__(self, backends=None, breaker=None, restartable=True):
         super().__init__()
-        self.ppt_app = None
-        self.wps_app = None
+        # The backends belong to this worker alone; a replacement worker
+        # gets instances of its own.
+        self._backends = list(backends) if backends is not None else None
+        # Without a replacement to hand over to, a hung call is waited out.
+        self.guard = ComGuard(breaker, on_hang=self.com_hung.emit if restartable else None)
+        self._retiring = False
+        self._backend = None
         self._running = False
         self._current_slide = 0
         self._total_slides = 0
         self._last_win_rect = (0, 0, 0, 0)
         self._active_kind = None
-        self._last_screen = None
         self._overlay_visible = None
         self._timer = None
         self._com_initialized = False
+        self._app_present = False
+        self.scheduler = AdaptivePollScheduler()
+        self.video_filter = VideoStateFilter()
+        self.thumbnails = ThumbnailCache()
+        self._thumb_queue = ThumbnailQueue()
+        self._thumb_timer = None
+        self.commands = CommandLane()
+        self._draining = False
+        self._nav_batch = []
+        self._nav_last = 0.0
+        self._nav_timer = None
+        for backend in self._backends or []:
+            if backend.events is not None:
+                # Parent it so moveToThread() carries it to the worker thread.
+                backend.events.setParent(self)
 
     @Slot()
     def start(self):
-        if not self._com_initialized:
+        if not self._com_initialized and pythoncom is not None:
             pythoncom.CoInitialize()
             self._com_initialized = True
-            
+
+        if self._backends is None:
+            self._backends = create_default_backends()
+        for backend in self._backends:
+            backend.checkpoint = self._checkpoint
+            if backend.events is None:
+                backend.events = backend.create_event_source(self)
+            if backend.events is not None:
+                kind = backend.kind
+                backend.events.slideshow_begin.connect(self._on_slideshow_event)
+                backend.events.slideshow_next_slide.connect(self._on_slideshow_event)
+                backend.events.slideshow_end.connect(lambda k=kind: self._on_slideshow_end_event(k))
+
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._check_ppt_state)
-        self._timer.start(200)
+        self._timer.start(POLL_INTERVAL_MS)
+
+        # Thumbnails are exported one per event-loop turn so navigation
+        # requests are never stuck behind a whole deck.
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.timeout.connect(self._process_thumbnail)
+        self.thumbnails.evict()
+
+        self._nav_timer = QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.timeout.connect(self._flush_navigation)
 
     @Slot()
     def stop(self):
         if self._timer:
             self._timer.stop()
+        if self._thumb_timer:
+            self._thumb_timer.stop()
+        if self._nav_timer:
+            self._nav_timer.stop()
+        self._nav_batch = []
+        self._thumb_queue.clear()
+        for backend in self._backends or []:
+            try:
+                self.guard.call("release", backend.release, force=True)
+            except ComGuardError:
+                pass
+        self.guard.close()
+        # Drop the guard's reference back to this worker.
+        self.guard.on_hang = None
         if self._com_initialized:
             pythoncom.CoUninitialize()
             self._com_initialized = False
 
-    def _get_active_app(self):
-        # Helper to get the currently tracked app
-        if self._active_kind == "ppt" and self.ppt_app: return self.ppt_app
-        if self._active_kind == "wps" and self.wps_app: return self.wps_app
-        # Fallback
-        if self.ppt_app: return self.ppt_app
-        if self.wps_app: return self.wps_app
-        return None
+    def _retire(self):
+        """
+        Back from a call the monitor gave up on; a replacement worker has
+        taken over, so tear down this thread's apartment and end it.
+        """
+        self.stop()
+        self.thread().quit()
 
-    def _check_ppt_state(self):
+    def _call(self, backend, name, *args):
         try:
-            # 1. Try PowerPoint
-            try:
-                self.ppt_app = win32com.client.GetActiveObject("PowerPoint.Application")
-            except Exception:
-                self.ppt_app = None
-                self._handle_stop("ppt")
-                return
-
-            if self.ppt_app.SlideShowWindows.Count > 0:
-                try:
-                    # Find the best slide show window (avoiding Presenter View if possible)
-                    ss_win = None
-                    count = self.ppt_app.SlideShowWindows.Count
-                    
-                    if count == 1:
-                        ss_win = self.ppt_app.SlideShowWindows(1)
-                    else:
-                        # Try to find the one with class name "screenClass"
-                        for i in range(1, count + 1):
-                            try:
-                                tmp_win = self.ppt_app.SlideShowWindows(i)
-                                hwnd = getattr(tmp_win, "HWND", 0)
-                                if hwnd:
-                                    class_name = win32gui.GetClassName(int(hwnd))
-                                    if class_name == "screenClass":
-                                        ss_win = tmp_win
-                                        break
-                            except:
-                                continue
-                        
-                        # Fallback to the first one if not found
-                        if ss_win is None:
-                            ss_win = self.ppt_app.SlideShowWindows(1)
-
-                    view = ss_win.View
-                    state = view.State
-                    
-                    if state in [1, 2]: # Running or Paused
-                        if not self._running:
-                            self._running = True
-                            self._active_kind = "ppt"
-                            self.slideshow_started.emit()
-                        
-                        try:
-                            current = view.Slide.SlideIndex
-                            presentation = ss_win.Presentation
-                            total = presentation.Slides.Count
-                            
-                            if current != self._current_slide or total != self._total_slides:
-                                self._current_slide = current
-                                self._total_slides = total
-                                self.slide_changed.emit(current, total)
-                            
-                            self._update_window_rect(ss_win)
-                            self._update_video_state(ss_win)
-                        except Exception:
-                            pass
-                    else:
-                        self._handle_stop("ppt")
-                except Exception:
-                    pass
-            else:
-                self._handle_stop("ppt")
+            return self.guard.call(name, getattr(backend, name), *args)
+        except ComTimeout:
+            # Still marked hung once back only if a replacement took over.
+            if self.guard.hung and not self._retiring:
+                # Unwind whatever slot this is first.
+                self._retiring = True
+                QTimer.singleShot(0, self._retire)
+            raise
+
+    @property
+    def tracking_mode(self):
+        if any(b.events_attached() for b in self._backends or []):
+            return "events"
+        return "polling"
+
+    def _schedule_next_tick(self):
+        if not self._timer:
+            return
+        backends = self._backends or []
+        interval = self.scheduler.next_interval(
+            self._app_present,
+            self._running,
+            any(b.events_attached() for b in backends),
+        )
+        if self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+
+    def _navigated(self):
+        self.scheduler.note_navigation()
+        if self._timer:
+            self._timer.start(self.scheduler.burst_ms)
 
+    @Slot()
+    def _on_slideshow_event(self):
+        # Leave the COM callback before touching the object model again.
+        QTimer.singleShot(0, self._check_ppt_state)
+
+    def _on_slideshow_end_event(self, kind):
+        # SlideShowWindows may still report the closing window while the end
+        # event is delivered, so confirm with a slightly delayed check.
+        self._handle_stop(kind)
+        QTimer.singleShot(250, self._check_ppt_state)
+
+    def _find_slideshow(self):
+        # Prefer the backend that is already running a show.
+        ordered = sorted(self._backends or [], key=lambda b: b is not self._backend)
+        self._app_present = False
+        registry = metrics()
+        for backend in ordered:
+            with registry.timer("monitor.backend.acquire_ms"):
+                acquired = self._call(backend, "acquire")
+            if not acquired:
+                continue
+            self._checkpoint()
+            self._app_present = True
+            self._call(backend, "pump_events")
+            with registry.timer("monitor.backend.find_window_ms"):
+                ss_win = self._call(backend, "find_slideshow_window")
+            if ss_win is not None:
+                return backend, ss_win
+        return None, None
+
+    @timed("monitor.tick_ms")
+    def _check_ppt_state(self):
+        if not self.guard.breaker.allow():
+            # The application is not responding; leave it alone for now.
+            metrics().counter("monitor.ticks_skipped").inc()
+            return
+        metrics().counter("monitor.ticks").inc()
+        try:
+            self._poll_state()
         except Exception:
-            pass
-            
-        # If not running PPT, check WPS
-        if not self._running:
+            metrics().counter("monitor.tick_errors").inc()
+        finally:
+            self._schedule_next_tick()
+
+    def _poll_state(self):
+        backend, ss_win = self._find_slideshow()
+        if backend is None:
+            self._handle_stop(self._active_kind)
             return
 
-    def _check_wps_state(self):
+        if self._running and self._active_kind != backend.kind:
+            self._handle_stop(self._active_kind)
+        self._backend = backend
+        if not self._running:
+            self._running = True
+            self._active_kind = backend.kind
+            self.video_filter.reset()
+            self.slideshow_started.emit()
+
+        registry = metrics()
         try:
-            self.wps_app = win32com.client.GetActiveObject("KWPP.Application")
-        except BaseException:
-            self.wps_app = None
-            self._handle_stop("wps")
-            return
+            with registry.timer("monitor.backend.slide_info_ms"):
+                current, total = self._call(backend, "get_slide_info", ss_win)
+            self._set_slide_info(current, total)
+
+            self._checkpoint()
+            with registry.timer("monitor.backend.window_rect_ms"):
+                self._update_window_rect(backend, ss_win)
+            self._checkpoint()
+            with registry.timer("monitor.backend.video_state_ms"):
+                self._update_video_state(backend, ss_win)
+        except ComGuardError:
+            # Counted by the guard; the next tick tries again.
+            pass
 
+    def _set_slide_info(self, current, total):
+        if current != self._current_slide or total != self._total_slides:
+            self._current_slide = current
+            self._total_slides = total
+            self.scheduler.note_slide_change()
+            registry = metrics()
+            registry.counter("monitor.slide_changes").inc()
+            registry.mark("slide_changed")
+            self.slide_changed.emit(current, total)
+
+    def _read_slide(self):
+        """Re-read just the slide index, right after navigating."""
+        backend = self._backend
+        if backend is None:
+            return
         try:
-            if self.wps_app.SlideShowWindows.Count > 0:
-                ss_win = None
-                count = self.wps_app.SlideShowWindows.Count
-                
-                if count == 1:
-                    ss_win = self.wps_app.SlideShowWindows(1)
-                else:
-                    # Try to find the slideshow window (avoiding presenter view)
-                    # WPS slideshow window class is usually "wppSlideShowWindowClass"
-                    for i in range(1, count + 1):
-                        try:
-                            tmp_win = self.wps_app.SlideShowWindows(i)
-                            hwnd = getattr(tmp_win, "HWND", 0)
-                            if hwnd:
-                                class_name = win32gui.GetClassName(int(hwnd))
-                                if class_name == "wppSlideShowWindowClass":
-                                    ss_win = tmp_win
-                                    break
-                        except:
-                            continue
-                    
-                    if ss_win is None:
-                        ss_win = self.wps_app.SlideShowWindows(1)
-
-                view = ss_win.View
-                # WPS State might differ, usually 1=Running
-                state = getattr(view, "State", 1)
-                
-                if state in [1, 2]:
-                    if not self._running:
-                        self._running = True
-                        self._active_kind = "wps"
-                        self.slideshow_started.emit()
-
-                    try:
-                        current = view.Slide.SlideIndex
-                        presentation = ss_win.Presentation
-                        total = presentation.Slides.Count
-
-                        if current != self._current_slide or total != self._total_slides:
-                            self._current_slide = current
-                            self._total_slides = total
-                            self.slide_changed.emit(current, total)
-
-                        self._update_window_rect(ss_win)
-                        self._update_video_state(ss_win)
-                    except Exception:
-                        pass
-                else:
-                    self._handle_stop("wps")
-            else:
-                self._handle_stop("wps")
-        except BaseException:
-            self._handle_stop("wps")
+            ss_win = self._call(backend, "find_slideshow_window")
+            if ss_win is None:
+                return
+            current, total = self._call(backend, "get_slide_info", ss_win)
+        except ComGuardError:
+            return
+        self._set_slide_info(current, total)
 
     def _handle_stop(self, kind):
         if self._running and (self._active_kind == kind or self._active_kind is None):
             self._running = False
             self._active_kind = None
+            self._backend = None
             self.slideshow_ended.emit()
             if self._overlay_visible is not False:
                 self._overlay_visible = False
                 self.overlay_visibility_changed.emit(False)
 
-    def _update_window_rect(self, ss_win):
-        try:
-            l_left, l_top, l_width, l_height = 0, 0, 0, 0
-            screen = None
-            success = False
-            
-            # 1. Try Win32 API
-            if win32gui:
-                try:
-                    hwnd = getattr(ss_win, "HWND", 0)
-                    if hwnd:
-                        hwnd = int(hwnd)
-                        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
-                        w, h = right - left, bottom - top
-                        cx, cy = left + w // 2, top + h // 2
-                        
-                        # Note: QGuiApplication calls are not thread-safe if they access GUI
-                        # But screenAt/primaryScreen are generally okay.
-                        # However, strictly we should calculate rect here and let Main Thread determine Screen.
-                        # To be safe, we just emit the Rect and let Main Thread handle Screen resolution if possible.
-                        # OR: We trust QGuiApplication read-only methods.
-                        
-                        # Optimization: Just send raw rect, let UI thread figure out DPI/Screen
-                        # But existing logic does DPI scaling here. 
-                        # We will assume DPI unawareness in worker and let Main Thread handle scaling if needed?
-                        # Actually, raw pixels are better.
-                        
-                        # REVERTING to existing logic but being careful.
-                        # Accessing QGuiApplication in thread is risky for some operations.
-                        # Let's try to get screen in main thread.
-                        # But wait, we need screen for DPI.
-                        
-                        # Let's emit raw global coords and let main thread map it.
-                        final_rect = (left, top, w, h)
-                        success = True
-                except Exception:
-                    pass
-
-            # 2. Fallback to COM
-            if not success:
-                try:
-                    l_left = int(getattr(ss_win, "Left", 0))
-                    l_top = int(getattr(ss_win, "Top", 0))
-                    l_width = int(getattr(ss_win, "Width", 0))
-                    l_height = int(getattr(ss_win, "Height", 0))
-                    final_rect = (l_left, l_top, l_width, l_height)
-                    success = True
-                except Exception:
-                    pass
-
-            if success:
-                if final_rect != self._last_win_rect:
-                    self._last_win_rect = final_rect
-                    # We send RAW rect (x, y, w, h). Main thread converts to QRect and finds Screen.
-                    self.window_geometry_changed.emit(QRect(*final_rect), None)
-                self._update_overlay_visibility(ss_win, final_rect)
-                    
-        except Exception:
-            pass
-
-    def _is_foreground_presentation(self):
-        try:
-            if not win32gui:
-                return False
-            fg = win32gui.GetForegroundWindow()
-            if not fg:
-                return False
-            if win32process and win32api:
-                try:
-                    _, pid = win32process.GetWindowThreadProcessId(fg)
-                    if pid:
-                        handle = win32api.OpenProcess(0x1000, False, pid)
-                        exe = win32process.GetModuleFileNameEx(handle, 0) or ""
-                        if exe.lower().endswith("powerpnt.exe"):
-                            return True
-                except Exception:
-                    pass
-            title = win32gui.GetWindowText(fg) or ""
-            title_lower = title.lower()
-            if "powerpoint" in title_lower:
-                return True
-            if any(t in title for t in ["幻灯片放映", "演示文稿"]):
-                return True
-            return False
-        except Exception:
-            return False
-
-    def _update_overlay_visibility(self, ss_win, rect):
-        try:
-            if not win32gui or not win32api or not win32con:
-                return
-            hwnd = getattr(ss_win, "HWND", 0)
-            if not hwnd:
-                return
-            hwnd = int(hwnd)
-            fg = win32gui.GetForegroundWindow()
-            if not fg or int(fg) != hwnd or not self._is_foreground_presentation():
-                visible = False
-            else:
-                monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONEAREST)
-                info = win32api.GetMonitorInfo(monitor)
-                ml, mt, mr, mb = info["Monitor"]
-                wx, wy, ww, wh = rect
-                wr = wx + ww
-                wb = wy + wh
-                tol = 8
-                visible = (
-                    abs(wx - ml) <= tol
-                    and abs(wy - mt) <= tol
-                    and abs(wr - mr) <= tol
-                    and abs(wb - mb) <= tol
-                )
-            if visible != self._overlay_visible:
-                self._overlay_visible = visible
-                self.overlay_visibility_changed.emit(bool(visible))
-        except Exception:
-            pass
-
-    def _update_video_state(self, ss_win):
-        try:
-            view = ss_win.View
-            try:
-                slide = view.Slide
-                shapes = slide.Shapes
-                count = shapes.Count
-                found_video = False
-                for i in range(1, count + 1):
-                    shape = shapes.Item(i)
-                    media = getattr(shape, "MediaFormat", None)
-                    if media is None: continue
-                    
-                    length = getattr(media, "Length", 0)
-                    position = getattr(media, "Position", 0)
-                    
-                    if length and float(length) > 0:
-                        l = float(length)
-                        p = float(position or 0.0)
-                        ratio = p / l if l > 0 else 0
-                        self.video_state_changed.emit(ratio, p, l)
-                        found_video = True
-                        break
-                
-                if not found_video:
-                    self.video_state_changed.emit(0.0, 0.0, 0.0)
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-    # --- Control Slots ---
-    @Slot()
-    def go_next(self):
-        try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                app.SlideShowWindows(1).View.Next()
-        except Exception:
-            pass
-
-    @Slot()
-    def go_previous(self):
+    def _update_window_rect(self, backend, ss_win):
+        rect = self._call(backend, "get_window_rect", ss_win)
+        if rect is None:
+            return
+        if rect != self._last_win_rect:
+            self._last_win_rect = rect
+            # We send RAW rect (x, y, w, h). Main thread converts to QRect and finds Screen.
+            self.window_geometry_changed.emit(QRect(*rect), None)
+        visible = self._call(backend, "is_overlay_visible", ss_win, rect)
+        if visible is not None and visible != self._overlay_visible:
+            self._overlay_visible = visible
+            self.overlay_visibility_changed.emit(bool(visible))
+
+    def _update_video_state(self, backend, ss_win):
+        state = self._call(backend, "get_video_state", ss_win)
+        if state is None:
+            return
+        video_filter = self.video_filter
+        video_filter.min_delta = cfg.videoProgressMinDelta.value
+        video_filter.max_rate = cfg.videoProgressMaxRate.value
+        if video_filter.accept(*state):
+            self.video_state_changed.emit(*state)
+
+    # --- Control commands ---
+    # Commands come through self.commands rather than as queued slot
+    # calls, so they need not wait for a tick or an export to return:
+    # slow steps call _checkpoint(), which runs whatever is queued.
+    def _control(self, action, *args):
+        backend = self._backend
+        if backend is None:
+            return
         try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                app.SlideShowWindows(1).View.Previous()
-        except Exception:
+            self._call(backend, action, *args)
+        except ComGuardError:
             pass
 
-    @Slot()
-    def clear_screen(self):
-        try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                ss_win = app.SlideShowWindows(1)
-                hwnd = int(getattr(ss_win, "HWND", 0) or 0)
-                if hwnd and win32gui:
-                    try:
-                        win32gui.SetForegroundWindow(hwnd)
-                    except Exception:
-                        pass
-                if win32api and win32con:
-                    try:
-                        vk = ord("E")
-                        win32api.keybd_event(vk, 0, 0, 0)
-                        win32api.keybd_event(vk, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+    def _checkpoint(self):
+        if self.commands:
+            metrics().counter("monitor.command_preemptions").inc()
+            self.run_commands()
 
     @Slot()
-    def end_show(self):
+    def run_commands(self):
+        if self._draining:
+            return
+        self._draining = True
         try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                if cfg.autoHandleInk.value and self._active_kind == "ppt":
-                    try: app.DisplayAlerts = 1 
-                    except: pass
-                
-                app.SlideShowWindows(1).View.Exit()
-
-                if cfg.autoHandleInk.value and self._active_kind == "ppt":
-                    try: app.DisplayAlerts = -1
-                    except: pass
-        except Exception:
-            pass
-
-    @Slot(int)
-    def set_pointer_type(self, pointer_type):
+            while True:
+                item = self.commands.take()
+                if item is None:
+                    break
+                if item[1] in _NAVIGATION:
+                    self._nav_batch.append(item)
+                    continue
+                # Keep the order: navigation queued before this goes first.
+                self._flush_navigation()
+                queued_at, action, args = item
+                started = time.perf_counter()
+                self._control(action, *args)
+                self._record_command(queued_at, started, time.perf_counter())
+            if self._nav_batch:
+                in_burst = (time.perf_counter() - self._nav_last) * 1000.0 < NAV_BURST_MS
+                if in_burst and self._nav_timer is not None:
+                    if not self._nav_timer.isActive():
+                        self._nav_timer.start(NAV_COALESCE_MS)
+                else:
+                    self._flush_navigation()
+        finally:
+            self._draining = False
+
+    def _record_command(self, queued_at, started, done, kind="command", budget_ms=COMMAND_BUDGET_MS):
+        registry = metrics()
+        latency = (done - queued_at) * 1000.0
+        registry.histogram(f"monitor.{kind}_wait_ms").record((started - queued_at) * 1000.0)
+        registry.histogram(f"monitor.{kind}_ms").record((done - started) * 1000.0)
+        registry.histogram(f"monitor.{kind}_latency_ms").record(latency)
+        registry.counter(f"monitor.{kind}s").inc()
+        if latency > budget_ms:
+            registry.counter(f"monitor.{kind}s_late").inc()
+
+    def _flush_navigation(self):
+        if self._nav_timer is not None:
+            self._nav_timer.stop()
+        batch, self._nav_batch = self._nav_batch, []
+        if not batch:
+            return
+        started = time.perf_counter()
+        for action, args in self._plan_navigation(batch):
+            self._control(action, *args)
+        done = time.perf_counter()
+        self._nav_last = done
+        for queued_at, _, _ in batch:
+            self._record_command(queued_at, started, done, "nav", NAV_BUDGET_MS)
+        # Report the real index at once, so the main thread can confirm
+        # or roll back the page it showed optimistically.
+        self._read_slide()
+        self._navigated()
+        self.navigation_applied.emit(len(batch))
+
+    def _plan_navigation(self, batch):
+        """
+        The backend calls for a run of navigation commands. A burst that
+        nets out forward becomes a single jump when the backend says the
+        current slide has no build animations left to play (so Next would
+        have left the slide too); anything else is sent as it came.
+        """
+        calls = [(action, args) for _, action, args in batch]
+        backend = self._backend
+        if len(batch) == 1 or backend is None or not self._total_slides:
+            return calls
+        current = self._current_slide
+        target = current
+        for action, args in calls:
+            if action == "go_next":
+                target += 1
+            elif action == "go_previous":
+                target -= 1
+            else:
+                target = int(args[0])
+        target = max(1, min(self._total_slides, target))
+        if target <= current:
+            return calls
         try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                app.SlideShowWindows(1).View.PointerType = pointer_type
-        except Exception:
-            pass
-
-    @Slot(int, int, int)
-    def set_pen_color(self, r, g, b):
+            can_jump = self._call(backend, "can_jump")
+        except ComGuardError:
+            can_jump = False
+        if not can_jump:
+            return calls
+        metrics().counter("monitor.nav_coalesced").inc(len(batch) - 1)
+        if target == current + 1:
+            return [("go_next", ())]
+        return [("go_to_slide", (target,))]
+
+    @Slot(list, int)
+    def request_thumbnails(self, indices, current):
+        self._thumb_queue.submit(indices, current)
+        if self._thumb_timer and not self._thumb_timer.isActive():
+            self._thumb_timer.start(0)
+
+    def _process_thumbnail(self):
+        index = self._thumb_queue.pop()
+        if index is None:
+            return
+        self._checkpoint()
+        backend = self._backend
         try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                rgb = r + (g << 8) + (b << 16)
-                app.SlideShowWindows(1).View.PointerColor.RGB = rgb
-        except Exception:
+            identity = self._call(backend, "get_slide_identity", index) if backend else None
+            if identity is not None:
+                path = self.thumbnails.lookup(*identity)
+                if path is None:
+                    path = self.thumbnails.path_for(*identity)
+                    if self._call(backend, "export_slide", index, path):
+                        self.thumbnails.stored(path)
+                    else:
+                        path = None
+                if path:
+                    self.thumbnail_generated.emit(index, path)
+        except ComGuardError:
             pass
+        if len(self._thumb_queue):
+            self._thumb_timer.start(0)
 
-    @Slot(int)
-    def go_to_slide(self, index):
-        try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                app.SlideShowWindows(1).View.GotoSlide(index)
-        except Exception:
-            pass
-            
     @Slot(int, str)
     def export_slide_thumbnail(self, index, path):
+        self._checkpoint()
+        backend = self._backend
+        if backend is None:
+            return
         try:
-            app = self._get_active_app()
-            if app and app.SlideShowWindows.Count > 0:
-                pres = app.SlideShowWindows(1).Presentation
-                if 1 <= index <= pres.Slides.Count:
-                    pres.Slides(index).Export(path, "PNG", 320, 180)
-                    self.thumbnail_generated.emit(index, path)
-        except Exception:
+            if self._call(backend, "export_slide", index, path):
+                self.thumbnail_generated.emit(index, path)
+        except ComGuardError:
             pass
 
 
@@ -483,84 +563,187 @@ class PPTMonitor(QObject):
     # Internal signals to worker
     _req_start = Signal()
     _req_stop = Signal()
-    _req_next = Signal()
-    _req_prev = Signal()
-    _req_clear = Signal()
-    _req_end = Signal()
-    _req_ptr_type = Signal(int)
-    _req_pen_color = Signal(int, int, int)
-    _req_goto = Signal(int)
+    _req_commands = Signal()
     _req_export = Signal(int, str)
-
-    def __init__(self):
+    _req_thumbs = Signal(list, int)
+
+    def __init__(self, backends=None, backend_factory=None):
+        """
+        backends: the first worker's backends (default: the worker creates
+        the PowerPoint and WPS ones). backend_factory() makes fresh ones for
+        each replacement of a hung worker; with explicit backends and no
+        factory, hung workers are waited out instead of replaced.
+        """
         super().__init__()
-        self._thread = QThread()
-        self._worker = PPTWorker()
-        self._worker.moveToThread(self._thread)
+        self._backend_factory = backend_factory
+        self._restartable = backends is None or backend_factory is not None
+        # Shared by successive workers so a replacement keeps backing off.
+        self._breaker = CircuitBreaker()
+        self._monitoring = False
+        self._stuck = []  # (thread, worker) given up on, not yet returned
+        self._restarts = 0
+        self._hangs = collections.deque(maxlen=10)
+        self._start_pending = False
+        self._spawn_worker(backends)
 
-        # Wire up signals (Worker -> Self)
-        self._worker.slideshow_started.connect(self.slideshow_started)
-        self._worker.slideshow_ended.connect(self.slideshow_ended)
-        self._worker.slide_changed.connect(self._on_slide_changed)
-        self._worker.window_geometry_changed.connect(self._on_geometry_changed)
-        self._worker.overlay_visibility_changed.connect(self.overlay_visibility_changed)
-        self._worker.video_state_changed.connect(self.video_state_changed)
-        self._worker.video_state_changed.connect(self._update_local_video_state)
-        self._worker.thumbnail_generated.connect(self.thumbnail_generated)
-
-        # Wire up requests (Self -> Worker)
-        self._req_start.connect(self._worker.start)
-        self._req_stop.connect(self._worker.stop)
-        self._req_next.connect(self._worker.go_next)
-        self._req_prev.connect(self._worker.go_previous)
-        self._req_clear.connect(self._worker.clear_screen)
-        self._req_end.connect(self._worker.end_show)
-        self._req_ptr_type.connect(self._worker.set_pointer_type)
-        self._req_pen_color.connect(self._worker.set_pen_color)
-        self._req_goto.connect(self._worker.go_to_slide)
-        self._req_export.connect(self._worker.export_slide_thumbnail)
-        
         # Local state cache (for synchronous getters if needed)
         self._current = 0
         self._total = 0
         self._video_ratio = 0.0
         self._video_pos = 0.0
         self._video_len = 0.0
-        
+        self._video_signals = 0
+        # Optimistic navigation: the page last emitted, and how many
+        # navigation commands the worker has yet to confirm.
+        self._shown = None
+        self._nav_pending = 0
+
+    def _spawn_worker(self, backends=None):
+        self._thread = QThread()
+        self._worker = worker = PPTWorker(backends, self._breaker, self._restartable)
+        worker.moveToThread(self._thread)
+
+        # Wire up signals (Worker -> Self)
+        worker.slideshow_started.connect(self.slideshow_started)
+        worker.slideshow_ended.connect(self.slideshow_ended)
+        worker.slide_changed.connect(self._on_slide_changed)
+        worker.window_geometry_changed.connect(self._on_geometry_changed)
+        worker.overlay_visibility_changed.connect(self.overlay_visibility_changed)
+        worker.video_state_changed.connect(self.video_state_changed)
+        worker.video_state_changed.connect(self._update_local_video_state)
+        worker.thumbnail_generated.connect(self.thumbnail_generated)
+        worker.navigation_applied.connect(self._on_navigation_applied)
+        worker.slideshow_started.connect(self._reset_navigation)
+        worker.slideshow_ended.connect(self._reset_navigation)
+        worker.com_hung.connect(self._on_worker_hung)
+
+        # Wire up requests (Self -> Worker)
+        self._req_start.connect(worker.start)
+        self._req_stop.connect(worker.stop)
+        self._req_commands.connect(worker.run_commands)
+        self._req_export.connect(worker.export_slide_thumbnail)
+        self._req_thumbs.connect(worker.request_thumbnails)
+
         self._thread.start()
 
     def start_monitoring(self):
-        self._req_start.emit()
+        self._monitoring = True
+        if not self._start_pending:
+            self._req_start.emit()
 
     def stop_monitoring(self):
+        self._monitoring = False
         self._req_stop.emit()
         self._thread.quit()
-        self._thread.wait()
+        threads = [self._thread] + [thread for thread, _ in self._stuck]
+        for thread in threads:
+            if not thread.wait(STOP_WAIT_MS):
+                # Still inside a COM call that never returned; we are
+                # shutting down, so there is nothing left to wait for.
+                thread.terminate()
+                thread.wait()
+
+    # --- Hung worker recovery ---
+    @Slot(str)
+    def _on_worker_hung(self, name):
+        """
+        Leave the hung worker to finish its call and retire on its own, and
+        carry on with a new worker in a new thread (and so a new COM
+        apartment). The shared breaker keeps the new one from calling
+        straight back into the unresponsive application.
+        """
+        thread, worker = self._thread, self._worker
+        for signal_name in _WORKER_SIGNALS:
+            getattr(worker, signal_name).disconnect()
+        self._req_start.disconnect(worker.start)
+        self._req_stop.disconnect(worker.stop)
+        self._req_commands.disconnect(worker.run_commands)
+        self._req_export.disconnect(worker.export_slide_thumbnail)
+        self._req_thumbs.disconnect(worker.request_thumbnails)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(self._on_stuck_thread_finished)
+        self._stuck.append((thread, worker))
+
+        self._restarts += 1
+        metrics().counter("monitor.worker_restarts").inc()
+        self._reset_navigation()
+        # Fresh backends: the stuck worker's are still in use on its thread.
+        self._spawn_worker(self._backend_factory() if self._backend_factory else None)
+        # Each stuck worker holds a thread; past the limit the new one is
+        # only started once one of them comes back.
+        self._start_pending = len(self._stuck) >= MAX_STUCK_WORKERS
+        self._hangs.append({
+            "call": name,
+            "at": time.time(),
+            "replacement": "deferred" if self._start_pending else "started",
+        })
+        if self._start_pending:
+            return
+        if self._monitoring:
+            self._req_start.emit()
+
+    @Slot()
+    def _on_stuck_thread_finished(self):
+        thread = self.sender()
+        self._stuck = [(t, w) for t, w in self._stuck if t is not thread]
+        if thread is not None:
+            thread.deleteLater()
+        if self._start_pending:
+            self._start_pending = False
+            if self._monitoring:
+                self._req_start.emit()
 
     # --- Public API (Async) ---
+    def _command(self, action, *args):
+        self._worker.commands.put(action, *args)
+        # Wakes an idle worker; a busy one picks the command up at its
+        # next checkpoint.
+        self._req_commands.emit()
+
+    def _navigate(self, action, target, *args):
+        """
+        Queue a navigation command and show its expected result right
+        away; the worker's answer confirms or rolls it back.
+        """
+        if self._total:
+            target = max(1, min(self._total, target))
+            self._nav_pending += 1
+            self._command(action, *args)
+            if target != self._shown:
+                self._shown = target
+                self.slide_changed.emit(target, self._total)
+        else:
+            self._command(action, *args)
+
     def go_next(self):
-        self._req_next.emit()
+        self._navigate("go_next", (self._shown or self._current) + 1)
 
     def go_previous(self):
-        self._req_prev.emit()
+        self._navigate("go_previous", (self._shown or self._current) - 1)
 
     def clear_screen(self):
-        self._req_clear.emit()
+        self._command("clear_screen")
 
     def end_show(self):
-        self._req_end.emit()
+        self._command("end_show", cfg.autoHandleInk.value)
 
     def set_pointer_type(self, ptr_type):
-        self._req_ptr_type.emit(ptr_type)
+        self._command("set_pointer_type", ptr_type)
 
     def set_pen_color(self, r, g, b):
-        self._req_pen_color.emit(r, g, b)
+        self._command("set_pen_color", r, g, b)
 
     def go_to_slide(self, index):
-        self._req_goto.emit(index)
+        self._navigate("go_to_slide", int(index), index)
 
     def export_slide_thumbnail(self, index, path):
         self._req_export.emit(index, path)
+
+    def request_thumbnails(self, indices, current=None):
+        """Export (or reuse cached) thumbnails, nearest to current first."""
+        if current is None:
+            current = self._current
+        self._req_thumbs.emit(list(indices), int(current))
         
     def force_update_geometry(self):
         # We can't force update easily from main thread without roundtrip
@@ -572,8 +755,27 @@ class PPTMonitor(QObject):
     def _on_slide_changed(self, current, total):
         self._current = current
         self._total = total
+        if self._nav_pending:
+            # Settled in _on_navigation_applied once the burst is done.
+            return
+        self._shown = current
         self.slide_changed.emit(current, total)
 
+    def _on_navigation_applied(self, count):
+        self._nav_pending = max(0, self._nav_pending - count)
+        if self._nav_pending or self._shown == self._current:
+            return
+        if self._shown is not None:
+            # The prediction was wrong (builds, hidden slides, a jump that
+            # failed): show where the show really is.
+            metrics().counter("monitor.nav_rollbacks").inc()
+        self._shown = self._current
+        self.slide_changed.emit(self._current, self._total)
+
+    def _reset_navigation(self):
+        self._shown = None
+        self._nav_pending = 0
+
     def _on_geometry_changed(self, rect_raw, _):
         x, y, w, h = rect_raw.x(), rect_raw.y(), rect_raw.width(), rect_raw.height()
         cx, cy = x + w // 2, y + h // 2
@@ -631,11 +833,40 @@ class PPTMonitor(QObject):
             self.window_geometry_changed.emit(rect_raw, None)
 
     def _update_local_video_state(self, ratio, pos, length):
+        self._video_signals += 1
         self._video_ratio = ratio
         self._video_pos = pos
         self._video_len = length
 
     # --- Getters (Cached) ---
+    def get_tracking_mode(self):
+        return self._worker.tracking_mode
+
+    def get_poll_stats(self):
+        return self._worker.scheduler.stats()
+
+    def get_video_signal_stats(self):
+        return {
+            "delivered": self._video_signals,
+            "suppressed": self._worker.video_filter.suppressed,
+        }
+
+    def get_thumbnail_stats(self):
+        stats = self._worker.thumbnails.stats()
+        stats["dropped"] = self._worker._thumb_queue.dropped
+        return stats
+
+    def get_com_stats(self):
+        stats = self._worker.guard.stats()
+        stats["breaker"] = self._breaker.stats()
+        stats["restarts"] = self._restarts
+        stats["hangs"] = list(self._hangs)
+        stats["stuck_workers"] = len(self._stuck)
+        return stats
+
+    def get_backend_stats(self):
+        return {b.kind: b.stats() for b in self._worker._backends or []}
+
     def get_page_info(self):
         return self._current, self._total
 
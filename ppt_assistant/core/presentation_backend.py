@@ -0,0 +1,560 @@
+from ppt_assistant.core.ppt_events import ComEventSource, win32com_client
+
+try:
+    import win32gui
+    import win32api
+    import win32con
+    import win32process
+except ImportError:
+    win32gui = None
+    win32api = None
+    win32con = None
+    win32process = None
+
+
+class PresentationBackend:
+    """
+    Access to one presentation application. PPTWorker only talks to
+    backends, so every call here runs on the worker thread.
+    """
+    kind = ""
+
+    def __init__(self, event_source=None):
+        self.events = event_source
+
+    def checkpoint(self):
+        """
+        Called between the steps of slow work (per shape scanned, ...).
+        PPTWorker replaces it to run queued control commands there.
+        """
+        pass
+
+    def create_event_source(self, parent=None):
+        return None
+
+    def acquire(self) -> bool:
+        """Connect to the running application; False if it is not running."""
+        raise NotImplementedError
+
+    def release(self):
+        if self.events is not None and self.events.is_attached():
+            self.events.detach()
+
+    def pump_events(self):
+        if self.events is not None:
+            self.events.pump()
+
+    def events_attached(self) -> bool:
+        return self.events is not None and self.events.is_attached()
+
+    def stats(self):
+        return {}
+
+    def find_slideshow_window(self):
+        """Return the running (or paused) slideshow window, or None."""
+        raise NotImplementedError
+
+    def get_slide_info(self, ss_win):
+        """Return (current, total)."""
+        raise NotImplementedError
+
+    def get_window_rect(self, ss_win):
+        """Return the raw (x, y, w, h) of the slideshow window, or None."""
+        return None
+
+    def is_overlay_visible(self, ss_win, rect):
+        """Return whether the overlay should be shown, or None if unknown."""
+        return None
+
+    def get_video_state(self, ss_win):
+        """Return (ratio, position, length) for the current slide, or None."""
+        return None
+
+    # --- Controls ---
+    def can_jump(self):
+        """
+        Whether Next would leave the current slide, so a run of Nexts can
+        be sent as one go_to_slide(). False when unsure.
+        """
+        return False
+
+    def go_next(self):
+        pass
+
+    def go_previous(self):
+        pass
+
+    def go_to_slide(self, index):
+        pass
+
+    def end_show(self, handle_ink=False):
+        pass
+
+    def clear_screen(self):
+        pass
+
+    def set_pointer_type(self, pointer_type):
+        pass
+
+    def set_pen_color(self, r, g, b):
+        pass
+
+    def get_slide_identity(self, index):
+        """Return (presentation path, SlideID) for thumbnail caching, or None."""
+        return None
+
+    def export_slide(self, index, path) -> bool:
+        return False
+
+
+class ComHandleCache:
+    """
+    COM handles that stay valid across worker ticks: the application object,
+    the chosen slideshow window with its HWND, and whether a foreground
+    process is the presentation application. Entries are dropped only when a
+    COM call fails or the window's HWND changes.
+    """
+    max_pids = 64
+
+    def __init__(self):
+        self.app = None
+        self.window = None
+        self.hwnd = 0
+        self.window_count = 0
+        self.presentation_key = None
+        self._pid_verdicts = {}
+        self.hits = {}
+        self.misses = {}
+
+    def hit(self, key):
+        self.hits[key] = self.hits.get(key, 0) + 1
+
+    def miss(self, key):
+        self.misses[key] = self.misses.get(key, 0) + 1
+
+    def set_window(self, window, hwnd, count):
+        self.window = window
+        self.hwnd = hwnd
+        self.window_count = count
+
+    def invalidate_window(self):
+        self.window = None
+        self.hwnd = 0
+        self.window_count = 0
+        self.presentation_key = None
+
+    def invalidate(self):
+        self.app = None
+        self.invalidate_window()
+
+    def pid_verdict(self, pid):
+        verdict = self._pid_verdicts.get(pid)
+        if verdict is None:
+            self.miss("process")
+        else:
+            self.hit("process")
+        return verdict
+
+    def store_pid_verdict(self, pid, verdict):
+        if len(self._pid_verdicts) >= self.max_pids:
+            self._pid_verdicts.clear()
+        self._pid_verdicts[pid] = verdict
+
+    def stats(self):
+        return {"hits": dict(self.hits), "misses": dict(self.misses)}
+
+
+class SlideMediaIndex:
+    """
+    Which shapes carry media on each slide of one presentation, keyed by
+    SlideID. A slide's shapes are scanned once; afterwards only the known
+    media shapes are read.
+    """
+
+    def __init__(self):
+        self._presentation = None
+        self._slides = {}
+
+    def use_presentation(self, key):
+        if key != self._presentation:
+            self._presentation = key
+            self._slides = {}
+
+    def get(self, slide_id):
+        return self._slides.get(slide_id)
+
+    def put(self, slide_id, entries):
+        self._slides[slide_id] = entries
+
+
+class ComPresentationBackend(PresentationBackend):
+    """
+    Shared COM implementation for PowerPoint and WPS, which expose the same
+    SlideShowWindows object model.
+    """
+    prog_id = ""
+    screen_class = ""
+    process_names = ()
+    title_hints = ("幻灯片放映", "演示文稿")
+    handles_ink_alerts = False
+
+    def __init__(self, app_factory=None, event_source=None):
+        super().__init__(event_source)
+        self._app_factory = app_factory
+        self.cache = ComHandleCache()
+        self.media_index = SlideMediaIndex()
+        self._media_slide = None
+        self._media = None  # (MediaFormat, length) on the current slide
+
+    @property
+    def app(self):
+        return self.cache.app
+
+    def _get_active_object(self):
+        if self._app_factory is not None:
+            return self._app_factory()
+        client = win32com_client()
+        if client is None:
+            return None
+        return client.GetActiveObject(self.prog_id)
+
+    def create_event_source(self, parent=None):
+        if win32com_client() is None:
+            return None
+        return ComEventSource(parent)
+
+    def acquire(self) -> bool:
+        # The application object stays valid until a COM call on it fails,
+        # so there is no need to resolve it every tick.
+        app = self.cache.app
+        if app is not None:
+            self.cache.hit("app")
+        else:
+            self.cache.miss("app")
+            try:
+                app = self._get_active_object()
+            except Exception:
+                app = None
+            self.cache.app = app
+            if app is None:
+                return False
+        if self.events is not None:
+            self.events.attach(app)
+        return True
+
+    def release(self):
+        super().release()
+        self.cache.invalidate()
+        self._media_slide = None
+        self._media = None
+
+    def stats(self):
+        return self.cache.stats()
+
+    def _pick_window(self, app, count):
+        if count == 1:
+            return app.SlideShowWindows(1)
+        # Avoid the Presenter View window when several are open.
+        for i in range(1, count + 1):
+            try:
+                tmp_win = app.SlideShowWindows(i)
+                hwnd = getattr(tmp_win, "HWND", 0)
+                if hwnd and win32gui:
+                    if win32gui.GetClassName(int(hwnd)) == self.screen_class:
+                        return tmp_win
+            except Exception:
+                continue
+        return app.SlideShowWindows(1)
+
+    def find_slideshow_window(self):
+        app = self.app
+        if app is None:
+            return None
+        try:
+            count = app.SlideShowWindows.Count
+        except Exception:
+            # The cached application object went away (application quit).
+            self.release()
+            return None
+        if count <= 0:
+            self.cache.invalidate_window()
+            if not self.events_attached():
+                # Don't hold an idle application alive between shows.
+                self.cache.app = None
+            return None
+
+        cache = self.cache
+        if cache.window is not None and cache.window_count == count:
+            try:
+                hwnd = int(getattr(cache.window, "HWND", 0) or 0)
+                state = getattr(cache.window.View, "State", 1)
+            except Exception:
+                hwnd, state = None, None
+            if hwnd is not None and hwnd == cache.hwnd:
+                cache.hit("window")
+                return cache.window if state in (1, 2) else None
+            cache.invalidate_window()
+
+        cache.miss("window")
+        try:
+            ss_win = self._pick_window(app, count)
+            hwnd = int(getattr(ss_win, "HWND", 0) or 0)
+            state = getattr(ss_win.View, "State", 1)
+        except Exception:
+            return None
+        cache.set_window(ss_win, hwnd, count)
+        if state in (1, 2):  # Running or Paused
+            return ss_win
+        return None
+
+    def _hwnd(self, ss_win):
+        if ss_win is self.cache.window:
+            return self.cache.hwnd
+        return int(getattr(ss_win, "HWND", 0) or 0)
+
+    def get_slide_info(self, ss_win):
+        current = ss_win.View.Slide.SlideIndex
+        total = ss_win.Presentation.Slides.Count
+        return current, total
+
+    def get_window_rect(self, ss_win):
+        # Raw global coordinates; the main thread maps them to a screen and
+        # applies DPI scaling.
+        if win32gui:
+            try:
+                hwnd = self._hwnd(ss_win)
+                if hwnd:
+                    left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+                    return (left, top, right - left, bottom - top)
+            except Exception:
+                pass
+        try:
+            return (
+                int(getattr(ss_win, "Left", 0)),
+                int(getattr(ss_win, "Top", 0)),
+                int(getattr(ss_win, "Width", 0)),
+                int(getattr(ss_win, "Height", 0)),
+            )
+        except Exception:
+            return None
+
+    def _is_foreground_presentation(self, fg):
+        try:
+            if win32process and win32api:
+                try:
+                    _, pid = win32process.GetWindowThreadProcessId(fg)
+                except Exception:
+                    pid = 0
+                if pid:
+                    verdict = self.cache.pid_verdict(pid)
+                    if verdict is None:
+                        try:
+                            handle = win32api.OpenProcess(0x1000, False, pid)
+                            exe = (win32process.GetModuleFileNameEx(handle, 0) or "").lower()
+                            verdict = any(exe.endswith(name) for name in self.process_names)
+                            self.cache.store_pid_verdict(pid, verdict)
+                        except Exception:
+                            verdict = None
+                    if verdict:
+                        return True
+            title = win32gui.GetWindowText(fg) or ""
+            title_lower = title.lower()
+            return any(hint in title_lower for hint in self.title_hints)
+        except Exception:
+            return False
+
+    def is_overlay_visible(self, ss_win, rect):
+        if not win32gui or not win32api or not win32con:
+            return None
+        try:
+            hwnd = self._hwnd(ss_win)
+            if not hwnd:
+                return None
+            fg = win32gui.GetForegroundWindow()
+            if not fg or int(fg) != hwnd or not self._is_foreground_presentation(fg):
+                return False
+            monitor = win32api.MonitorFromWindow(hwnd, win32con.MONITOR_DEFAULTTONEAREST)
+            info = win32api.GetMonitorInfo(monitor)
+            ml, mt, mr, mb = info["Monitor"]
+            wx, wy, ww, wh = rect
+            tol = 8
+            return (
+                abs(wx - ml) <= tol
+                and abs(wy - mt) <= tol
+                and abs(wx + ww - mr) <= tol
+                and abs(wy + wh - mb) <= tol
+            )
+        except Exception:
+            return None
+
+    def _presentation_key(self, ss_win):
+        if ss_win is self.cache.window and self.cache.presentation_key is not None:
+            return self.cache.presentation_key
+        pres = ss_win.Presentation
+        key = str(getattr(pres, "FullName", "") or getattr(pres, "Name", ""))
+        if ss_win is self.cache.window:
+            self.cache.presentation_key = key
+        return key
+
+    def _scan_media(self, slide):
+        entries = []
+        shapes = slide.Shapes
+        for i in range(1, shapes.Count + 1):
+            self.checkpoint()
+            # MediaFormat raises on shapes that carry no media.
+            try:
+                media = getattr(shapes.Item(i), "MediaFormat", None)
+                length = float(getattr(media, "Length", 0) or 0) if media is not None else 0.0
+            except Exception:
+                continue
+            if length > 0:
+                entries.append((i, length))
+        return entries
+
+    def _load_slide_media(self, ss_win, slide, slide_key):
+        presentation, slide_id = slide_key
+        self.media_index.use_presentation(presentation)
+        entries = self.media_index.get(slide_id)
+        if entries is None:
+            self.cache.miss("media")
+            entries = self._scan_media(slide)
+            self.media_index.put(slide_id, entries)
+        else:
+            self.cache.hit("media")
+        self._media = None
+        if entries:
+            index, length = entries[0]
+            self._media = (slide.Shapes.Item(index).MediaFormat, length)
+        self._media_slide = slide_key
+
+    def get_video_state(self, ss_win):
+        try:
+            slide = ss_win.View.Slide
+            slide_key = (self._presentation_key(ss_win), slide.SlideID)
+            if slide_key != self._media_slide:
+                self._load_slide_media(ss_win, slide, slide_key)
+            if self._media is None:
+                return (0.0, 0.0, 0.0)
+            media, length = self._media
+            p = float(getattr(media, "Position", 0) or 0.0)
+            return (p / length, p, length)
+        except Exception:
+            self._media_slide = None
+            self._media = None
+            return None
+
+    # --- Controls ---
+    def _control_window(self):
+        if self.cache.window is not None:
+            return self.cache.window
+        app = self.app
+        if app is not None and app.SlideShowWindows.Count > 0:
+            return app.SlideShowWindows(1)
+        return None
+
+    def can_jump(self):
+        ss_win = self._control_window()
+        if ss_win is None:
+            return False
+        try:
+            view = ss_win.View
+            # Builds still to play on this slide would be skipped by a jump.
+            return view.GetClickIndex() >= view.GetClickCount()
+        except Exception:
+            return False
+
+    def go_next(self):
+        ss_win = self._control_window()
+        if ss_win is not None:
+            ss_win.View.Next()
+
+    def go_previous(self):
+        ss_win = self._control_window()
+        if ss_win is not None:
+            ss_win.View.Previous()
+
+    def go_to_slide(self, index):
+        ss_win = self._control_window()
+        if ss_win is not None:
+            ss_win.View.GotoSlide(index)
+
+    def end_show(self, handle_ink=False):
+        ss_win = self._control_window()
+        if ss_win is None:
+            return
+        handle_ink = handle_ink and self.handles_ink_alerts
+        if handle_ink:
+            try: self.app.DisplayAlerts = 1
+            except: pass
+        ss_win.View.Exit()
+        if handle_ink:
+            try: self.app.DisplayAlerts = -1
+            except: pass
+
+    def clear_screen(self):
+        ss_win = self._control_window()
+        if ss_win is None:
+            return
+        hwnd = self._hwnd(ss_win)
+        if hwnd and win32gui:
+            try:
+                win32gui.SetForegroundWindow(hwnd)
+            except Exception:
+                pass
+        if win32api and win32con:
+            try:
+                vk = ord("E")
+                win32api.keybd_event(vk, 0, 0, 0)
+                win32api.keybd_event(vk, 0, win32con.KEYEVENTF_KEYUP, 0)
+            except Exception:
+                pass
+
+    def set_pointer_type(self, pointer_type):
+        ss_win = self._control_window()
+        if ss_win is not None:
+            ss_win.View.PointerType = pointer_type
+
+    def set_pen_color(self, r, g, b):
+        ss_win = self._control_window()
+        if ss_win is not None:
+            ss_win.View.PointerColor.RGB = r + (g << 8) + (b << 16)
+
+    def get_slide_identity(self, index):
+        ss_win = self._control_window()
+        if ss_win is None:
+            return None
+        pres = ss_win.Presentation
+        if not 1 <= index <= pres.Slides.Count:
+            return None
+        return self._presentation_key(ss_win), pres.Slides(index).SlideID
+
+    def export_slide(self, index, path) -> bool:
+        ss_win = self._control_window()
+        if ss_win is None:
+            return False
+        pres = ss_win.Presentation
+        if 1 <= index <= pres.Slides.Count:
+            pres.Slides(index).Export(path, "PNG", 320, 180)
+            return True
+        return False
+
+
+class PowerPointBackend(ComPresentationBackend):
+    kind = "ppt"
+    prog_id = "PowerPoint.Application"
+    screen_class = "screenClass"
+    process_names = ("powerpnt.exe",)
+    title_hints = ("powerpoint", "幻灯片放映", "演示文稿")
+    handles_ink_alerts = True
+
+
+class WpsBackend(ComPresentationBackend):
+    kind = "wps"
+    prog_id = "KWPP.Application"
+    screen_class = "wppSlideShowWindowClass"
+    process_names = ("wpp.exe",)
+    title_hints = ("wps", "幻灯片放映", "演示文稿")
+
+
+def create_default_backends():
+    return [PowerPointBackend(), WpsBackend()]
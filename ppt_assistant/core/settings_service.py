@@ -0,0 +1,297 @@
+import atexit
+import copy
+import json
+import os
+import tempfile
+import time
+import weakref
+
+import shiboken6
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, QLockFile
+
+from ppt_assistant.core import ipc
+
+
+def read_settings(path):
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except Exception:
+        return {}
+    for enc in ("utf-8", "utf-8-sig", "gbk", "gb18030", "cp1252"):
+        try:
+            data = json.loads(raw.decode(enc))
+        except Exception:
+            continue
+        return data if isinstance(data, dict) else {}
+    return {}
+
+
+def merge_patch(data, patch):
+    """Merge {section: {key: value}} into data. Non-dict values replace
+    the whole entry."""
+    for section, value in (patch or {}).items():
+        if isinstance(value, dict):
+            target = data.get(section)
+            if not isinstance(target, dict):
+                target = data[section] = {}
+            target.update(copy.deepcopy(value))
+        else:
+            data[section] = copy.deepcopy(value)
+    return data
+
+
+def write_atomic(path, data):
+    """Write data as JSON so readers see either the old or the new file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+# Writers still alive at interpreter exit, flushed by one atexit hook.
+# Weak, so registering does not keep a writer alive.
+_live_writers = weakref.WeakSet()
+
+
+def _flush_live_writers():
+    for writer in list(_live_writers):
+        if not shiboken6.isValid(writer):
+            continue
+        try:
+            writer.flush()
+        except RuntimeError:
+            # Its timer or channel was deleted with the application.
+            pass
+
+
+atexit.register(_flush_live_writers)
+
+
+class SettingsWriter(QObject):
+    """
+    Buffers settings patches for coalesce_ms and writes them in one go:
+    read, merge, write to a temp file and rename, all under a lock file
+    shared by every process that writes settings.json. Nothing is written
+    if the merge leaves the file unchanged.
+    """
+    written = Signal()
+
+    def __init__(self, path, coalesce_ms=200, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._pending = {}
+        self._replace = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(coalesce_ms)
+        self._timer.timeout.connect(self.flush)
+        self.patches = 0
+        self.writes = 0
+        self.skipped = 0
+        _live_writers.add(self)
+        app = QCoreApplication.instance()
+        if app is not None:
+            # While the timer and channel still exist; atexit is a backstop.
+            app.aboutToQuit.connect(self.flush)
+
+    def update(self, patch):
+        merge_patch(self._pending, patch)
+        self.patches += 1
+        # Not restarted on every patch, so a long slider drag still lands
+        # on disk every coalesce_ms.
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def set(self, section, key, value):
+        self.update({section: {key: value}})
+
+    def replace(self, data):
+        self._replace = copy.deepcopy(data) if isinstance(data, dict) else {}
+        self._pending = {}
+        self.patches += 1
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def snapshot(self):
+        """The file as it will be after pending patches are written."""
+        data = copy.deepcopy(self._replace) if self._replace is not None else read_settings(self.path)
+        return merge_patch(data, self._pending)
+
+    def flush(self):
+        try:
+            self._timer.stop()
+        except RuntimeError:
+            # Already deleted at interpreter exit.
+            pass
+        if not self._pending and self._replace is None:
+            return True
+        patch, self._pending = self._pending, {}
+        replace, self._replace = self._replace, None
+        return self._commit(patch, replace)
+
+    def _commit(self, patch, replace):
+        lock = QLockFile(self.path + ".lock")
+        lock.setStaleLockTime(5000)
+        if not lock.tryLock(2000):
+            print(f"Settings file is locked, retrying: {self.path}")
+            # Put the batch back in front of anything queued since, unless
+            # a newer replace() has superseded it.
+            if self._replace is None:
+                self._replace = replace
+                self._pending = merge_patch(patch, self._pending)
+            self._timer.start()
+            return False
+        try:
+            current = read_settings(self.path)
+            data = replace if replace is not None else copy.deepcopy(current)
+            merge_patch(data, patch)
+            if data == current:
+                self.skipped += 1
+                return True
+            write_atomic(self.path, data)
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return False
+        finally:
+            lock.unlock()
+        self.written.emit()
+        return True
+
+    def stats(self):
+        return {"patches": self.patches, "writes": self.writes, "skipped": self.skipped}
+
+
+class SettingsService(SettingsWriter):
+    """
+    The settings writer of the main process. Once serve() is called,
+    other processes send it their changes through the message hub instead
+    of writing the file themselves, with the requests settings.update
+    {patch}, settings.replace {data}, settings.flush and settings.get.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(SettingsService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, path=None, coalesce_ms=200):
+        if self._initialized:
+            return
+        super().__init__(path, coalesce_ms)
+        self._initialized = True
+        self._serving = False
+        self.requests = 0
+
+    def serve(self):
+        if self._serving:
+            return True
+        hub = ipc.message_hub()
+        if not hub.listen(ipc.channel_name("app", self.path)):
+            print("Settings service unavailable")
+            return False
+        hub.handle("settings.update", self._counted(lambda params: self.update(params or {})))
+        hub.handle("settings.replace", self._counted(lambda params: self.replace(params or {})))
+        hub.handle("settings.flush", self._counted(lambda params: self.flush()))
+        hub.handle("settings.get", self._counted(lambda params: self.snapshot()))
+        self._serving = True
+        return True
+
+    def _counted(self, handler):
+        def wrapped(params, channel):
+            self.requests += 1
+            return handler(params)
+        return wrapped
+
+    def stats(self):
+        stats = super().stats()
+        stats["requests"] = self.requests
+        stats["serving"] = self._serving
+        return stats
+
+
+class SettingsClient(SettingsWriter):
+    """
+    Settings writer for helper processes. Changes go to the main process's
+    SettingsService when it is running; otherwise they are coalesced and
+    written here, under the same lock.
+    """
+    retry_interval = 5.0
+
+    def __init__(self, path, coalesce_ms=200, parent=None):
+        super().__init__(path, coalesce_ms, parent)
+        self._channel = None
+        self._next_attempt = 0.0
+
+    def _connected(self):
+        if self._channel is not None and self._channel.connected:
+            return True
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        name = os.environ.get(ipc.ENV_NAME) or ipc.channel_name("app", self.path)
+        self._channel = ipc.connect(name, 100, self)
+        if self._channel is None:
+            self._next_attempt = now + self.retry_interval
+            return False
+        return True
+
+    def _request(self, op, params, fallback):
+        """
+        Send op to the service. fallback() applies the change here instead
+        if the request cannot be sent, or the channel closes (or the
+        service fails) before it is answered.
+        """
+        if not self._connected():
+            fallback()
+            return
+
+        def done(_result, error):
+            if error:
+                fallback()
+
+        self._channel.request(op, params, done)
+
+    def _call(self, op, params=None):
+        if not self._connected():
+            return None
+        try:
+            return {"result": self._channel.call(op, params, 1000)}
+        except ipc.IpcError:
+            return None
+
+    def update(self, patch):
+        # Copied, as the fallback may run after the caller has moved on.
+        patch = copy.deepcopy(patch)
+        self._request("settings.update", patch, lambda: SettingsWriter.update(self, patch))
+
+    def replace(self, data):
+        data = copy.deepcopy(data)
+        self._request("settings.replace", data, lambda: SettingsWriter.replace(self, data))
+
+    def snapshot(self):
+        if not self._pending and self._replace is None:
+            reply = self._call("settings.get")
+            if reply and isinstance(reply["result"], dict):
+                return reply["result"]
+        return super().snapshot()
+
+    def flush(self):
+        ok = super().flush()
+        if self._channel is not None:
+            reply = self._call("settings.flush")
+            ok = ok and bool(reply and reply["result"])
+        return ok
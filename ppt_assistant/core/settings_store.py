@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from ppt_assistant.core.config import SETTINGS_PATH
+from ppt_assistant.core.file_watcher import FileWatcher
+
+
+class SettingsChange:
+    """
+    Keys that differ between two settings snapshots, as
+    {(section, key): (old, new)}. Top-level values that are not sections
+    use key None.
+    """
+
+    def __init__(self, version, changes):
+        self.version = version
+        self.changes = changes
+
+    def touched(self, section, key=None) -> bool:
+        if key is not None:
+            return (section, key) in self.changes
+        return any(s == section for s, _ in self.changes)
+
+    def value(self, section, key, default=None):
+        if (section, key) in self.changes:
+            return self.changes[(section, key)][1]
+        return default
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __repr__(self):
+        return f"SettingsChange(version={self.version}, keys={sorted(self.changes, key=str)})"
+
+
+def _diff(old, new):
+    changes = {}
+    for section in set(old) | set(new):
+        a = old.get(section)
+        b = new.get(section)
+        if isinstance(a, dict) or isinstance(b, dict):
+            a = a if isinstance(a, dict) else {}
+            b = b if isinstance(b, dict) else {}
+            for key in set(a) | set(b):
+                if a.get(key) != b.get(key):
+                    changes[(section, key)] = (a.get(key), b.get(key))
+        elif a != b:
+            changes[(section, None)] = (a, b)
+    return changes
+
+
+class SettingsStore(QObject):
+    """
+    Process-wide, parsed snapshot of settings.json. The file is re-parsed
+    only when its mtime or size changes; every reparse bumps version and
+    publishes a SettingsChange with the keys that differ.
+    Treat returned dicts as read-only.
+
+    Once watch() is called, a FileWatcher drives refreshes and reads no
+    longer touch the file at all.
+    """
+    changed = Signal(object)  # SettingsChange
+
+    # How old a snapshot may get before a read checks the file again.
+    max_age = 0.5
+
+    _instance = None
+
+    def __new__(cls, path=SETTINGS_PATH):
+        if cls._instance is None:
+            cls._instance = super(SettingsStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, path=SETTINGS_PATH):
+        if self._initialized:
+            return
+        super().__init__()
+        self._initialized = True
+        self.path = path
+        self.version = 0
+        self.parses = 0
+        self._data = {}
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self._handlers = []
+        self._watcher = None
+        self.refresh()
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _parse(self):
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except Exception:
+            return {}
+        for enc in ("utf-8", "utf-8-sig", "gbk", "gb18030", "cp1252"):
+            try:
+                text = raw.decode(enc, errors="ignore")
+            except Exception:
+                continue
+            try:
+                data = json.loads(text)
+            except Exception:
+                continue
+            return data if isinstance(data, dict) else {}
+        return {}
+
+    def refresh(self, force=False):
+        """Re-read the file if it changed. Returns the SettingsChange or None."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            stamp = self._file_stamp()
+            if not force and stamp == self._stamp and self.version:
+                return None
+            data = self._parse() if stamp is not None else {}
+            self.parses += 1
+            self._stamp = stamp
+            changes = _diff(self._data, data)
+            self._data = data
+            if not changes and self.version:
+                return None
+            self.version += 1
+            change = SettingsChange(self.version, changes)
+        self._dispatch(change)
+        self.changed.emit(change)
+        return change
+
+    def subscribe(self, handler, keys=None):
+        """
+        Call handler(change) when any of keys changes. keys are
+        (section, key) pairs, key None meaning anything in the section;
+        keys=None subscribes to every change. Handlers run in
+        subscription order.
+        """
+        keys = None if keys is None else [tuple(k) for k in keys]
+        self._handlers.append((keys, handler))
+
+    def unsubscribe(self, handler):
+        self._handlers = [(k, h) for k, h in self._handlers if h != handler]
+
+    def _dispatch(self, change):
+        if not change:
+            return
+        for keys, handler in list(self._handlers):
+            if keys is not None and not any(change.touched(section, key) for section, key in keys):
+                continue
+            try:
+                handler(change)
+            except Exception as e:
+                print(f"Settings handler failed: {e}")
+
+    def watch(self, debounce_ms=150):
+        """Refresh from file system notifications instead of on read."""
+        if self._watcher is not None:
+            return self._watcher
+        self._watcher = FileWatcher(debounce_ms=debounce_ms, parent=self)
+        self._watcher.changed.connect(lambda _path: self.refresh())
+        self._watcher.add(self.path)
+        self.max_age = None
+        # Catch anything written before the watch was in place.
+        self.refresh()
+        return self._watcher
+
+    def _current(self):
+        if self.max_age is not None and time.monotonic() - self._checked_at >= self.max_age:
+            self.refresh()
+        return self._data
+
+    def snapshot(self):
+        return self._current()
+
+    def section(self, name):
+        value = self._current().get(name)
+        return value if isinstance(value, dict) else {}
+
+    def get(self, section, key, default=None):
+        value = self.section(section).get(key, default)
+        return default if value is None else value
+
+
+def settings_store():
+    return SettingsStore()
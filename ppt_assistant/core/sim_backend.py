@@ -0,0 +1,426 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from PySide6.QtCore import QObject, QTimer, QEventLoop
+from PySide6.QtGui import QImage, QColor
+
+from ppt_assistant.core.ppt_events import SlideShowEventSource
+from ppt_assistant.core.presentation_backend import PresentationBackend
+
+
+class SessionRecording:
+    """
+    Timed list of presentation events. Each event is a dict with "t" (seconds
+    from the start of the session) and a "type":
+
+        begin   {"total": int, "index": int}
+        slide   {"index": int}
+        window  {"rect": [x, y, w, h]}
+        visible {"value": bool}
+        video   {"position": float, "length": float}
+        end     {}
+    """
+
+    def __init__(self, events=None):
+        self.events = sorted(events or [], key=lambda e: float(e.get("t", 0.0)))
+
+    @property
+    def duration(self):
+        if not self.events:
+            return 0.0
+        return float(self.events[-1].get("t", 0.0))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("events", [])
+        return cls(data if isinstance(data, list) else [])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"events": self.events}, f, indent=4, ensure_ascii=False)
+
+    @classmethod
+    def synthetic(cls, slide_count=20, dwell=0.5, video_slides=(), rect=(0, 0, 1920, 1080)):
+        """Build a session that pages through every slide once."""
+        events = [
+            {"t": 0.0, "type": "begin", "total": slide_count, "index": 1},
+            {"t": 0.0, "type": "window", "rect": list(rect)},
+            {"t": 0.0, "type": "visible", "value": True},
+        ]
+        t = 0.0
+        for index in range(1, slide_count + 1):
+            if index > 1:
+                events.append({"t": round(t, 4), "type": "slide", "index": index})
+            if index in video_slides:
+                steps = 4
+                for step in range(1, steps + 1):
+                    events.append({
+                        "t": round(t + dwell * step / (steps + 1), 4),
+                        "type": "video",
+                        "position": float(step),
+                        "length": 60.0,
+                    })
+            t += dwell
+        events.append({"t": round(t, 4), "type": "end"})
+        return cls(events)
+
+
+class SimulatedEventSource(SlideShowEventSource):
+    """
+    Fires slideshow events when the replay clock reaches them, on the thread
+    that attached it (the worker thread).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = None
+
+    def attach(self, app) -> bool:
+        if not isinstance(app, SimulatedBackend):
+            return False
+        if self.is_attached_to(app):
+            return True
+        self.detach()
+        self._app = app
+        self._sink = app
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._on_due)
+        self._arm()
+        return True
+
+    def detach(self):
+        if self._timer is not None:
+            self._timer.stop()
+        super().detach()
+
+    def _arm(self):
+        backend = self._app
+        if backend is None or self._timer is None:
+            return
+        delay = backend.seconds_until_next_event()
+        if delay is not None:
+            self._timer.start(max(0, int(delay * 1000)))
+
+    def _on_due(self):
+        if self._app is not None:
+            self._app.advance()
+        self._arm()
+
+
+class SimulatedBackend(PresentationBackend):
+    """
+    In-memory presentation application that replays a SessionRecording at
+    real (speed=1) or accelerated (speed>1) pace. Controls act on the
+    simulated state, so navigation round trips work as well.
+    """
+    kind = "sim"
+
+    def __init__(self, recording=None, speed=1.0, event_driven=True):
+        super().__init__()
+        self.recording = recording or SessionRecording()
+        self.speed = max(0.001, float(speed))
+        self.event_driven = event_driven
+        self.running = False
+        self.current = 0
+        self.total = 0
+        self.rect = (0, 0, 1920, 1080)
+        self.visible = True
+        self.video = (0.0, 0.0, 0.0)
+        self.applied = []   # (due perf_counter, event)
+        self.commands = []  # (perf_counter, action, args)
+        self._cursor = 0
+        self._t0 = None
+        self._armed = False
+
+    def create_event_source(self, parent=None):
+        if not self.event_driven:
+            return None
+        return SimulatedEventSource(parent)
+
+    # --- Replay clock ---
+    def start(self):
+        """Arm the replay; the clock starts when the worker first connects."""
+        self._cursor = 0
+        self._t0 = None
+        self._armed = True
+
+    def finished(self):
+        return self._t0 is not None and self._cursor >= len(self.recording.events)
+
+    def _session_time(self):
+        if self._t0 is None:
+            return None
+        return (time.perf_counter() - self._t0) * self.speed
+
+    def seconds_until_next_event(self):
+        now = self._session_time()
+        if now is None or self._cursor >= len(self.recording.events):
+            return None
+        due = float(self.recording.events[self._cursor].get("t", 0.0))
+        return max(0.0, (due - now) / self.speed)
+
+    def advance(self):
+        now = self._session_time()
+        if now is None:
+            return
+        events = self.recording.events
+        while self._cursor < len(events) and float(events[self._cursor].get("t", 0.0)) <= now:
+            self._apply(events[self._cursor])
+            self._cursor += 1
+
+    def _apply(self, event):
+        kind = event.get("type")
+        # Stamp with the time the event was due, not when a poll picked it up.
+        due_at = self._t0 + float(event.get("t", 0.0)) / self.speed
+        self.applied.append((due_at, event))
+        if kind == "begin":
+            self.running = True
+            self.total = int(event.get("total", self.total or 1))
+            self.current = int(event.get("index", 1))
+            self.video = (0.0, 0.0, 0.0)
+            self._fire("begin")
+        elif kind == "slide":
+            self._set_slide(int(event.get("index", self.current)))
+        elif kind == "window":
+            self.rect = tuple(int(v) for v in event.get("rect", self.rect))
+        elif kind == "visible":
+            self.visible = bool(event.get("value", True))
+        elif kind == "video":
+            length = float(event.get("length", 0.0) or 0.0)
+            position = float(event.get("position", 0.0) or 0.0)
+            self.video = (position / length if length > 0 else 0.0, position, length)
+        elif kind == "end":
+            self.running = False
+            self._fire("end")
+
+    def inject(self, event):
+        """
+        Apply a recording-style event now, as if the application had just
+        done it. Like everything else on a backend it must run on the worker
+        thread (e.g. QTimer.singleShot(0, worker, ...)).
+        """
+        self._apply(dict(event, t=self._session_time() or 0.0))
+
+    def _set_slide(self, index):
+        if not self.running:
+            return
+        if index > self.total:
+            self.running = False
+            self._fire("end")
+            return
+        index = max(1, index)
+        if index != self.current:
+            self.current = index
+            self.video = (0.0, 0.0, 0.0)
+            self._fire("next")
+
+    def _fire(self, name):
+        if self.events is not None and self.events.is_attached_to(self):
+            self.events._dispatch(name)
+
+    # --- PresentationBackend ---
+    def acquire(self) -> bool:
+        if self._armed and self._t0 is None:
+            self._t0 = time.perf_counter()
+        if self.events is not None:
+            self.events.attach(self)
+        self.advance()
+        return True
+
+    def find_slideshow_window(self):
+        return self if self.running else None
+
+    def get_slide_info(self, ss_win):
+        return self.current, self.total
+
+    def get_window_rect(self, ss_win):
+        return tuple(self.rect)
+
+    def is_overlay_visible(self, ss_win, rect):
+        return self.visible
+
+    def get_video_state(self, ss_win):
+        return self.video
+
+    def _command(self, action, *args):
+        self.commands.append((time.perf_counter(), action, args))
+
+    def can_jump(self):
+        return True
+
+    def go_next(self):
+        self._command("go_next")
+        self._set_slide(self.current + 1)
+
+    def go_previous(self):
+        self._command("go_previous")
+        self._set_slide(self.current - 1)
+
+    def go_to_slide(self, index):
+        self._command("go_to_slide", index)
+        self._set_slide(int(index))
+
+    def end_show(self, handle_ink=False):
+        self._command("end_show")
+        if self.running:
+            self.running = False
+            self._fire("end")
+
+    def clear_screen(self):
+        self._command("clear_screen")
+
+    def set_pointer_type(self, pointer_type):
+        self._command("set_pointer_type", pointer_type)
+
+    def set_pen_color(self, r, g, b):
+        self._command("set_pen_color", r, g, b)
+
+    def get_slide_identity(self, index):
+        if not 1 <= index <= self.total:
+            return None
+        return "simulated", 256 + index
+
+    def export_slide(self, index, path) -> bool:
+        self._command("export_slide", index)
+        if not 1 <= index <= self.total:
+            return False
+        image = QImage(320, 180, QImage.Format_RGB32)
+        image.fill(QColor.fromHsv((index * 37) % 360, 80, 220))
+        return image.save(path, "PNG")
+
+
+def _summarize(values):
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(pct(0.5), 3),
+        "p95": round(pct(0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class ReplayHarness(QObject):
+    """
+    Replays a recording through a real PPTMonitor and measures how many
+    signals reach the main thread and how long slide changes take to arrive.
+    """
+
+    def __init__(self, recording, speed=1.0, event_driven=True, parent=None):
+        super().__init__(parent)
+        self.backend = SimulatedBackend(recording, speed, event_driven)
+        self.received = []  # (perf_counter, signal name, args)
+
+    def _record(self, name):
+        def _slot(*args):
+            self.received.append((time.perf_counter(), name, args))
+        return _slot
+
+    def run(self, grace=1.0):
+        from ppt_assistant.core.ppt_monitor import PPTMonitor
+
+        monitor = PPTMonitor(backends=[self.backend])
+        for name in (
+            "slideshow_started",
+            "slideshow_ended",
+            "slide_changed",
+            "window_geometry_changed",
+            "overlay_visibility_changed",
+            "video_state_changed",
+        ):
+            getattr(monitor, name).connect(self._record(name))
+
+        started = time.perf_counter()
+        self.backend.start()
+        monitor.start_monitoring()
+        loop = QEventLoop()
+        # Allow for the worker's first tick before the replay clock starts.
+        wall = self.backend.recording.duration / self.backend.speed + grace + 0.5
+        QTimer.singleShot(int(wall * 1000), loop.quit)
+        loop.exec()
+        tracking_mode = monitor.get_tracking_mode()
+        poll_stats = monitor.get_poll_stats()
+        monitor.stop_monitoring()
+        return self._report(time.perf_counter() - started, tracking_mode, poll_stats)
+
+    def _report(self, wall, tracking_mode, poll_stats=None):
+        counts = {}
+        for _, name, _ in self.received:
+            counts[name] = counts.get(name, 0) + 1
+
+        slide_events = []
+        for at, event in self.backend.applied:
+            if event.get("type") == "slide":
+                slide_events.append((at, int(event.get("index", 0))))
+            elif event.get("type") == "begin":
+                slide_events.append((at, int(event.get("index", 1))))
+
+        latencies = []
+        delivered = set()
+        for at, name, args in self.received:
+            if name != "slide_changed":
+                continue
+            candidates = [(t, i) for t, i in slide_events if i == args[0] and t <= at]
+            if candidates:
+                t, i = candidates[-1]
+                delivered.add((t, i))
+                latencies.append((at - t) * 1000.0)
+
+        total = len(self.received)
+        return {
+            "speed": self.backend.speed,
+            "tracking_mode": tracking_mode,
+            "session_s": self.backend.recording.duration,
+            "wall_s": round(wall, 3),
+            "signals": counts,
+            "throughput_per_s": round(total / wall, 2) if wall > 0 else 0.0,
+            "slide_latency_ms": _summarize(latencies),
+            "missed_slides": len(slide_events) - len(delivered),
+            "poll": poll_stats or {},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded presentation session headlessly.")
+    parser.add_argument("recording", nargs="?", help="session JSON; a synthetic deck is used if omitted")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--dwell", type=float, default=0.5)
+    parser.add_argument("--polling", action="store_true", help="disable simulated application events")
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    if sys.platform != "win32":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    if args.recording:
+        recording = SessionRecording.load(args.recording)
+    else:
+        recording = SessionRecording.synthetic(args.slides, args.dwell, video_slides=(2,))
+    report = ReplayHarness(recording, args.speed, not args.polling).run()
+    text = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
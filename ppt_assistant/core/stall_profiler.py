@@ -0,0 +1,118 @@
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Deepest stack kept per sample; deeper frames are cut at the root end.
+MAX_DEPTH = 64
+
+
+def collapse_frame(frame, max_depth=MAX_DEPTH):
+    """frame's stack as "root;...;leaf", each entry "file.py:function"."""
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class StallProfiler:
+    """
+    Where the UI thread spends the time when it stops responding. A
+    watchdog feeds it stack samples of the stalled thread; it aggregates
+    them in the collapsed-stack format flamegraph tools read (one
+    "frame;frame;frame count" line per distinct stack) and keeps the last
+    `max_events` stalls with their durations for crash reports.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(StallProfiler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_events=20):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._lock = threading.Lock()
+        self.stacks = collections.Counter()
+        self.events = collections.deque(maxlen=max_events)
+        self.samples = 0
+        self.output_path = os.path.join(tempfile.gettempdir(), "kazuha_ui_stalls.folded")
+
+    def sample(self, thread_id):
+        """The collapsed stack thread_id is executing right now, or None."""
+        current_frames = getattr(sys, "_current_frames", None)
+        if current_frames is None:
+            return None
+        frame = current_frames().get(thread_id)
+        if frame is None:
+            return None
+        try:
+            return collapse_frame(frame)
+        finally:
+            del frame
+
+    def record_stall(self, started, duration, stacks):
+        """
+        Record one stall: started is its wall-clock start, duration in
+        seconds, stacks the samples taken while it lasted.
+        """
+        counts = collections.Counter(s for s in stacks if s)
+        top = counts.most_common(1)
+        event = {
+            "started": started,
+            "duration_ms": round(duration * 1000.0, 1),
+            "samples": sum(counts.values()),
+            "stack": top[0][0] if top else None,
+        }
+        with self._lock:
+            self.stacks.update(counts)
+            self.samples += event["samples"]
+            self.events.append(event)
+        if counts:
+            self.write_collapsed()
+        return event
+
+    def recent_stalls(self):
+        with self._lock:
+            return list(self.events)
+
+    def collapsed_lines(self):
+        with self._lock:
+            items = self.stacks.most_common()
+        return [f"{stack} {count}" for stack, count in items]
+
+    def write_collapsed(self, path=None):
+        path = path or self.output_path
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for line in self.collapsed_lines():
+                    f.write(line + "\n")
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not write stall profile: {e}")
+
+    def format_recent(self):
+        """The recent stalls as text for a crash report; "" if there were none."""
+        events = self.recent_stalls()
+        if not events:
+            return ""
+        lines = [f"Recent UI stalls ({len(events)}, newest last; profile: {self.output_path}):"]
+        for event in events:
+            at = time.strftime("%H:%M:%S", time.localtime(event["started"]))
+            lines.append(f"  {at}  {event['duration_ms']:.0f} ms, {event['samples']} samples")
+            if event["stack"]:
+                lines.append("    " + event["stack"].replace(";", "\n    "))
+        return "\n".join(lines)
+
+
+def stall_profiler():
+    return StallProfiler()
@@ -0,0 +1,197 @@
+import importlib.abc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# main.py imports this module before anything heavy, so this is as close
+# to process start as Python code gets.
+_T0 = time.perf_counter()
+_WALL0 = time.time()
+
+# Time from launch until the tray icon exists that startup should stay under.
+TIME_TO_TRAY_TARGET_MS = 1500
+
+
+class _TimedLoader:
+    """Wraps a module loader to time create_module/exec_module."""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+        return self._profiler._timed(self._name, create, spec)
+
+    def exec_module(self, module):
+        return self._profiler._timed(self._name, self._loader.exec_module, module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+                find_spec = getattr(finder, "find_spec", None)
+                if find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+        if spec.loader is not None and not isinstance(spec.loader, _TimedLoader):
+            spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Records what startup spends its time on: every import (cumulative and
+    self time, per module), each init phase, and milestones such as the
+    splash and the tray appearing. Only collects anything after enable(),
+    which `--profile-startup` does; otherwise every call is a no-op.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(StartupProfiler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self.enabled = False
+        self.report_path = None
+        self.imports = {}
+        self.phases = []
+        self.milestones = {}
+        self._finder = None
+        self._stacks = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self, report_path=None):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.report_path = report_path or os.path.join(tempfile.gettempdir(), "kazuha_startup_profile.json")
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        self.milestone("profiler_enabled")
+
+    def stop_import_timing(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _timed(self, name, func, *args):
+        stack = getattr(self._stacks, "stack", None)
+        if stack is None:
+            stack = self._stacks.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                record = self.imports.setdefault(name, [0.0, 0.0])
+                record[0] += elapsed
+                record[1] += elapsed - children
+
+    @staticmethod
+    def since_start_ms():
+        return (time.perf_counter() - _T0) * 1000.0
+
+    def milestone(self, name):
+        if self.enabled and name not in self.milestones:
+            self.milestones[name] = self.since_start_ms()
+
+    def phase(self, name, started):
+        """Record that phase name ran from perf_counter() value started until now."""
+        if self.enabled:
+            self.phases.append((name, (time.perf_counter() - started) * 1000.0))
+
+    def report(self):
+        imports = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        top_level = [
+            item for item in imports
+            if "." not in item[0] or item[0].rsplit(".", 1)[0] not in self.imports
+        ]
+        tray = self.milestones.get("tray_ready")
+        report = {
+            "milestones_ms": {name: round(ms, 1) for name, ms in self.milestones.items()},
+            "phases_ms": [[name, round(ms, 1)] for name, ms in self.phases],
+            "import_total_ms": round(sum(v[0] for _, v in top_level) * 1000.0, 1),
+            "modules_imported": len(self.imports),
+            "slowest_imports": [
+                {"module": name, "cumulative_ms": round(v[0] * 1000.0, 1), "self_ms": round(v[1] * 1000.0, 1)}
+                for name, v in imports[:40]
+            ],
+            "time_to_tray_ms": round(tray, 1) if tray is not None else None,
+            "time_to_tray_target_ms": TIME_TO_TRAY_TARGET_MS,
+        }
+        report["met_target"] = tray is not None and tray <= TIME_TO_TRAY_TARGET_MS
+        if psutil is not None:
+            try:
+                # Interpreter start-up before this module ran.
+                created = psutil.Process().create_time()
+                report["before_python_ms"] = round(max(0.0, _WALL0 - created) * 1000.0, 1)
+            except Exception:
+                pass
+        return report
+
+    def finish(self):
+        """Write the report and print a summary; called once init is done."""
+        if not self.enabled:
+            return None
+        self.milestone("init_done")
+        self.stop_import_timing()
+        report = self.report()
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Could not write startup profile: {e}")
+        tray = report["time_to_tray_ms"]
+        print(f"Startup profile written to {self.report_path}")
+        print(f"  time to tray: {tray if tray is not None else '?'} ms (target {TIME_TO_TRAY_TARGET_MS} ms)")
+        for name, ms in report["phases_ms"]:
+            print(f"  phase {name}: {ms} ms")
+        for entry in report["slowest_imports"][:10]:
+            print(f"  import {entry['module']}: {entry['cumulative_ms']} ms (self {entry['self_ms']} ms)")
+        return report
+
+
+def startup_profiler():
+    return StartupProfiler()
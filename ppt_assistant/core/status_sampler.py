@@ -0,0 +1,354 @@
+import subprocess
+import sys
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import comtypes
+    from pycaw.pycaw import AudioUtilities
+except ImportError:
+    comtypes = None
+    AudioUtilities = None
+
+# How long stop() waits for the sampler thread before leaving it to finish
+# its current probe on its own.
+STOP_WAIT_MS = 2000
+
+
+class StatusProbe:
+    """
+    One source of system state. sample() runs on the sampler thread every
+    `interval` seconds and returns a comparable value, or None when the
+    state cannot be determined here.
+    """
+    name = ""
+    interval = 5.0
+
+    def available(self):
+        return True
+
+    def sample(self):
+        raise NotImplementedError
+
+    def reset(self):
+        """Drop handles tied to the calling thread; run as the sampler thread exits."""
+        pass
+
+
+class FunctionProbe(StatusProbe):
+    """A probe around a plain callable, e.g. a fake in tests."""
+
+    def __init__(self, name, func, interval=5.0):
+        self.name = name
+        self.interval = interval
+        self._func = func
+
+    def sample(self):
+        return self._func()
+
+
+class NetworkProbe(StatusProbe):
+    """
+    "wifi", "wired" or "offline" from the interface list. When psutil sees
+    no link, `netsh wlan` is asked, but at most once per netsh_interval;
+    in between its last answer is reused.
+    """
+    name = "network"
+    interval = 5.0
+    netsh_interval = 60.0
+
+    def __init__(self, run=None):
+        self._run = run or self._run_netsh
+        self._netsh_at = None
+        self._netsh_kind = "offline"
+        self.subprocess_calls = 0
+
+    def available(self):
+        return psutil is not None or sys.platform == "win32"
+
+    def sample(self):
+        kind = self._interface_kind()
+        if kind == "offline" and sys.platform == "win32":
+            kind = self._wlan_kind()
+        return kind
+
+    def _interface_kind(self):
+        kind = "offline"
+        if psutil is None:
+            return kind
+        try:
+            stats = psutil.net_if_stats()
+        except Exception:
+            return kind
+        up = False
+        for name, st in stats.items():
+            lname = name.lower()
+            if not st.isup or lname == "lo" or "loopback" in lname:
+                continue
+            up = True
+            if "wi-fi" in lname or "wifi" in lname or "wlan" in lname:
+                return "wifi"
+            if "ethernet" in lname or "eth" in lname or "lan" in lname:
+                kind = "wired"
+        if kind == "offline" and up:
+            kind = "wired"
+        return kind
+
+    def _wlan_kind(self):
+        now = time.monotonic()
+        if self._netsh_at is None or now - self._netsh_at >= self.netsh_interval:
+            self._netsh_at = now
+            self.subprocess_calls += 1
+            try:
+                self._netsh_kind = self._parse_netsh(self._run())
+            except Exception:
+                self._netsh_kind = "offline"
+        return self._netsh_kind
+
+    @staticmethod
+    def _parse_netsh(out):
+        # "State : connected"; "disconnected" must not count as connected.
+        for line in out.lower().splitlines():
+            key, sep, value = line.partition(":")
+            if sep and key.strip() == "state" and value.strip() == "connected":
+                return "wifi"
+        return "offline"
+
+    def _run_netsh(self):
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return subprocess.check_output(
+            ["netsh", "wlan", "show", "interfaces"],
+            encoding="utf-8",
+            errors="ignore",
+            startupinfo=startupinfo,
+            timeout=5,
+        )
+
+
+class VolumeProbe(StatusProbe):
+    """{"muted": bool, "level": 0-100} of the default output device (pycaw)."""
+    name = "volume"
+    interval = 2.0
+
+    def __init__(self):
+        # The endpoint belongs to the COM apartment of the thread that made
+        # it, so each sampler thread gets its own.
+        self._local = threading.local()
+
+    def available(self):
+        return AudioUtilities is not None
+
+    def sample(self):
+        endpoint = getattr(self._local, "endpoint", None)
+        if endpoint is None:
+            endpoint = self._local.endpoint = AudioUtilities.GetSpeakers().EndpointVolume
+        return {
+            "muted": bool(endpoint.GetMute()),
+            "level": int(round(endpoint.GetMasterVolumeLevelScalar() * 100)),
+        }
+
+    def reset(self):
+        self._local.endpoint = None
+
+
+class PowerProbe(StatusProbe):
+    """{"percent", "plugged"} of the battery, None without one."""
+    name = "power"
+    interval = 30.0
+
+    def available(self):
+        return psutil is not None and hasattr(psutil, "sensors_battery")
+
+    def sample(self):
+        battery = psutil.sensors_battery()
+        if battery is None:
+            return None
+        return {"percent": int(battery.percent), "plugged": bool(battery.power_plugged)}
+
+
+class _SamplerThread(QThread):
+    sampled = Signal(str, object)
+
+    def __init__(self, sampler):
+        super().__init__()
+        self._sampler = sampler
+        self._wake = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def run(self):
+        if comtypes is not None:
+            comtypes.CoInitialize()
+        try:
+            self._sample_until_interrupted()
+        finally:
+            for entry in self._sampler._entries():
+                try:
+                    entry["probe"].reset()
+                except Exception as e:
+                    print(f"Status probe {entry['probe'].name} reset failed: {e}")
+            if comtypes is not None:
+                comtypes.CoUninitialize()
+
+    def _sample_until_interrupted(self):
+        while not self.isInterruptionRequested():
+            now = time.monotonic()
+            next_due = now + 1.0
+            for entry in self._sampler._entries():
+                if self.isInterruptionRequested():
+                    return
+                if entry["due"] <= now:
+                    self.sampled.emit(entry["probe"].name, self._sampler._run_probe(entry))
+                    entry["due"] = now + entry["probe"].interval
+                next_due = min(next_due, entry["due"])
+            self._wake.wait(max(0.0, next_due - time.monotonic()))
+            self._wake.clear()
+
+
+class StatusSampler(QObject):
+    """
+    App-wide owner of the system status probes (network, volume, power).
+    Probes run on one background thread; `changed` is emitted on the
+    main thread, and only when a probe's value differs from the last one.
+    """
+    changed = Signal(str, object)  # probe name, value
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(StatusSampler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        super().__init__()
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._probes = {}
+        self._values = {}
+        self._subscribers = []
+        self._thread = None
+        # Threads stop() gave up waiting for, kept until they finish.
+        self._stopping = []
+        self.samples = {}
+        self.errors = {}
+        self.changes = {}
+
+    def register(self, probe):
+        if not probe.available():
+            return False
+        with self._lock:
+            self._probes[probe.name] = {"probe": probe, "due": 0.0}
+        if self._thread is not None:
+            self._thread.wake()
+        return True
+
+    def unregister(self, name):
+        with self._lock:
+            self._probes.pop(name, None)
+        self._values.pop(name, None)
+
+    def install_default_probes(self):
+        for probe in (NetworkProbe(), VolumeProbe(), PowerProbe()):
+            if probe.name not in self._probes:
+                self.register(probe)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if not self._probes:
+            self.install_default_probes()
+        self._thread = _SamplerThread(self)
+        self._thread.sampled.connect(self._on_sampled)
+        self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        thread.sampled.disconnect(self._on_sampled)
+        thread.requestInterruption()
+        thread.wake()
+        if not thread.wait(STOP_WAIT_MS):
+            # Still inside a probe (e.g. netsh); destroying a running
+            # QThread aborts, so keep it until it is done.
+            self._stopping.append(thread)
+            thread.finished.connect(self._on_stopped_thread_finished)
+
+    @Slot()
+    def _on_stopped_thread_finished(self):
+        self._stopping = [t for t in self._stopping if not t.isFinished()]
+
+    def value(self, name, default=None):
+        return self._values.get(name, default)
+
+    def subscribe(self, handler, names=None):
+        """handler(name, value) on changes to the given probes (all if None)."""
+        self._subscribers.append((handler, set(names) if names else None))
+
+    def unsubscribe(self, handler):
+        self._subscribers = [(h, n) for h, n in self._subscribers if h != handler]
+
+    def sample_now(self, name=None):
+        """Run probes synchronously on the calling thread (tests, startup)."""
+        for entry in self._entries():
+            if name is None or entry["probe"].name == name:
+                self._on_sampled(entry["probe"].name, self._run_probe(entry))
+
+    def _entries(self):
+        with self._lock:
+            return list(self._probes.values())
+
+    def _run_probe(self, entry):
+        probe = entry["probe"]
+        self.samples[probe.name] = self.samples.get(probe.name, 0) + 1
+        try:
+            return probe.sample()
+        except Exception as e:
+            self.errors[probe.name] = self.errors.get(probe.name, 0) + 1
+            if self.errors[probe.name] == 1:
+                print(f"Status probe {probe.name} failed: {e}")
+            return None
+
+    def _on_sampled(self, name, value):
+        if name not in self._probes:
+            return
+        if name in self._values and self._values[name] == value:
+            return
+        self._values[name] = value
+        self.changes[name] = self.changes.get(name, 0) + 1
+        self.changed.emit(name, value)
+        for handler, names in list(self._subscribers):
+            if names is None or name in names:
+                try:
+                    handler(name, value)
+                except Exception as e:
+                    print(f"Status subscriber failed: {e}")
+
+    def stats(self):
+        stats = {
+            "samples": dict(self.samples),
+            "changes": dict(self.changes),
+            "errors": dict(self.errors),
+            "stopping_threads": len(self._stopping),
+        }
+        network = self._probes.get("network", {}).get("probe")
+        if isinstance(network, NetworkProbe):
+            stats["subprocess_calls"] = network.subprocess_calls
+        return stats
+
+
+def status_sampler():
+    return StatusSampler()
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+
+THUMB_DIR = os.path.join(tempfile.gettempdir(), "kazuha_ppt_thumbs")
+
+
+class ThumbnailCache:
+    """
+    On-disk slide thumbnails keyed by presentation path, last-modified time
+    and SlideID, so files survive across popups and sessions and never
+    collide between presentations. Total size is bounded; the least recently
+    used files are evicted first.
+    """
+
+    def __init__(self, root=THUMB_DIR, max_bytes=64 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Unsaved presentations have no mtime; only trust them this session.
+        self._session = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._stores_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evicted = 0
+        try:
+            os.makedirs(self.root, exist_ok=True)
+        except Exception:
+            pass
+
+    def _key(self, presentation, slide_id):
+        try:
+            version = repr(os.path.getmtime(presentation)) if os.path.isfile(presentation) else self._session
+        except Exception:
+            version = self._session
+        raw = f"{presentation}|{version}|{slide_id}"
+        return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()
+
+    def path_for(self, presentation, slide_id):
+        return os.path.join(self.root, self._key(presentation, slide_id) + ".png")
+
+    def lookup(self, presentation, slide_id):
+        """Return the cached PNG path, or None if it has to be exported."""
+        path = self.path_for(presentation, slide_id)
+        try:
+            if os.path.getsize(path) > 0:
+                os.utime(path, None)
+                with self._lock:
+                    self.hits += 1
+                return path
+        except OSError:
+            pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def stored(self, path):
+        with self._lock:
+            self.stores += 1
+            self._stores_since_evict += 1
+            due = self._stores_since_evict >= 16
+        if due:
+            self.evict()
+
+    def evict(self):
+        with self._lock:
+            self._stores_since_evict = 0
+        try:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.root):
+                if not entry.is_file() or not entry.name.endswith(".png"):
+                    continue
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        except Exception:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except Exception:
+                continue
+            total -= size
+            with self._lock:
+                self.evicted += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evicted": self.evicted,
+            }
+
+
+class ThumbnailQueue:
+    """
+    Pending thumbnail requests, nearest to the current slide first. A new
+    request replaces the old one, and at most max_pending slides are kept.
+    """
+
+    def __init__(self, max_pending=128):
+        self.max_pending = max_pending
+        self._pending = []
+        self.dropped = 0
+
+    def submit(self, indices, current):
+        ordered = sorted(set(int(i) for i in indices), key=lambda i: (abs(i - current), i))
+        self.dropped += max(0, len(ordered) - self.max_pending)
+        self._pending = ordered[:self.max_pending]
+
+    def pop(self):
+        if not self._pending:
+            return None
+        return self._pending.pop(0)
+
+    def clear(self):
+        self._pending = []
+
+    def __len__(self):
+        return len(self._pending)
@@ -1,10 +1,157 @@
-from PySide6.QtCore import QObject, QTimer, Signal, Slot
+import math
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot, Qt
+
+DEFAULT = "default"
+
+# Wakeups can land a little early; values this close to a boundary count
+# as having reached it.
+_EPSILON = 1e-3
+
+
+class Countdown:
+    """Counts down to a monotonic deadline; nothing is accumulated per tick."""
+    kind = "countdown"
+
+    def __init__(self, name, seconds=0.0, resolution=1.0):
+        self.name = name
+        self.resolution = resolution
+        self.total = float(seconds)
+        self.deadline = None
+        self._remaining = float(seconds)
+
+    @property
+    def running(self):
+        return self.deadline is not None
+
+    def value(self, now):
+        if self.deadline is None:
+            return self._remaining
+        return max(0.0, self.deadline - now)
+
+    def display(self, now):
+        return max(0, math.ceil(self.value(now) - _EPSILON))
+
+    def start(self, now, seconds):
+        self.total = self._remaining = float(seconds)
+        self.deadline = now + self._remaining if self._remaining > 0 else None
+
+    def pause(self, now):
+        self._remaining = self.value(now)
+        self.deadline = None
+
+    def resume(self, now):
+        if self.deadline is None and self._remaining > 0:
+            self.deadline = now + self._remaining
+
+    def reset(self):
+        self._remaining = 0.0
+        self.deadline = None
+
+    def next_wake(self, now):
+        step = self.resolution
+        boundary = max(0, math.ceil((self.value(now) - _EPSILON) / step) - 1)
+        return self.deadline - boundary * step
+
+    def to_dict(self, now, wall):
+        data = {"kind": self.kind, "total": self.total, "resolution": self.resolution}
+        if self.running:
+            data["deadline_wall"] = wall + (self.deadline - now)
+        else:
+            data["remaining"] = self._remaining
+        return data
+
+    @classmethod
+    def from_dict(cls, name, data, now, wall):
+        timer = cls(name, data.get("remaining", 0.0), data.get("resolution", 1.0))
+        timer.total = float(data.get("total", timer.total))
+        if "deadline_wall" in data:
+            timer._remaining = max(0.0, float(data["deadline_wall"]) - wall)
+            timer.resume(now)
+        return timer
+
+
+class Stopwatch:
+    """Counts up from a monotonic start time."""
+    kind = "stopwatch"
+
+    def __init__(self, name, resolution=1.0):
+        self.name = name
+        self.resolution = resolution
+        self.started_at = None
+        self._accumulated = 0.0
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def value(self, now):
+        if self.started_at is None:
+            return self._accumulated
+        return self._accumulated + (now - self.started_at)
+
+    def display(self, now):
+        return int(math.floor(self.value(now) + _EPSILON))
+
+    def start(self, now, seconds=0.0):
+        self._accumulated = float(seconds)
+        self.started_at = now
+
+    def pause(self, now):
+        self._accumulated = self.value(now)
+        self.started_at = None
+
+    def resume(self, now):
+        if self.started_at is None:
+            self.started_at = now
+
+    def reset(self):
+        self._accumulated = 0.0
+        self.started_at = None
+
+    def next_wake(self, now):
+        step = self.resolution
+        boundary = math.floor((self.value(now) + _EPSILON) / step) + 1
+        return self.started_at + boundary * step - self._accumulated
+
+    def to_dict(self, now, wall):
+        data = {"kind": self.kind, "resolution": self.resolution, "elapsed": self.value(now)}
+        if self.running:
+            data["started_wall"] = wall - (now - self.started_at) - self._accumulated
+        return data
+
+    @classmethod
+    def from_dict(cls, name, data, now, wall):
+        timer = cls(name, data.get("resolution", 1.0))
+        if "started_wall" in data:
+            timer._accumulated = max(0.0, wall - float(data["started_wall"]))
+            timer.started_at = now
+        else:
+            timer._accumulated = float(data.get("elapsed", 0.0))
+        return timer
+
+
+_KINDS = {Countdown.kind: Countdown, Stopwatch.kind: Stopwatch}
+
 
 class TimerManager(QObject):
+    """
+    Named countdowns and stopwatches. The one called DEFAULT is the
+    classroom countdown behind start()/pause()/..., updated, finished and
+    state_changed. Values are computed from monotonic timestamps, so a
+    stalled event loop delays a repaint but never slows the clock, and a
+    single timer wakes the process only at the next boundary (whole
+    seconds unless set_resolution() asks for finer) of any running timer.
+    """
     updated = Signal(int)  # remaining seconds
     finished = Signal()
     state_changed = Signal(bool) # is_running
 
+    timer_updated = Signal(str, float)  # name, remaining or elapsed seconds
+    timer_finished = Signal(str)
+    timer_state_changed = Signal(str, bool)
+
     _instance = None
 
     def __new__(cls):
@@ -18,65 +165,215 @@ class TimerManager(QObject):
             return
         super().__init__()
         self._initialized = True
-        self.remaining_seconds = 0
-        self.is_running = False
+        self._timers = {DEFAULT: Countdown(DEFAULT)}
+        self._shown = {}
         self.timer = QTimer()
-        self.timer.setInterval(100)
-        self.timer.timeout.connect(self._tick)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_wakeup)
+        self.wakeups = 0
+
+    # The classroom countdown.
+
+    @property
+    def remaining_seconds(self):
+        return self._timers[DEFAULT].value(time.monotonic())
+
+    @property
+    def is_running(self):
+        return self._timers[DEFAULT].running
 
     @Slot(int)
     def start(self, seconds):
-        self.remaining_seconds = float(seconds)
-        self.is_running = True
-        self.timer.start()
-        self.state_changed.emit(True)
-        self.updated.emit(int(self.remaining_seconds))
+        self.start_countdown(DEFAULT, seconds)
 
     @Slot()
     def pause(self):
-        self.is_running = False
-        self.timer.stop()
-        self.state_changed.emit(False)
+        self.pause_timer(DEFAULT)
 
     @Slot()
     def resume(self):
-        if self.remaining_seconds > 0:
-            self.is_running = True
-            self.timer.start()
-            self.state_changed.emit(True)
+        self.resume_timer(DEFAULT)
 
     @Slot()
     def stop(self):
-        self.remaining_seconds = 0
-        self.is_running = False
-        self.timer.stop()
-        self.state_changed.emit(False)
-        self.updated.emit(0)
+        self.stop_timer(DEFAULT)
 
     @Slot()
     def finish(self):
         should_emit = self.is_running or self.remaining_seconds > 0
         self.stop()
         if should_emit:
-            self.finished.emit()
-
-    def _tick(self):
-        if self.remaining_seconds > 0:
-            self.remaining_seconds -= 0.1
-            if self.remaining_seconds <= 0:
-                self.remaining_seconds = 0
-                self.stop()
-                self.finished.emit()
-            else:
-                self.updated.emit(int(self.remaining_seconds))
-        else:
-            self.stop()
+            self._emit_finished(DEFAULT)
 
-    def get_remaining_time_str(self):
-        val = int(self.remaining_seconds)
+    def get_remaining_time_str(self, name=DEFAULT):
+        val = self.display_seconds(name)
         hours = val // 3600
         minutes = (val % 3600) // 60
         seconds = val % 60
         if hours > 0:
             return f"{hours:02}:{minutes:02}:{seconds:02}"
         return f"{minutes:02}:{seconds:02}"
+
+    # Named timers.
+
+    def start_countdown(self, name, seconds, resolution=None):
+        return self._start(Countdown, name, seconds, resolution)
+
+    def start_stopwatch(self, name, resolution=None):
+        return self._start(Stopwatch, name, 0.0, resolution)
+
+    def _start(self, cls, name, seconds, resolution):
+        timer = self._timers.get(name)
+        if not isinstance(timer, cls):
+            if name == DEFAULT:
+                raise ValueError("the default timer is a countdown")
+            timer = self._timers[name] = cls(name)
+        if resolution is not None:
+            timer.resolution = float(resolution)
+        timer.start(time.monotonic(), seconds)
+        self._emit_state(name)
+        self._emit_value(name, force=True)
+        self._schedule()
+        return timer
+
+    def pause_timer(self, name):
+        timer = self._timers.get(name)
+        if timer is None:
+            return
+        timer.pause(time.monotonic())
+        self._emit_state(name)
+        self._schedule()
+
+    def resume_timer(self, name):
+        timer = self._timers.get(name)
+        if timer is None or timer.running:
+            return
+        timer.resume(time.monotonic())
+        if not timer.running:
+            # A countdown with nothing left.
+            return
+        self._emit_state(name)
+        self._schedule()
+
+    def stop_timer(self, name):
+        timer = self._timers.get(name)
+        if timer is None:
+            return
+        timer.reset()
+        self._emit_state(name)
+        self._emit_value(name, force=True)
+        self._schedule()
+
+    def remove_timer(self, name):
+        if name == DEFAULT:
+            self.stop_timer(name)
+            return
+        if self._timers.pop(name, None) is not None:
+            self._shown.pop(name, None)
+            self._schedule()
+
+    def set_resolution(self, name, seconds):
+        """Wake every `seconds` for name instead of every whole second."""
+        timer = self._timers.get(name)
+        if timer is not None:
+            timer.resolution = max(0.01, float(seconds))
+            self._schedule()
+
+    def timers(self):
+        return list(self._timers)
+
+    def kind(self, name):
+        timer = self._timers.get(name)
+        return timer.kind if timer is not None else None
+
+    def value(self, name):
+        """Remaining seconds of a countdown or elapsed seconds of a stopwatch."""
+        timer = self._timers.get(name)
+        return timer.value(time.monotonic()) if timer is not None else 0.0
+
+    def display_seconds(self, name=DEFAULT):
+        timer = self._timers.get(name)
+        return timer.display(time.monotonic()) if timer is not None else 0
+
+    def running(self, name):
+        timer = self._timers.get(name)
+        return timer is not None and timer.running
+
+    # Serialisation, so a restarted process or a child window carries on
+    # from the same instant. Running timers are stored against the wall
+    # clock, since monotonic time means nothing in another process.
+
+    def state(self):
+        now = time.monotonic()
+        wall = time.time()
+        return {
+            "saved_at": wall,
+            "timers": {name: timer.to_dict(now, wall) for name, timer in self._timers.items()},
+        }
+
+    def restore(self, state):
+        timers = (state or {}).get("timers") or {}
+        now = time.monotonic()
+        wall = time.time()
+        expired = []
+        for name, data in timers.items():
+            cls = _KINDS.get((data or {}).get("kind"))
+            if cls is None or (name == DEFAULT and cls is not Countdown):
+                continue
+            timer = cls.from_dict(name, data, now, wall)
+            if cls is Countdown and "deadline_wall" in data and not timer.running:
+                # Ran out while nobody was watching.
+                expired.append(name)
+            self._timers[name] = timer
+            self._emit_state(name)
+            self._emit_value(name, force=True)
+        for name in expired:
+            self._emit_finished(name)
+        self._schedule()
+
+    # Wakeups.
+
+    def _schedule(self):
+        now = time.monotonic()
+        wakes = [timer.next_wake(now) for timer in self._timers.values() if timer.running]
+        if not wakes:
+            self.timer.stop()
+            return
+        self.timer.start(max(0, math.ceil((min(wakes) - now) * 1000)))
+
+    def _on_wakeup(self):
+        self.wakeups += 1
+        now = time.monotonic()
+        for name, timer in list(self._timers.items()):
+            if not timer.running:
+                continue
+            if timer.kind == Countdown.kind and timer.value(now) <= _EPSILON:
+                timer.reset()
+                self._emit_state(name)
+                self._emit_value(name, force=True)
+                self._emit_finished(name)
+            else:
+                self._emit_value(name)
+        self._schedule()
+
+    def _emit_value(self, name, force=False):
+        timer = self._timers[name]
+        now = time.monotonic()
+        self.timer_updated.emit(name, timer.value(now))
+        if name == DEFAULT:
+            shown = timer.display(now)
+            if force or shown != self._shown.get(name):
+                self._shown[name] = shown
+                self.updated.emit(shown)
+
+    def _emit_state(self, name):
+        running = self._timers[name].running
+        self.timer_state_changed.emit(name, running)
+        if name == DEFAULT:
+            self.state_changed.emit(running)
+
+    def _emit_finished(self, name):
+        self.timer_finished.emit(name)
+        if name == DEFAULT:
+            self.finished.emit()
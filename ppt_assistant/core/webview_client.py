@@ -0,0 +1,190 @@
+import os
+import subprocess
+import sys
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ppt_assistant.core import ipc
+from ppt_assistant.core.config import SETTINGS_PATH
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class WebviewHostClient(QObject):
+    """
+    Talks to the webview host process (plugins/webview_host.py). start()
+    launches it in the background; it connects back to the message hub
+    and says webview.hello. open() then shows a window in the
+    already-running Chromium instead of starting a new interpreter. Until
+    start() has been called, open() returns False and callers launch
+    their own process as before.
+    """
+    window_opened = Signal(str, float)  # id, ms from request to shown
+    window_closed = Signal(str)
+
+    connect_timeout_ms = 20000
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(WebviewHostClient, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        super().__init__()
+        self._initialized = True
+        self._process = None
+        self._channel = None
+        self._queue = []
+        self._started_at = None
+        self._start_timeout = QTimer(self)
+        self._start_timeout.setSingleShot(True)
+        self._start_timeout.setInterval(self.connect_timeout_ms)
+        self._start_timeout.timeout.connect(self._on_start_timeout)
+        ipc.message_hub().event_received.connect(self._on_hub_event)
+        self.ready_ms = None
+        self.opens = 0
+        self.reused = 0
+        self.open_ms = []
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        if self.running:
+            return True
+        hub = ipc.message_hub()
+        if not hub.listening:
+            return False
+        hub.handle("webview.hello", self._on_hello)
+        if getattr(sys, "frozen", False):
+            cmd = [sys.executable, "--webview-host"]
+        else:
+            cmd = [sys.executable, os.path.join(ROOT_DIR, "main.py"), "--webview-host"]
+        env = hub.child_env()
+        env["SETTINGS_PATH"] = SETTINGS_PATH
+        try:
+            self._process = subprocess.Popen(cmd, env=env)
+        except Exception as e:
+            print(f"Failed to start webview host: {e}")
+            self._process = None
+            return False
+        self._started_at = time.perf_counter()
+        self._start_timeout.start()
+        return True
+
+    def stop(self):
+        self._start_timeout.stop()
+        if self._channel is not None and self._channel.connected:
+            self._channel.request("webview.quit")
+            self._channel.wait_for_bytes_written()
+        if self.running:
+            try:
+                self._process.wait(timeout=2)
+            except Exception:
+                self._process.terminate()
+        self._process = None
+        self._channel = None
+
+    def _on_hello(self, params, channel):
+        self._start_timeout.stop()
+        self._channel = channel
+        channel.closed.connect(self._on_channel_closed)
+        self.ready_ms = (time.perf_counter() - self._started_at) * 1000.0 if self._started_at else None
+        queue, self._queue = self._queue, []
+        for op, spec, callback in queue:
+            channel.request(op, spec, callback)
+        return {"ok": True}
+
+    def _on_start_timeout(self):
+        if self._channel is not None:
+            return
+        if self.running:
+            print("Webview host did not come up; falling back to separate processes.")
+            self._process.terminate()
+        self._process = None
+        self._queue.clear()
+
+    def _on_channel_closed(self):
+        self._channel = None
+        if self._process is not None and self._process.poll() is not None:
+            self._process = None
+
+    def _request(self, op, spec, callback=None):
+        if self._channel is not None and self._channel.connected:
+            self._channel.request(op, spec, callback)
+        else:
+            self._queue.append((op, spec, callback))
+
+    def open(self, window_id, url, title, width, height, custom_border=False, env=None, reload=False):
+        """
+        Show window_id in the host, creating it on first use. Returns False
+        when the host is not available so the caller can launch its own
+        process.
+        """
+        if self._process is None:
+            return False
+        if not self.running:
+            # Crashed since; bring it back and let this request wait for it.
+            self._channel = None
+            if not self.start():
+                return False
+        requested = time.perf_counter()
+        spec = {
+            "id": window_id,
+            "url": url,
+            "title": title,
+            "width": int(width),
+            "height": int(height),
+            "custom_border": bool(custom_border),
+            "env": env or {},
+            "reload": bool(reload),
+        }
+        self._request("webview.open", spec, lambda result, error: self._on_opened(window_id, requested, result, error))
+        return True
+
+    def hide(self, window_id):
+        if self._process is not None:
+            self._request("webview.hide", {"id": window_id})
+
+    def _on_opened(self, window_id, requested, result, error):
+        if error:
+            print(f"Webview {window_id} failed to open: {error}")
+            return
+        elapsed_ms = (time.perf_counter() - requested) * 1000.0
+        reused = bool((result or {}).get("reused"))
+        self.opens += 1
+        if reused:
+            self.reused += 1
+        self.open_ms.append(elapsed_ms)
+        del self.open_ms[:-64]
+        print(f"Webview {window_id} opened in {elapsed_ms:.0f} ms ({'reused' if reused else 'new'} window)")
+        self.window_opened.emit(window_id, elapsed_ms)
+
+    def _on_hub_event(self, channel, name, data):
+        if channel is not self._channel:
+            return
+        if name in ("window.hidden", "window.closed"):
+            self.window_closed.emit((data or {}).get("id", ""))
+
+    def stats(self):
+        latest = self.open_ms[-1] if self.open_ms else None
+        avg = sum(self.open_ms) / len(self.open_ms) if self.open_ms else None
+        return {
+            "running": self.running,
+            "ready_ms": self.ready_ms,
+            "opens": self.opens,
+            "reused": self.reused,
+            "last_open_ms": latest,
+            "avg_open_ms": avg,
+        }
+
+
+def webview_host():
+    return WebviewHostClient()
@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QFrame, QApplication, QLabel, QPushButton, QSwipeGesture, QGestureEvent, QGridLayout, QStyleOption, QStyle, QGraphicsDropShadowEffect, QMenu
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QFrame, QApplication, QLabel, QPushButton, QSwipeGesture, QGestureEvent, QGridLayout, QStyleOption, QStyle, QGraphicsDropShadowEffect, QMenu, QAbstractItemView
 from PySide6.QtCore import Qt, Signal, QSize, QPoint, QEvent, QTimer, QTime, QDateTime, QLocale, QThread, QObject, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QRect
 from PySide6.QtGui import QColor, QIcon, QPainter, QBrush, QPen, QPixmap, QGuiApplication, QFont, QPalette, QLinearGradient, QAction, QRegion
 from PySide6.QtSvg import QSvgRenderer
@@ -7,70 +7,52 @@ import importlib.util
 import sys
 import tempfile
 import json
-import subprocess
 import time
 import math
+import threading
 import shiboken6
 from ppt_assistant.core.config import cfg, SETTINGS_PATH
+from ppt_assistant.core.settings_store import settings_store
 from ppt_assistant.core.timer_manager import TimerManager
+from ppt_assistant.core.status_sampler import status_sampler
+from ppt_assistant.core.stall_profiler import stall_profiler
+from ppt_assistant.core.metrics import metrics, timed
 from qfluentwidgets import FluentWidget, FluentIcon as FIF, BodyLabel, IconWidget, themeColor, Theme, isDarkTheme
 from ppt_assistant.core.theme_data import THEMES
-
-try:
-    import psutil
-except ImportError:
-    psutil = None
+from ppt_assistant.ui.slide_strip import (
+    SlideStripView, SlideStripModel, SlideCardDelegate,
+    CARD_SIZE as SLIDE_CARD_SIZE, CARD_SPACING as SLIDE_CARD_SPACING,
+)
 
 ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "icons")
 PLUGIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "plugins", "builtins")
 
 
 def _load_language():
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data.get("General", {}).get("Language", "zh-CN")
-    except Exception:
-        return "zh-CN"
-    return "zh-CN"
+    return settings_store().get("General", "Language", "zh-CN")
 
 
 def _get_overlay_font_stack():
     base = "'SF Pro', '苹方-简', 'PingFang SC', 'MiSans Latin', 'Segoe UI', 'Microsoft YaHei', sans-serif"
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            lang = data.get("General", {}).get("Language", "zh-CN")
-            fonts = data.get("Fonts", {}) or {}
-            profiles = fonts.get("Profiles", {}) or {}
-            lang_profile = profiles.get(lang, {}) or {}
-            v = lang_profile.get("overlay") or lang_profile.get("qt") or ""
-            if isinstance(v, str):
-                v = v.strip()
-            else:
-                v = ""
-            if not v:
-                return base
-            safe = v.replace("'", "\\'")
-            return f"'{safe}', {base}"
-    except Exception:
+    store = settings_store()
+    lang = store.get("General", "Language", "zh-CN")
+    profiles = store.section("Fonts").get("Profiles", {}) or {}
+    lang_profile = profiles.get(lang, {}) or {}
+    v = lang_profile.get("overlay") or lang_profile.get("qt") or ""
+    if isinstance(v, str):
+        v = v.strip()
+    else:
+        v = ""
+    if not v:
         return base
-    return base
+    safe = v.replace("'", "\\'")
+    return f"'{safe}', {base}"
 
 
 LANGUAGE = _load_language()
 
 def _get_theme_mode():
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return (data.get("Appearance", {}) or {}).get("ThemeMode", cfg.themeMode.value)
-    except Exception:
-        return cfg.themeMode.value
-    return cfg.themeMode.value
+    return settings_store().get("Appearance", "ThemeMode", cfg.themeMode.value)
 
 def _resolve_is_light():
     mode = _get_theme_mode()
@@ -84,26 +66,11 @@ def _resolve_is_light():
     return mode_str == "light"
 
 def _get_theme_id():
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return (data.get("Appearance", {}) or {}).get("ThemeId", "default")
-    except Exception:
-        return "default"
-    return "default"
+    return settings_store().get("Appearance", "ThemeId", "default")
 
 def _get_monet_palette():
-    try:
-        if os.path.exists(SETTINGS_PATH):
-            with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            palette = (data.get("Appearance", {}) or {}).get("MonetPalette")
-            if isinstance(palette, dict):
-                return palette
-    except Exception:
-        return None
-    return None
+    palette = settings_store().get("Appearance", "MonetPalette")
+    return palette if isinstance(palette, dict) else None
 
 def _hex_to_rgb(hex_value):
     if not hex_value:
@@ -222,12 +189,10 @@ def _parse_color(value, fallback=None):
         return c
     return fallback if isinstance(fallback, QColor) else QColor(fallback or "#000000")
 
-def _get_palette(is_light=False):
-    theme_id = _get_theme_id()
+def _build_palette(theme_id, is_light, monet_palette):
     variant = "light" if is_light else "dark"
     
     if str(theme_id).lower() == "monet":
-        monet_palette = _get_monet_palette()
         monet_theme = _build_monet_palette(monet_palette, is_light)
         if monet_theme:
             return monet_theme
@@ -272,9 +237,71 @@ def _get_palette(is_light=False):
         "dev_watermark": g("dev_watermark")
     }
 
+
+class _ResolvedPalette:
+    """One theme variant with its colours parsed and stylesheet-ready."""
+
+    def __init__(self, values):
+        self.values = values
+        self.colors = {}
+        self.css = {}
+        for key, value in values.items():
+            if not value:
+                continue
+            color = _parse_color(value)
+            self.colors[key] = color
+            self.css[key] = value if isinstance(value, str) else \
+                f"rgba({color.red()}, {color.green()}, {color.blue()}, {round(color.alphaF(), 3)})"
+
+
+_PALETTE_CACHE = {}
+_palette_source = {"version": None, "theme_id": None, "monet": None, "monet_key": None}
+
+
+def _palette_key(is_light):
+    # Theme settings are re-read only when the settings snapshot changes.
+    store = settings_store()
+    store.snapshot()
+    src = _palette_source
+    if src["version"] != store.version:
+        src["version"] = store.version
+        src["theme_id"] = _get_theme_id()
+        monet = _get_monet_palette() if str(src["theme_id"]).lower() == "monet" else None
+        src["monet"] = monet
+        src["monet_key"] = json.dumps(monet, sort_keys=True) if monet else None
+    return (src["theme_id"], bool(is_light), src["monet_key"])
+
+
+def _resolve_palette(is_light=False):
+    key = _palette_key(is_light)
+    resolved = _PALETTE_CACHE.get(key)
+    if resolved is None:
+        if len(_PALETTE_CACHE) >= 16:
+            _PALETTE_CACHE.clear()
+        resolved = _ResolvedPalette(_build_palette(key[0], is_light, _palette_source["monet"]))
+        _PALETTE_CACHE[key] = resolved
+    return resolved
+
+
+def _get_palette(is_light=False):
+    return _resolve_palette(is_light).values
+
+
 def _p(key, is_light=False):
-    pal = _get_palette(is_light)
-    return pal.get(key)
+    return _resolve_palette(is_light).values.get(key)
+
+
+def _pc(key, is_light=False, fallback=None):
+    """Palette colour as a QColor (a copy, safe to modify)."""
+    color = _resolve_palette(is_light).colors.get(key)
+    if color is None:
+        return _parse_color(fallback) if fallback is not None else QColor("#000000")
+    return QColor(color)
+
+
+def _pcss(key, is_light=False, fallback=""):
+    """Palette colour as a stylesheet value."""
+    return _resolve_palette(is_light).css.get(key) or fallback
 
 _TRANSLATIONS = {
     "zh-CN": {
@@ -403,6 +430,69 @@ def _t(key: str) -> str:
     return default.get(key, key)
 
 
+def reload_language():
+    """Re-read the UI language for _t() without reloading this module."""
+    global LANGUAGE
+    LANGUAGE = _load_language()
+    return LANGUAGE
+
+
+# What each setting asks of a live overlay. Keys with key None cover the
+# whole section.
+_DELTA_STEPS = {
+    ("Appearance", "ThemeMode"): ("restyle",),
+    ("Appearance", "ThemeId"): ("restyle",),
+    ("Appearance", "MonetPalette"): ("restyle",),
+    ("General", "Language"): ("retranslate", "restyle"),
+    ("Fonts", None): ("restyle",),
+    ("Overlay", "Scale"): ("restyle", "relayout"),
+    ("Overlay", "SafeArea"): ("relayout",),
+    ("Toolbar", "ShowToolbarText"): ("restyle", "relayout"),
+    ("Toolbar", "ShowClear"): ("reorder",),
+    ("Toolbar", "ShowSpotlight"): ("reorder",),
+    ("Toolbar", "ShowTimer"): ("reorder",),
+    ("Toolbar", "ToolbarOrder"): ("reorder",),
+}
+
+
+class OverlayDelta:
+    """
+    A settings change as the overlay sees it: restyle (colours, fonts),
+    relayout (sizes, margins), retranslate (texts) and reorder (toolbar
+    items). rebuild means it can only be applied by a new OverlayWindow.
+    """
+    STEPS = ("restyle", "relayout", "retranslate", "reorder", "rebuild")
+
+    def __init__(self, restyle=False, relayout=False, retranslate=False, reorder=False, rebuild=False):
+        self.restyle = restyle
+        self.relayout = relayout
+        self.retranslate = retranslate
+        self.reorder = reorder
+        self.rebuild = rebuild
+
+    @classmethod
+    def from_change(cls, change):
+        delta = cls()
+        for section, key in change.changes:
+            steps = _DELTA_STEPS.get((section, key)) or _DELTA_STEPS.get((section, None)) or ()
+            for step in steps:
+                setattr(delta, step, True)
+        if change.value("Overlay", "RecreateOverlayAt"):
+            delta.rebuild = True
+        return delta
+
+    def merged(self, other):
+        if other is None:
+            return self
+        return OverlayDelta(**{step: getattr(self, step) or getattr(other, step) for step in self.STEPS})
+
+    def __bool__(self):
+        return any(getattr(self, step) for step in self.STEPS)
+
+    def __repr__(self):
+        return "OverlayDelta(%s)" % ", ".join(step for step in self.STEPS if getattr(self, step))
+
+
 class GlobalIconCache:
     _cache = {}
 
@@ -414,49 +504,6 @@ class GlobalIconCache:
     def set(cls, key, pixmap):
         cls._cache[key] = pixmap
 
-class NetworkCheckThread(QThread):
-    status_changed = Signal(str)
-
-    def run(self):
-        while not self.isInterruptionRequested():
-            kind = "offline"
-            if psutil is not None:
-                try:
-                    stats = psutil.net_if_stats()
-                    for name, st in stats.items():
-                        if not st.isup:
-                            continue
-                        lname = name.lower()
-                        if "wi-fi" in lname or "wifi" in lname or "wlan" in lname:
-                            kind = "wifi"
-                            break
-                        if "ethernet" in lname or "eth" in lname or "lan" in lname:
-                            kind = "wired"
-                    if kind == "offline" and any(st.isup for st in stats.values()):
-                        kind = "wired"
-                except Exception:
-                    pass
-            
-            if kind == "offline":
-                try:
-                    # Non-blocking check in thread
-                    if sys.platform == "win32":
-                        startupinfo = subprocess.STARTUPINFO()
-                        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                        out = subprocess.check_output(
-                            ["netsh", "wlan", "show", "interfaces"],
-                            encoding="utf-8",
-                            errors="ignore",
-                            startupinfo=startupinfo
-                        )
-                        if "state" in out.lower() and "connected" in out.lower():
-                            kind = "wifi"
-                except Exception:
-                    pass
-            
-            self.status_changed.emit(kind)
-            self.sleep(5)
-
 class StatusBarWidget(QFrame):
     is_light_changed = Signal(bool)
 
@@ -469,51 +516,102 @@ class StatusBarWidget(QFrame):
         self._network_kind = "offline"
         self._volume_supported = False
         self._timer_manager = TimerManager()
+        # Last value written to each field, and how often each was written,
+        # skipped as unchanged, and painted.
+        self._fields = {}
+        self.field_writes = {}
+        self.field_skips = {}
+        self.paint_counts = {}
+        self._painted = {}
         self._build_ui()
-        
-        # Single master timer for UI updates
-        self._master_timer = QTimer(self)
-        self._master_timer.timeout.connect(self._on_master_tick)
-        self._master_timer.start(500) # 2Hz update rate
-        
-        # Network check in background thread
-        self._network_thread = NetworkCheckThread(self)
-        self._network_thread.status_changed.connect(self._on_network_status_changed)
-        self._network_thread.start()
+        for name, widget in (
+            ("time", self.time_label),
+            ("countdown", self.countdown_label),
+            ("video", self.progress_value),
+            ("network", self.net_icon),
+            ("volume", self.volume_icon),
+        ):
+            self._painted[widget] = name
+            widget.installEventFilter(self)
+
+        # The clock shows minutes, so it only needs to wake once a minute.
+        self._clock_timer = QTimer(self)
+        self._clock_timer.setSingleShot(True)
+        self._clock_timer.timeout.connect(self._on_clock_tick)
+        
+        # Network and volume come from the app-wide sampler, which keeps
+        # running across overlay rebuilds.
+        sampler = status_sampler()
+        sampler.changed.connect(self._on_status_sampled)
+        sampler.start()
+        self._on_network_status_changed(sampler.value("network", "offline"))
+        self._on_volume_changed(sampler.value("volume"))
 
         # Connect to timer manager
         self._timer_manager.updated.connect(self._update_countdown)
         self._timer_manager.state_changed.connect(self._on_timer_state_changed)
 
-        self._update_time()
+        self._on_clock_tick()
         self._update_palette()
-        self._update_volume()
         self._on_timer_state_changed(self._timer_manager.is_running)
 
-    def _on_master_tick(self):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            name = self._painted.get(obj)
+            if name is not None:
+                self.paint_counts[name] = self.paint_counts.get(name, 0) + 1
+        return super().eventFilter(obj, event)
+
+    def _changed(self, name, value):
+        """Record value for field name; False if it is what is shown already."""
+        if name in self._fields and self._fields[name] == value:
+            self.field_skips[name] = self.field_skips.get(name, 0) + 1
+            return False
+        self._fields[name] = value
+        self.field_writes[name] = self.field_writes.get(name, 0) + 1
+        return True
+
+    def get_repaint_stats(self):
+        return {
+            "writes": dict(self.field_writes),
+            "skips": dict(self.field_skips),
+            "paints": dict(self.paint_counts),
+        }
+
+    def _on_clock_tick(self):
         self._update_time()
-        self._update_video()
-        self._update_volume()
-        # Color sampling disabled as per user request
+        now = QTime.currentTime()
+        ms_into_minute = now.second() * 1000 + now.msec()
+        # A little past the boundary, so a slightly early wakeup does not
+        # format the old minute again.
+        self._clock_timer.start(60000 - ms_into_minute + 20)
+
+    def _on_status_sampled(self, name, value):
+        if name == "network":
+            self._on_network_status_changed(value or "offline")
+        elif name == "volume":
+            self._on_volume_changed(value)
+
+    def _on_volume_changed(self, volume):
+        self._volume_supported = volume is not None
+        muted = bool(volume and (volume.get("muted") or volume.get("level") == 0))
+        icon = getattr(FIF, "MUTE", FIF.VOLUME) if muted else FIF.VOLUME
+        if self._changed("volume", icon):
+            self.volume_icon.setIcon(icon)
 
     def _on_network_status_changed(self, kind):
         self._network_kind = kind
-        if kind == "wifi":
-            self.net_icon.setIcon(FIF.WIFI)
-        elif kind == "wired":
+        if kind == "wired":
             icon = getattr(FIF, "ETHERNET", FIF.WIFI)
-            self.net_icon.setIcon(icon)
         else:
-            self.net_icon.setIcon(FIF.WIFI)
-
-    def closeEvent(self, event):
-        if self._network_thread.isRunning():
-            self._network_thread.requestInterruption()
-            self._network_thread.wait()
-        super().closeEvent(event)
+            icon = FIF.WIFI
+        # Only a different icon is applied.
+        if self._changed("network", icon):
+            self.net_icon.setIcon(icon)
 
     def _build_ui(self):
         layout = QHBoxLayout(self)
+        self._layout = layout
         scale = cfg.scale.value
         layout.setContentsMargins(int(16 * scale), 0, int(16 * scale), 0)
         layout.setSpacing(int(12 * scale))
@@ -525,6 +623,7 @@ class StatusBarWidget(QFrame):
         # Countdown
         self.countdown_container = QWidget(self)
         countdown_layout = QHBoxLayout(self.countdown_container)
+        self._countdown_layout = countdown_layout
         countdown_layout.setContentsMargins(0, 0, 0, 0)
         countdown_layout.setSpacing(int(8 * scale))
         self.countdown_separator = QFrame(self)
@@ -541,6 +640,7 @@ class StatusBarWidget(QFrame):
         # Video progress
         self.video_container = QWidget(self)
         video_layout = QHBoxLayout(self.video_container)
+        self._video_layout = video_layout
         video_layout.setContentsMargins(0, 0, 0, 0)
         video_layout.setSpacing(int(8 * scale))
         self.separator = QFrame(self)
@@ -567,9 +667,28 @@ class StatusBarWidget(QFrame):
         self.volume_icon.setFixedSize(int(18 * scale), int(18 * scale))
         layout.addWidget(self.volume_icon)
 
+    def apply_settings_delta(self, delta, is_light=False):
+        if delta.relayout:
+            scale = cfg.scale.value
+            self.setFixedHeight(int(30 * scale))
+            self._layout.setContentsMargins(int(16 * scale), 0, int(16 * scale), 0)
+            self._layout.setSpacing(int(12 * scale))
+            for sub in (self._countdown_layout, self._video_layout):
+                sub.setSpacing(int(8 * scale))
+            for sep in (self.countdown_separator, self.separator):
+                sep.setFixedHeight(int(12 * scale))
+            for icon in (self.net_icon, self.volume_icon):
+                icon.setFixedSize(int(18 * scale), int(18 * scale))
+        if delta.retranslate:
+            self.progress_caption.setText(_t("status.media_length"))
+        if delta.restyle or is_light != self._is_light:
+            self._update_palette(is_light)
+
     def _update_countdown(self, seconds):
         if seconds > 0:
-            self.countdown_label.setText(f"倒计时 {self._timer_manager.get_remaining_time_str()}")
+            text = f"倒计时 {self._timer_manager.get_remaining_time_str()}"
+            if self._changed("countdown", text):
+                self.countdown_label.setText(text)
             self.countdown_container.show()
         else:
             self.countdown_container.hide()
@@ -581,33 +700,51 @@ class StatusBarWidget(QFrame):
         else:
             self.countdown_container.hide()
 
+    _locale = None
+
     def _update_time(self):
-        now = QDateTime.currentDateTime()
-        locale = QLocale(QLocale.Chinese, QLocale.China)
-        time_str = locale.toString(now, "H:mm M月d日 ddd")
-        self.time_label.setText(time_str)
+        if StatusBarWidget._locale is None:
+            StatusBarWidget._locale = QLocale(QLocale.Chinese, QLocale.China)
+        time_str = StatusBarWidget._locale.toString(QDateTime.currentDateTime(), "H:mm M月d日 ddd")
+        if self._changed("time", time_str):
+            self.time_label.setText(time_str)
 
     def set_monitor(self, monitor):
+        if self._monitor is monitor:
+            return
+        if self._monitor is not None:
+            try:
+                self._monitor.video_state_changed.disconnect(self._on_video_state)
+            except (RuntimeError, TypeError):
+                pass
         self._monitor = monitor
-
-    def _update_video(self):
-        if not self._monitor:
-            self.video_container.hide()
+        if monitor is None:
+            self._update_video(None)
             return
+        # The monitor pushes video progress (already rate limited); start
+        # from what it has cached.
+        monitor.video_state_changed.connect(self._on_video_state)
         try:
-            ratio, pos, length = self._monitor.get_video_progress()
+            self._on_video_state(*monitor.get_video_progress())
         except Exception:
-            self.video_container.hide()
-            return
+            self._update_video(None)
+
+    def _on_video_state(self, ratio, pos, length):
+        self._update_video(length)
+
+    def _update_video(self, length):
         if length is None or length <= 0:
-            self.video_container.hide()
+            if self._changed("video_visible", False):
+                self.video_container.hide()
             return
         length_sec = length or 0.0
         if length_sec > 36000:
             length_sec = length_sec / 1000.0
         total_text = self._format_seconds(length_sec)
-        self.progress_value.setText(total_text)
-        self.video_container.show()
+        if self._changed("video", total_text):
+            self.progress_value.setText(total_text)
+        if self._changed("video_visible", True):
+            self.video_container.show()
 
     def _format_seconds(self, value):
         secs = int(float(value))
@@ -622,53 +759,9 @@ class StatusBarWidget(QFrame):
         pass
 
     def cleanup(self):
-        if hasattr(self, "_network_thread") and self._network_thread.isRunning():
-            self._network_thread.requestInterruption()
-            self._network_thread.quit()
-            self._network_thread.wait()
-
-    def _update_network(self):
-        kind = "offline"
-        if psutil is not None:
-            try:
-                stats = psutil.net_if_stats()
-                for name, st in stats.items():
-                    if not st.isup:
-                        continue
-                    lname = name.lower()
-                    if "wi-fi" in lname or "wifi" in lname or "wlan" in lname:
-                        kind = "wifi"
-                        break
-                    if "ethernet" in lname or "eth" in lname or "lan" in lname:
-                        kind = "wired"
-                if kind == "offline" and any(st.isup for st in stats.values()):
-                    kind = "wired"
-            except Exception:
-                pass
-        if kind == "offline":
-            try:
-                out = subprocess.check_output(
-                    ["netsh", "wlan", "show", "interfaces"],
-                    encoding="utf-8",
-                    errors="ignore",
-                )
-                if "state" in out.lower() and "connected" in out.lower():
-                    kind = "wifi"
-            except Exception:
-                pass
-        self._network_kind = kind
-        if kind == "wifi":
-            self.net_icon.setIcon(FIF.WIFI)
-        elif kind == "wired":
-            icon = getattr(FIF, "ETHERNET", FIF.WIFI)
-            self.net_icon.setIcon(icon)
-        else:
-            self.net_icon.setIcon(FIF.WIFI)
-
-    def _update_volume(self):
         try:
-            self.volume_icon.setIcon(FIF.VOLUME)
-        except Exception:
+            status_sampler().changed.disconnect(self._on_status_sampled)
+        except (RuntimeError, TypeError):
             pass
 
     def _update_palette(self, is_light=False):
@@ -1100,21 +1193,20 @@ class CustomToolButton(QFrame):
         else:
             self.icon_label.setStyleSheet("background: transparent; border-radius: 0; padding: 0;")
         
-        text_color = _p("toolbar_fg", is_light) or ("#191919" if is_light else "#FFFFFF")
+        text_qcolor = _pc("toolbar_fg", is_light, "#191919" if is_light else "#FFFFFF")
         # Update text style
         self.text_label.setStyleSheet(f"""
             QLabel {{
                 font-size: 11px;
                 font-weight: 400;
                 font-family: {_get_overlay_font_stack()};
-                color: rgba({_parse_color(text_color).red()}, {_parse_color(text_color).green()}, {_parse_color(text_color).blue()}, {fg_alpha});
+                color: rgba({text_qcolor.red()}, {text_qcolor.green()}, {text_qcolor.blue()}, {fg_alpha});
                 background: transparent;
             }}
         """)
         
         # Sync palette for MarqueeLabel's custom painting
         palette = self.text_label.palette()
-        text_qcolor = _parse_color(text_color, QColor(255, 255, 255))
         palette.setColor(QPalette.WindowText, QColor(text_qcolor.red(), text_qcolor.green(), text_qcolor.blue(), int(255 * fg_alpha)))
         self.text_label.setPalette(palette)
         
@@ -1132,20 +1224,30 @@ class CustomToolButton(QFrame):
         self.set_icon_color(is_light)
         self.update()
 
+    def set_text(self, text):
+        self.text = text
+        self.text_label.setText(text)
+        self.setToolTip(text)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.clicked.emit()
         super().mousePressEvent(event)
 
 class SlidePreviewPopup(FluentWidget):
+    VISIBLE_CARDS = 5
+    PREFETCH = 5
+
     def __init__(self, parent=None, monitor=None, is_light=False):
         super().__init__(parent=parent)
         self.monitor = monitor
         self._is_light = is_light
         self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint | Qt.Tool)
-        self.cards = []
-        self.slide_indices = []
+        self.setAttribute(Qt.WA_DeleteOnClose)
         self.current_index = 0
+        self.model = None
+        if monitor is not None and hasattr(monitor, "thumbnail_generated"):
+            monitor.thumbnail_generated.connect(self._on_thumbnail_generated)
         self._build_ui()
 
     def _build_ui(self):
@@ -1166,11 +1268,18 @@ class SlidePreviewPopup(FluentWidget):
                 font-family: 'MiSans Latin', 'HarmonyOS Sans SC', 'SF Pro', '苹方-简', 'PingFang SC', 'Segoe UI', 'Microsoft YaHei', sans-serif;
             }}
         """)
-        self.card_container = QWidget(self)
-        self.card_layout = QHBoxLayout(self.card_container)
-        self.card_layout.setContentsMargins(0, 0, 0, 0)
-        self.card_layout.setSpacing(6)
-        layout.addWidget(self.card_container)
+        colors = {
+            "card_bg": _pc("card_bg", self._is_light, "#F5F6F8" if self._is_light else "rgba(255, 255, 255, 0.06)"),
+            "card_border": _pc("card_border", self._is_light, "rgba(0,0,0,0.05)" if self._is_light else "rgba(255,255,255,0.08)"),
+            "card_hover": _pc("item_hover", self._is_light, "#FFFFFF" if self._is_light else "rgba(255, 255, 255, 0.12)"),
+            "accent": _pc("accent", self._is_light, "#3275F5" if self._is_light else "#E1EBFF"),
+            "fg": _parse_color(fg),
+        }
+        self.strip = SlideStripView(self)
+        self.strip.setItemDelegate(SlideCardDelegate(colors, self.strip))
+        self.strip.clicked.connect(lambda index: self._on_card_clicked(index.row()))
+        self.strip.visible_range_changed.connect(self._request_thumbnails)
+        layout.addWidget(self.strip)
         self.page_label = QLabel(self)
         self.page_label.setAlignment(Qt.AlignCenter)
         self.page_label.setStyleSheet("font-size: 12px;")
@@ -1178,80 +1287,62 @@ class SlidePreviewPopup(FluentWidget):
         self._load_slides()
         self._update_page_label()
 
+    def _slide_count(self):
+        return self.model.rowCount() if self.model is not None else 0
+
     def _load_slides(self):
         if not self.monitor or not hasattr(self.monitor, "get_total_slides"):
             return
         total = self.monitor.get_total_slides()
         if not total:
             return
-        temp_dir = os.path.join(tempfile.gettempdir(), "kazuha_ppt_thumbs")
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        self.slide_map.clear()
-        
-        for slide_num in range(1, total + 1):
-            path = os.path.join(temp_dir, f"slide_{slide_num}.png")
-            
-            # Create button first with placeholder
-            btn = QPushButton(self.card_container)
-            btn.setFlat(True)
-            # Set a simple placeholder or empty icon
-            card_bg = _p("card_bg", self._is_light) or ("#F5F6F8" if self._is_light else "rgba(255, 255, 255, 0.06)")
-            card_border = _p("card_border", self._is_light) or ("rgba(0,0,0,0.05)" if self._is_light else "rgba(255,255,255,0.08)")
-            card_hover = _p("item_hover", self._is_light) or ("#FFFFFF" if self._is_light else "rgba(255, 255, 255, 0.12)")
-            accent = _p("accent", self._is_light) or ("#3275F5" if self._is_light else "#E1EBFF")
-            btn.setStyleSheet(
-                f"QPushButton {{ border-radius: 14px; border: 1px solid {card_border}; background-color: {card_bg}; }}"
-                f"QPushButton:hover {{ border: 1px solid {accent}; background-color: {card_hover}; }}"
-            )
-            
-            # Check if exists in cache/disk first for speed
-            if os.path.exists(path):
-                 pix = QPixmap(path)
-                 if not pix.isNull():
-                     btn.setIcon(QIcon(pix))
-            
-            # Request update/export
-            try:
-                if hasattr(self.monitor, "export_slide_thumbnail"):
-                    self.monitor.export_slide_thumbnail(slide_num, path)
-            except Exception:
-                pass
-
-            index_in_row = len(self.cards)
-            btn.clicked.connect(lambda _, idx=index_in_row: self._on_card_clicked(idx))
-            self.card_layout.addWidget(btn)
-            self.cards.append(btn)
-            self.slide_indices.append(slide_num)
-            self.slide_map[slide_num] = btn
-            
+        self.model = SlideStripModel(total, parent=self)
+        self.strip.setModel(self.model)
+        visible = min(total, self.VISIBLE_CARDS)
+        self.strip.setFixedSize(
+            visible * (SLIDE_CARD_SIZE.width() + SLIDE_CARD_SPACING),
+            SLIDE_CARD_SIZE.height() + SLIDE_CARD_SPACING,
+        )
+        try:
+            current = self.monitor.get_page_info()[0]
+        except Exception:
+            current = 1
+        self.current_index = max(0, min(total - 1, (current or 1) - 1))
         self._update_cards()
 
+    def _request_thumbnails(self, first, last):
+        # Export what is on screen plus a margin; cached slides return at once.
+        total = self._slide_count()
+        if not total or not hasattr(self.monitor, "request_thumbnails"):
+            return
+        start = max(1, first - self.PREFETCH)
+        end = min(total, last + self.PREFETCH)
+        try:
+            self.monitor.request_thumbnails(range(start, end + 1), self.current_index + 1)
+        except Exception:
+            pass
+
     def _on_thumbnail_generated(self, index, path):
-        if index in self.slide_map:
-            btn = self.slide_map[index]
-            if os.path.exists(path):
-                pix = QPixmap(path)
-                if not pix.isNull():
-                    w, h = 180, 110
-                    btn.setIcon(QIcon(pix))
-                    btn.setIconSize(QSize(w, h))
+        if self.model is not None:
+            self.model.set_thumbnail(index, path)
 
     def _update_cards(self):
-        for idx, btn in enumerate(self.cards):
-            w, h = 180, 110
-            btn.setFixedSize(w, h)
-            btn.setIconSize(QSize(w, h))
+        if self.model is None:
+            return
+        index = self.model.index(self.current_index)
+        self.strip.setCurrentIndex(index)
+        self.strip.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        self._request_thumbnails(*self.strip.visible_range())
 
     def _update_page_label(self):
-        total = len(self.cards)
+        total = self._slide_count()
         if total == 0:
             self.page_label.setText("")
         else:
             self.page_label.setText(f"{self.current_index + 1}/{total}")
 
     def _go_prev(self):
-        if not self.cards:
+        if not self._slide_count():
             return
         if self.current_index > 0:
             self.current_index -= 1
@@ -1259,23 +1350,23 @@ class SlidePreviewPopup(FluentWidget):
             self._update_page_label()
 
     def _go_next(self):
-        if not self.cards:
+        if not self._slide_count():
             return
-        if self.current_index < len(self.cards) - 1:
+        if self.current_index < self._slide_count() - 1:
             self.current_index += 1
             self._update_cards()
             self._update_page_label()
 
     def _activate_current(self):
-        if not self.cards or not self.slide_indices:
+        if not self._slide_count():
             return
-        index = self.slide_indices[self.current_index]
+        index = self.current_index + 1
         if self.monitor and hasattr(self.monitor, "go_to_slide"):
             self.monitor.go_to_slide(index)
         self.close()
 
     def _on_card_clicked(self, idx):
-        if idx < 0 or idx >= len(self.cards):
+        if idx < 0 or idx >= self._slide_count():
             return
         self.current_index = idx
         self._update_cards()
@@ -1374,27 +1465,53 @@ class IndeterminateSpinner(QWidget):
         painter.drawEllipse(QPoint(int(dot_x), int(dot_y)), int(dot_radius), int(dot_radius))
 
 class UiBlockWatchdog(QThread):
+    """
+    Watches the UI heartbeat from a background thread. Once the UI thread
+    has been silent for threshold_ms, blocked_changed(True) is emitted
+    (and False when it recovers). While the heartbeat is late the UI
+    thread's stack is sampled every sample_ms, and a stall that reached
+    the threshold is handed to the stall profiler with its samples.
+    """
     blocked_changed = Signal(bool)
 
-    def __init__(self, get_last_ping, threshold_ms=800, interval_ms=100, parent=None):
+    def __init__(self, get_last_ping, threshold_ms=800, interval_ms=100, sample_ms=20, parent=None):
         super().__init__(parent)
         self._get_last_ping = get_last_ping
         self._threshold = max(0.1, float(threshold_ms) / 1000.0)
         self._interval = max(0.05, float(interval_ms) / 1000.0)
+        self._sample_interval = max(0.005, float(sample_ms) / 1000.0)
         self._blocked = False
+        # Constructed on the thread it watches.
+        self._thread_id = threading.get_ident()
 
     def run(self):
+        profiler = stall_profiler()
+        samples = []
+        stall_from = None
         while not self.isInterruptionRequested():
             try:
                 last = float(self._get_last_ping())
             except Exception:
                 last = time.monotonic()
             now = time.monotonic()
+            late = (now - last) >= 2 * self._interval
+            if late:
+                # Possibly the start of a stall; only kept if it becomes one.
+                if stall_from is None:
+                    stall_from = last
+                    samples = []
+                samples.append(profiler.sample(self._thread_id))
             blocked = (now - last) >= self._threshold
             if blocked != self._blocked:
                 self._blocked = blocked
                 self.blocked_changed.emit(blocked)
-            time.sleep(self._interval)
+            if not late and stall_from is not None:
+                duration = last - stall_from
+                if duration >= self._threshold:
+                    profiler.record_stall(time.time() - (now - stall_from), duration, samples)
+                stall_from = None
+                samples = []
+            time.sleep(self._sample_interval if late else self._interval)
 
 class ReloadMask(QWidget):
     def __init__(self, parent=None):
@@ -1419,7 +1536,7 @@ class ReloadMask(QWidget):
         card_layout.setSpacing(12)
         card_layout.setAlignment(Qt.AlignCenter)
 
-        spinner_color = _parse_color(_p("mask_text_fg", is_light) or "rgba(255, 255, 255, 0.92)")
+        spinner_color = _pc("mask_text_fg", is_light, "rgba(255, 255, 255, 0.92)")
         self.spinner = IndeterminateSpinner(card, color=spinner_color, size=27)
         card_layout.addWidget(self.spinner, 0, Qt.AlignCenter)
 
@@ -1479,10 +1596,7 @@ class OverlayWindow(QWidget):
         version = _get_app_version()
         if _is_dev_preview_version(version):
             label = QLabel(self)
-            suffix = version.split(".")[-1]
-            w_type = _t(f"watermark.{suffix}")
-            display_version = _format_version_display(version)
-            label.setText(_t("overlay.dev_watermark").format(type=w_type, version=display_version))
+            label.setText(self._dev_watermark_text(version))
             font = QFont()
             font.setPixelSize(11)
             label.setFont(font)
@@ -1500,6 +1614,40 @@ class OverlayWindow(QWidget):
         if self.monitor:
             return
 
+    def _dev_watermark_text(self, version):
+        w_type = _t(f"watermark.{version.split('.')[-1]}")
+        return _t("overlay.dev_watermark").format(type=w_type, version=_format_version_display(version))
+
+    def apply_settings_delta(self, delta):
+        """
+        Apply a settings change to the live widgets. Returns False when
+        the change needs a new OverlayWindow instead.
+        """
+        if delta.rebuild or not hasattr(self, "toolbar"):
+            return False
+        if delta.retranslate:
+            reload_language()
+            self.setWindowTitle(_t("overlay.title"))
+            if self._dev_watermark is not None:
+                self._dev_watermark.setText(self._dev_watermark_text(_get_app_version()))
+        if delta.restyle:
+            self._is_light = _resolve_is_light()
+            if self._dev_watermark is not None:
+                self._dev_watermark.setStyleSheet(
+                    f"color: {_p('dev_watermark', self._is_light) or 'rgba(255, 255, 255, 120)'};"
+                )
+        if (delta.restyle or delta.retranslate) and self.slide_preview is not None:
+            if shiboken6.isValid(self.slide_preview):
+                self.slide_preview.close()
+            self.slide_preview = None
+        if self.status_bar is not None:
+            self.status_bar.apply_settings_delta(delta, self._is_light)
+        self.toolbar.apply_settings_delta(delta, self._is_light)
+        self.left_flipper.apply_settings_delta(delta, self._is_light)
+        self.right_flipper.apply_settings_delta(delta, self._is_light)
+        self.update_layout()
+        return True
+
     def update_geometry(self, rect, screen):
         target_screen = screen
         if not target_screen and rect and not rect.isEmpty():
@@ -1538,7 +1686,13 @@ class OverlayWindow(QWidget):
         self.bind_monitor_signals()
 
     def _mark_ui_alive(self):
-        self._ui_last_ping = time.monotonic()
+        now = time.monotonic()
+        # How much later than its interval the heartbeat ran: event-loop lag.
+        lag = max(0.0, (now - self._ui_last_ping) * 1000.0 - self._ui_heartbeat_timer.interval())
+        registry = metrics()
+        registry.histogram("ui.event_loop_lag_ms").record(lag)
+        registry.gauge("ui.event_loop_lag_last_ms").set(round(lag, 1))
+        self._ui_last_ping = now
 
     def _ensure_reload_mask(self):
         if self._reload_mask is None:
@@ -1805,6 +1959,7 @@ class OverlayWindow(QWidget):
             if self.status_bar is None:
                 self.status_bar = StatusBarWidget(self)
                 self.status_bar._update_palette(self._is_light)
+                self.status_bar.set_monitor(self.monitor)
             self.status_bar.show()
         else:
             if self.status_bar is not None:
@@ -1839,6 +1994,7 @@ class OverlayWindow(QWidget):
         self.left_flipper.show()
         self.right_flipper.show()
 
+    @timed("overlay.update_layout_ms")
     def update_layout(self):
         # Prevent crash during initialization
         if not hasattr(self, "toolbar") or self.toolbar is None:
@@ -1900,6 +2056,7 @@ class OverlayWindow(QWidget):
         finally:
             self._layout_updating = False
 
+    @timed("overlay.update_mask_ms")
     def update_mask(self):
         # Optimization: Mask out empty areas to reduce DWM composition overhead
         # This makes the "transparent" pixels truly pass-through for performance
@@ -2001,6 +2158,8 @@ class OverlayWindow(QWidget):
                 break
 
     def update_page_info(self, current, total):
+        # From PPTWorker emitting slide_changed to here.
+        metrics().elapsed_since("slide_changed", "overlay.slide_changed_latency_ms")
         # Ensure int
         try:
             current = int(current)
@@ -2057,6 +2216,7 @@ class ToolbarWidget(QWidget):
         self.pen_popup = None
         self._is_light = False
         self._dynamic_widgets = []
+        self._placement = None
         self._style_update_pending = False
         self._style_update_timer = QTimer(self)
         self._style_update_timer.setSingleShot(True)
@@ -2098,7 +2258,7 @@ class ToolbarWidget(QWidget):
             bg = _p("toolbar_bg", self._is_light) or ("#FFFFFF" if self._is_light else "#202020")
             border = _p("toolbar_border", self._is_light) or ("rgba(0, 0, 0, 0.08)" if self._is_light else "rgba(255, 255, 255, 0.08)")
             line_color = _p("toolbar_line", self._is_light) or ("rgba(0, 0, 0, 0.08)" if self._is_light else "rgba(255, 255, 255, 0.15)")
-            shadow_color = _parse_color(_p("toolbar_shadow", self._is_light), QColor(0, 0, 0, 15) if self._is_light else QColor(0, 0, 0, 80))
+            shadow_color = _pc("toolbar_shadow", self._is_light, QColor(0, 0, 0, 15) if self._is_light else QColor(0, 0, 0, 80))
 
             self.layout.activate()
             self.adjustSize()
@@ -2154,7 +2314,8 @@ class ToolbarWidget(QWidget):
     def _execute_plugin_by_name(self, name):
         for plugin in self.plugins:
             if hasattr(plugin, "get_name") and plugin.get_name() == name:
-                plugin.execute()
+                with metrics().timer(f"plugin.{type(plugin).__name__}.execute_ms"):
+                    plugin.execute()
                 return
 
     def _update_indicator_now(self):
@@ -2251,6 +2412,16 @@ class ToolbarWidget(QWidget):
         self.btn_end = CustomToolButton("Minimize.svg", _t("toolbar.end_show"), self, is_exit=True, text=_t("toolbar.end_show"))
         self.btn_end.clicked.connect(self.end_clicked.emit)
 
+        self._labelled = [
+            (self.btn_select, "toolbar.select"),
+            (self.btn_pen, "toolbar.pen"),
+            (self.btn_eraser, "toolbar.eraser"),
+            (self.btn_clear, "toolbar.clear"),
+            (self.btn_spotlight, "toolbar.spotlight"),
+            (self.btn_timer, "toolbar.timer"),
+            (self.btn_end, "toolbar.end_show"),
+        ]
+
         # Add to layout based on order
         self.update_toolbar_layout()
 
@@ -2263,6 +2434,17 @@ class ToolbarWidget(QWidget):
         QTimer.singleShot(0, self._update_indicator_now)
 
     def update_toolbar_layout(self):
+        self._place_items()
+        self.refresh_dynamic_tools()
+        self.update_layout_style()
+
+    def _place_items(self, force=True):
+        """Lay out the fixed items in configured order. Returns False if
+        force is off and nothing about the order changed."""
+        placement = (tuple(cfg.toolbarOrder.value), cfg.showClear.value, cfg.showSpotlight.value, cfg.showTimer.value)
+        if not force and placement == self._placement:
+            return False
+        self._placement = placement
         # Clear layout
         while self.layout.count():
             item = self.layout.takeAt(0)
@@ -2302,9 +2484,23 @@ class ToolbarWidget(QWidget):
         # Add separator line and end button
         self.layout.addWidget(self.line3)
         self.layout.addWidget(self.btn_end)
-        
-        self.refresh_dynamic_tools()
-        self.update_layout_style()
+        return True
+
+    def apply_settings_delta(self, delta, is_light=False):
+        restyle = delta.restyle or is_light != self._is_light
+        self._is_light = is_light
+        if delta.retranslate:
+            for btn, key in self._labelled:
+                btn.set_text(_t(key))
+        if delta.reorder:
+            self._place_items(force=False)
+        if restyle and self.pen_popup is not None and not self.pen_popup.isVisible():
+            # Rebuilt with the new colours the next time it opens.
+            self.pen_popup.deleteLater()
+            self.pen_popup = None
+        if restyle or delta.relayout or delta.retranslate or delta.reorder:
+            self._style_update_timer.stop()
+            self._apply_layout_style()
 
     def refresh_dynamic_tools(self):
         p = self.parent()
@@ -2412,6 +2608,12 @@ class PageFlipButton(QFrame):
         layout.addWidget(self.icon_label)
         self.update_icon_color(QColor(255, 255, 255))
 
+    def rescale(self):
+        """Follow a Scale change; the owner's update_style() redraws the icon."""
+        scale = cfg.scale.value
+        self.setFixedSize(int(38 * scale), int(38 * scale))
+        self.icon_label.setFixedSize(int(20 * scale), int(20 * scale))
+
     def update_icon_color(self, color):
         icon_path = os.path.join(ICON_DIR, self.icon_name)
         if not os.path.exists(icon_path):
@@ -2459,8 +2661,10 @@ class PageFlipWidget(QFrame):
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.side = side
         scale = cfg.scale.value
+        self._height = height
         self.h_val = int(height * scale)
         self.orientation = orientation
+        self._page_info = None
         
         self.update_style()
         
@@ -2520,6 +2724,7 @@ class PageFlipWidget(QFrame):
         pass
 
     def set_page_info(self, current, total):
+        self._page_info = (current, total)
         hint_fg = "rgba(255, 255, 255, 0.6)" if not hasattr(self, "_is_light") or not self._is_light else "rgba(0, 0, 0, 0.5)"
         scale = cfg.scale.value
         
@@ -2535,6 +2740,29 @@ class PageFlipWidget(QFrame):
                               f'<span style="font-size: {int(10 * scale)}px; font-weight: 400; color: {hint_fg};">/{total}</span>')
         self.lbl_page.repaint()
 
+    def apply_settings_delta(self, delta, is_light=False):
+        if delta.retranslate:
+            self.lbl_hint.setText(_t("toolbar.page"))
+        if delta.relayout:
+            self.rescale()
+        if delta.restyle or delta.relayout or is_light != self._is_light:
+            self.update_style(is_light)
+            if self._page_info is not None:
+                self.set_page_info(*self._page_info)
+
+    def rescale(self):
+        scale = cfg.scale.value
+        self.h_val = int(self._height * scale)
+        margin = int(5 * scale)
+        if self.orientation == "Vertical":
+            self.setFixedSize(self.h_val, int(160 * scale))
+            self.layout.setContentsMargins(0, margin, 0, margin)
+        else:
+            self.setFixedSize(int(160 * scale), self.h_val)
+            self.layout.setContentsMargins(margin, 0, margin, 0)
+        self.btn_prev.rescale()
+        self.btn_next.rescale()
+
     def update_style(self, is_light=False):
         self._is_light = is_light
         scale = cfg.scale.value
@@ -2544,7 +2772,7 @@ class PageFlipWidget(QFrame):
         fg = _p("pageflip_fg", self._is_light) or ("#191919" if self._is_light else "white")
         hint_fg = _p("pageflip_hint", self._is_light) or ("rgba(0, 0, 0, 0.5)" if self._is_light else "rgba(255, 255, 255, 0.6)")
         hover_bg = _p("pageflip_hover", self._is_light) or ("rgba(0, 0, 0, 0.05)" if self._is_light else "rgba(255, 255, 255, 0.08)")
-        shadow_color = _parse_color(_p("pageflip_shadow", self._is_light), QColor(0, 0, 0, 15) if self._is_light else QColor(0, 0, 0, 80))
+        shadow_color = _pc("pageflip_shadow", self._is_light, QColor(0, 0, 0, 15) if self._is_light else QColor(0, 0, 0, 80))
         
         # Calculate radius to ensure it's always a capsule (pill shape)
         # Use min dimension for radius
@@ -0,0 +1,223 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QSize, QRect, QRectF, QRunnable, QThreadPool,
+    QAbstractListModel, QModelIndex,
+)
+from PySide6.QtGui import QColor, QImage, QPainter, QPainterPath, QPen, QPixmap, QFont
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+
+CARD_SIZE = QSize(180, 110)
+CARD_SPACING = 6
+ThumbnailRole = Qt.UserRole + 1
+
+
+class PixmapLRU:
+    """Decoded thumbnails, bounded to the most recently used entries."""
+
+    def __init__(self, capacity=48):
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def get(self, key):
+        pix = self._items.get(key)
+        if pix is not None:
+            self._items.move_to_end(key)
+        return pix
+
+    def put(self, key, pix):
+        self._items[key] = pix
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def discard(self, key):
+        self._items.pop(key, None)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _DecodeSignals(QObject):
+    decoded = Signal(int, str, QImage)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, signals, index, path, size):
+        super().__init__()
+        self._signals = signals
+        self._index = index
+        self._path = path
+        self._size = size
+
+    def run(self):
+        image = QImage(self._path)
+        if not image.isNull():
+            image = image.scaled(self._size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            self._signals.decoded.emit(self._index, self._path, image)
+        except RuntimeError:
+            # The popup closed before decoding finished.
+            pass
+
+
+class ThumbnailDecoder(QObject):
+    """Loads and scales thumbnail PNGs on a thread pool, off the UI thread."""
+    decoded = Signal(int, str, QImage)
+
+    def __init__(self, size=CARD_SIZE, parent=None):
+        super().__init__(parent)
+        self._size = size
+        self._pool = QThreadPool.globalInstance()
+        self._signals = _DecodeSignals(self)
+        self._signals.decoded.connect(self._on_decoded)
+        self._pending = set()
+
+    def request(self, index, path):
+        key = (index, path)
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.start(_DecodeTask(self._signals, index, path, self._size))
+
+    def _on_decoded(self, index, path, image):
+        self._pending.discard((index, path))
+        self.decoded.emit(index, path, image)
+
+
+class SlideStripModel(QAbstractListModel):
+    """
+    One row per slide. Only rows that are actually painted ask for their
+    thumbnail, so decoding follows what is on screen.
+    """
+
+    def __init__(self, total=0, cache_size=48, parent=None):
+        super().__init__(parent)
+        self._total = total
+        self._paths = {}
+        self._pixmaps = PixmapLRU(cache_size)
+        self._decoder = ThumbnailDecoder(parent=self)
+        self._decoder.decoded.connect(self._on_decoded)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._total
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        slide = index.row() + 1
+        if role == Qt.DisplayRole:
+            return str(slide)
+        if role == ThumbnailRole:
+            pix = self._pixmaps.get(slide)
+            if pix is None:
+                path = self._paths.get(slide)
+                if path:
+                    self._decoder.request(slide, path)
+            return pix
+        return None
+
+    def set_thumbnail(self, slide, path):
+        if not 1 <= slide <= self._total:
+            return
+        if self._paths.get(slide) != path:
+            self._paths[slide] = path
+            self._pixmaps.discard(slide)
+        row = self.index(slide - 1)
+        self.dataChanged.emit(row, row, [ThumbnailRole])
+
+    def _on_decoded(self, slide, path, image):
+        if image.isNull() or self._paths.get(slide) != path:
+            return
+        self._pixmaps.put(slide, QPixmap.fromImage(image))
+        row = self.index(slide - 1)
+        self.dataChanged.emit(row, row, [ThumbnailRole])
+
+
+class SlideCardDelegate(QStyledItemDelegate):
+    """Paints slide cards. colors maps card_bg, card_border, card_hover,
+    accent and fg to QColor, resolved once by the owner."""
+
+    def __init__(self, colors, parent=None):
+        super().__init__(parent)
+        self._card_bg = QColor(colors["card_bg"])
+        self._card_border = QColor(colors["card_border"])
+        self._card_hover = QColor(colors["card_hover"])
+        self._accent = QColor(colors["accent"])
+        self._fg = QColor(colors["fg"])
+        self._font = QFont()
+        self._font.setPixelSize(12)
+        self._font.setBold(True)
+
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        selected = bool(option.state & QStyle.State_Selected)
+
+        path = QPainterPath()
+        path.addRoundedRect(rect, 14, 14)
+        painter.fillPath(path, self._card_hover if hovered else self._card_bg)
+
+        pix = index.data(ThumbnailRole)
+        if pix is not None:
+            painter.setClipPath(path)
+            target = QRect(0, 0, pix.width(), pix.height())
+            target.moveCenter(option.rect.center())
+            painter.drawPixmap(target, pix)
+            painter.setClipping(False)
+        else:
+            painter.setPen(self._fg)
+            painter.setFont(self._font)
+            painter.drawText(option.rect, Qt.AlignCenter, index.data(Qt.DisplayRole))
+
+        border = self._accent if (hovered or selected) else self._card_border
+        painter.setPen(QPen(border, 2 if selected else 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(path)
+        painter.restore()
+
+
+class SlideStripView(QListView):
+    """Horizontal, virtualized strip of slide cards."""
+    visible_range_changed = Signal(int, int)  # first, last slide (1-based)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setUniformItemSizes(True)
+        self.setSpacing(CARD_SPACING // 2)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFrameShape(QListView.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAutoFillBackground(False)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.horizontalScrollBar().valueChanged.connect(self._emit_visible_range)
+
+    def visible_range(self):
+        # Items are uniform, so the range follows from the scroll offset.
+        count = self.model().rowCount() if self.model() else 0
+        if not count:
+            return 1, 0
+        pitch = CARD_SIZE.width() + 2 * self.spacing()
+        offset = self.horizontalScrollBar().value()
+        first = offset // pitch
+        last = (offset + self.viewport().width() - 1) // pitch
+        return min(count, first + 1), min(count, last + 1)
+
+    def _emit_visible_range(self, *_):
+        if self.model() and self.model().rowCount():
+            self.visible_range_changed.emit(*self.visible_range())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._emit_visible_range()
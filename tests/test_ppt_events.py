@@ -0,0 +1,130 @@
+import pytest
+
+from ppt_assistant.core.ppt_events import ScriptedApplication, ScriptedEventSource
+from ppt_assistant.core.ppt_monitor import PPTWorker
+from ppt_assistant.core.presentation_backend import PowerPointBackend
+
+from conftest import wait_until
+
+
+class _SinklessApplication:
+    """A ScriptedApplication that cannot be subscribed to, like an app whose event sink fails."""
+
+    def __init__(self, app):
+        self._app = app
+
+    def __getattr__(self, name):
+        if name in ("advise", "unadvise"):
+            raise AttributeError(name)
+        return getattr(self._app, name)
+
+
+class _Recorder:
+    def __init__(self, worker):
+        self.events = []
+        worker.slideshow_started.connect(lambda: self.events.append("started"))
+        worker.slideshow_ended.connect(lambda: self.events.append("ended"))
+        worker.slide_changed.connect(lambda current, total: self.events.append((current, total)))
+
+
+@pytest.fixture
+def make_worker(qapp):
+    workers = []
+
+    def make(app):
+        backend = PowerPointBackend(app_factory=lambda: app, event_source=ScriptedEventSource())
+        worker = PPTWorker([backend], restartable=False)
+        worker.start()
+        # Ticks only when a test calls _check_ppt_state() or an event asks
+        # for one, so polling cannot stand in for the events under test.
+        worker._timer.stop()
+        workers.append(worker)
+        return worker, backend, _Recorder(worker)
+
+    yield make
+    for worker in workers:
+        worker.stop()
+
+
+def test_source_forwards_application_events(qapp):
+    app = ScriptedApplication(slide_count=3)
+    source = ScriptedEventSource()
+    seen = []
+    source.slideshow_begin.connect(lambda: seen.append("begin"))
+    source.slideshow_next_slide.connect(lambda: seen.append("next"))
+    source.slideshow_end.connect(lambda: seen.append("end"))
+
+    assert source.attach(app)
+    assert source.is_attached_to(app)
+    app.run_script([("begin", 1), ("next",), ("goto", 3), ("next",)])
+    # Going past the last slide ends the show.
+    assert seen == ["begin", "next", "next", "next", "end"]
+
+    source.detach()
+    assert not source.is_attached()
+    app.begin_show()
+    assert seen[-1] == "end"
+
+
+def test_source_refuses_application_without_events(qapp):
+    source = ScriptedEventSource()
+    assert not source.attach(_SinklessApplication(ScriptedApplication()))
+    assert not source.attach(None)
+    assert not source.is_attached()
+
+
+def test_slide_change_is_reported_from_events(qapp, make_worker):
+    app = ScriptedApplication(slide_count=5)
+    worker, backend, recorder = make_worker(app)
+
+    worker._check_ppt_state()
+    assert worker.tracking_mode == "events"
+    assert recorder.events == []
+
+    app.begin_show(2)
+    assert wait_until(qapp, lambda: (2, 5) in recorder.events)
+    assert recorder.events[0] == "started"
+
+    # No tick in between: the next-slide event alone brings the change in.
+    app.goto(4)
+    assert wait_until(qapp, lambda: (4, 5) in recorder.events)
+
+
+def test_slideshow_end_is_reported_from_events(qapp, make_worker):
+    app = ScriptedApplication(slide_count=5)
+    worker, backend, recorder = make_worker(app)
+    app.begin_show(1)
+    worker._check_ppt_state()
+    assert "started" in recorder.events
+
+    app.end_show()
+    assert recorder.events[-1] == "ended"
+    assert wait_until(qapp, lambda: not worker._running)
+    # The confirming check must not start the show again.
+    qapp.processEvents()
+    assert recorder.events.count("started") == 1
+
+    worker.stop()
+    assert app._sinks == []
+
+
+def test_polling_takes_over_when_the_sink_cannot_attach(qapp, make_worker):
+    inner = ScriptedApplication(slide_count=5)
+    worker, backend, recorder = make_worker(_SinklessApplication(inner))
+
+    worker._check_ppt_state()
+    assert worker.tracking_mode == "polling"
+    assert not backend.events_attached()
+
+    inner.begin_show(1)
+    inner.goto(3)
+    # Nothing is delivered until the next tick reads the object model.
+    qapp.processEvents()
+    assert recorder.events == []
+
+    worker._check_ppt_state()
+    assert recorder.events == ["started", (3, 5)]
+
+    inner.end_show()
+    worker._check_ppt_state()
+    assert recorder.events[-1] == "ended"
@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+from PySide6.QtNetwork import QLocalServer
+
+from ppt_assistant.core import ipc
+from ppt_assistant.core.settings_service import SettingsClient, read_settings, write_atomic
+
+from conftest import wait_until
+
+
+@pytest.fixture
+def service(qapp, monkeypatch):
+    """A server the client connects to, standing in for the main process."""
+    server = QLocalServer()
+    name = f"kazuha-test-{uuid.uuid4().hex[:12]}"
+    assert server.listen(name)
+    monkeypatch.setenv(ipc.ENV_NAME, name)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def settings_path(tmp_path):
+    path = str(tmp_path / "settings.json")
+    write_atomic(path, {"General": {"Language": "zh-CN"}})
+    return path
+
+
+def test_update_is_written_here_when_the_request_cannot_be_sent(qapp, service, settings_path, monkeypatch):
+    client = SettingsClient(settings_path)
+    assert client._connected()
+    # The main process went away after the connection check.
+    monkeypatch.setattr(ipc.Channel, "_write", lambda self, message: False)
+
+    client.update({"General": {"Language": "en-US"}})
+    client.flush()
+    assert read_settings(settings_path)["General"]["Language"] == "en-US"
+
+
+def test_update_is_written_here_when_the_service_disconnects_unanswered(qapp, service, settings_path):
+    client = SettingsClient(settings_path)
+    patch = {"Appearance": {"ThemeId": "dark"}}
+    client.update(patch)
+    patch["Appearance"]["ThemeId"] = "changed by the caller"
+    assert wait_until(qapp, service.hasPendingConnections)
+    peer = service.nextPendingConnection()
+    assert read_settings(settings_path).get("Appearance") is None
+
+    peer.abort()
+    assert wait_until(qapp, lambda: not client._channel.connected)
+    client.flush()
+    assert read_settings(settings_path)["Appearance"]["ThemeId"] == "dark"
+
+
+def test_replace_falls_back_without_a_service(qapp, settings_path, monkeypatch):
+    monkeypatch.setenv(ipc.ENV_NAME, f"kazuha-test-missing-{uuid.uuid4().hex[:12]}")
+    client = SettingsClient(settings_path)
+    client.replace({"General": {"Language": "ja-JP"}})
+    client.flush()
+    assert read_settings(settings_path) == {"General": {"Language": "ja-JP"}}
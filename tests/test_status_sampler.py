@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+
+from ppt_assistant.core import status_sampler as sampler_mod
+from ppt_assistant.core.status_sampler import FunctionProbe, NetworkProbe, StatusProbe, StatusSampler
+
+from conftest import wait_until
+
+
+class _ScriptedProbe(StatusProbe):
+    """Returns the given values in turn, then repeats the last one."""
+
+    def __init__(self, name, values, interval=0.01):
+        self.name = name
+        self.interval = interval
+        self._values = list(values)
+        self.resets = 0
+
+    def sample(self):
+        if len(self._values) > 1:
+            return self._values.pop(0)
+        return self._values[0]
+
+    def reset(self):
+        self.resets += 1
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sampler(qapp, monkeypatch):
+    monkeypatch.setattr(StatusSampler, "_instance", None)
+    sampler = StatusSampler()
+    yield sampler
+    sampler.stop()
+
+
+def test_changed_fires_only_when_the_value_differs(sampler):
+    sampler.register(_ScriptedProbe("fake", [1, 1, 2, 2, None, None, 1]))
+    seen = []
+    sampler.changed.connect(lambda name, value: seen.append((name, value)))
+
+    for _ in range(7):
+        sampler.sample_now()
+    assert seen == [("fake", 1), ("fake", 2), ("fake", None), ("fake", 1)]
+    assert sampler.value("fake") == 1
+    assert sampler.stats()["samples"]["fake"] == 7
+    assert sampler.stats()["changes"]["fake"] == 4
+
+
+def test_failing_probe_counts_an_error_and_reports_none(sampler):
+    def broken():
+        raise OSError("no device")
+
+    sampler.register(FunctionProbe("broken", broken))
+    seen = []
+    sampler.changed.connect(lambda name, value: seen.append(value))
+    sampler.sample_now()
+    sampler.sample_now()
+    assert seen == [None]
+    assert sampler.stats()["errors"]["broken"] == 2
+
+
+def test_subscribe_filters_by_name(sampler):
+    sampler.register(_ScriptedProbe("volume", [10, 20]))
+    sampler.register(_ScriptedProbe("power", [50, 40]))
+    only_volume, everything = [], []
+    sampler.subscribe(lambda name, value: only_volume.append((name, value)), names=["volume"])
+    sampler.subscribe(lambda name, value: everything.append(name))
+
+    sampler.sample_now()
+    sampler.sample_now("power")
+    assert only_volume == [("volume", 10)]
+    assert everything == ["volume", "power", "power"]
+
+    handler = lambda name, value: None
+    sampler.subscribe(handler)
+    sampler.unsubscribe(handler)
+    assert len(sampler._subscribers) == 2
+
+
+def test_netsh_is_asked_at_most_once_per_interval(monkeypatch):
+    clock = _Clock()
+    answers = ["State : connected", "State : disconnected"]
+    monkeypatch.setattr(sampler_mod.time, "monotonic", clock)
+    monkeypatch.setattr(sampler_mod.sys, "platform", "win32")
+    probe = NetworkProbe(run=lambda: answers.pop(0))
+    monkeypatch.setattr(probe, "_interface_kind", lambda: "offline")
+
+    assert probe.sample() == "wifi"
+    for _ in range(10):
+        clock.now += 5.0
+        assert probe.sample() == "wifi"
+    assert probe.subprocess_calls == 1
+
+    clock.now += probe.netsh_interval
+    assert probe.sample() == "offline"
+    assert probe.subprocess_calls == 2
+
+
+def test_netsh_is_not_asked_while_an_interface_is_up(monkeypatch):
+    monkeypatch.setattr(sampler_mod.sys, "platform", "win32")
+    probe = NetworkProbe(run=lambda: pytest.fail("netsh should not run"))
+    monkeypatch.setattr(probe, "_interface_kind", lambda: "wired")
+    assert probe.sample() == "wired"
+    assert probe.subprocess_calls == 0
+
+
+def test_thread_delivers_changes_and_resets_probes_on_exit(qapp, sampler):
+    probe = _ScriptedProbe("fake", ["a", "b"])
+    sampler.register(probe)
+    seen = []
+    sampler.changed.connect(lambda name, value: seen.append(value))
+
+    sampler.start()
+    assert wait_until(qapp, lambda: seen == ["a", "b"])
+    sampler.stop()
+    assert probe.resets == 1
+    assert sampler.stats()["stopping_threads"] == 0
+
+
+def test_stop_keeps_a_thread_that_is_still_inside_a_probe(qapp, sampler, monkeypatch):
+    monkeypatch.setattr(sampler_mod, "STOP_WAIT_MS", 50)
+    entered, unblock = threading.Event(), threading.Event()
+
+    def slow():
+        entered.set()
+        unblock.wait(5)
+        return "late"
+
+    sampler.register(FunctionProbe("slow", slow))
+    seen = []
+    sampler.changed.connect(lambda name, value: seen.append(value))
+    sampler.start()
+    assert entered.wait(2)
+
+    sampler.stop()
+    assert sampler.stats()["stopping_threads"] == 1
+    unblock.set()
+    assert wait_until(qapp, lambda: sampler.stats()["stopping_threads"] == 0)
+    # A stopped sampler does not report what the parked thread found.
+    assert seen == []